@@ -27,4 +27,31 @@ class ActionSchema:
         """Detailed representation of the action schema."""
         return (f"ActionSchema(name='{self.name}', parameters={self.parameters}, "
                 f"preconditions={self.preconditions}, add_effects={self.add_effects}, "
-                f"delete_effects={self.delete_effects})") 
\ No newline at end of file
+                f"delete_effects={self.delete_effects})")
+
+
+def capacity_predicates(capacity, held_items=()):
+    """
+    Get the predicates describing what the robot holds for a given carrying capacity.
+    
+    A capacity of 1 uses ('Holding', 'robot', 'nothing') for empty hands.
+    Larger capacities count free slots with ('FreeSlots', 'robot', n) and
+    ('Succ', n, n + 1) facts, which the capacity-aware PickUp/PutDown
+    schemas from main.create_action_schemas step through.
+    
+    Args:
+        capacity: Number of items the robot can carry at once
+        held_items: Names of the items currently held
+        
+    Returns:
+        Set of predicate tuples
+    """
+    preds = {('Holding', 'robot', item) for item in held_items}
+    if capacity == 1:
+        if not preds:
+            preds.add(('Holding', 'robot', 'nothing'))
+        return preds
+    
+    preds.add(('FreeSlots', 'robot', str(capacity - len(preds))))
+    preds.update(('Succ', str(count), str(count + 1)) for count in range(capacity))
+    return preds
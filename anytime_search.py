@@ -0,0 +1,179 @@
+import heapq
+import time
+from astar_search import manhattan_distance
+
+class AnytimeAStar:
+    def __init__(self, environment, start_pos, goal_pos, initial_weight=3.0, weight_decrement=0.5):
+        """
+        Initialize an anytime weighted A* (ARA*) search from start_pos to goal_pos.
+        
+        The first solution is found quickly with an inflated heuristic; each
+        later iteration lowers the weight and reuses the previous search
+        effort, so the path improves towards optimal as budget allows.
+        
+        Args:
+            environment: Instance of HomeEnvironment
+            start_pos: Starting position (x, y)
+            goal_pos: Goal position (x, y)
+            initial_weight: Heuristic inflation factor for the first iteration (>= 1)
+            weight_decrement: How much the weight drops after each iteration
+        """
+        self.environment = environment
+        self.start_pos = start_pos
+        self.goal_pos = goal_pos
+        self.weight = max(1.0, initial_weight)
+        self.weight_decrement = weight_decrement
+        
+        # Search state kept between calls to improve()
+        self.g = {start_pos: 0}
+        self.parents = {start_pos: None}
+        self.open_set = []
+        self.open_keys = {}
+        self.closed_set = set()
+        self.inconsistent = set()
+        self.expansions = 0
+        
+        # Best solution published so far and its suboptimality bound
+        self.best_path = None
+        self.bound = float('inf')
+        self.is_optimal = False
+        
+        self._push(start_pos)
+    
+    def _key(self, pos):
+        """Inflated f-value of a position for the current weight."""
+        return self.g[pos] + self.weight * manhattan_distance(pos, self.goal_pos)
+    
+    def _push(self, pos):
+        """Insert or update a position in the open set."""
+        key = self._key(pos)
+        self.open_keys[pos] = key
+        heapq.heappush(self.open_set, (key, self.g[pos], pos))
+    
+    def _min_open_key(self):
+        """Smallest live key in the open set (stale entries are dropped)."""
+        while self.open_set:
+            key, _, pos = self.open_set[0]
+            if self.open_keys.get(pos) == key:
+                return key
+            heapq.heappop(self.open_set)
+        return float('inf')
+    
+    def _improve_path(self, deadline, max_expansions):
+        """
+        Run one ARA* iteration until the goal's cost is proven for this weight.
+        
+        Returns:
+            True if the iteration finished, False if the budget ran out first
+        """
+        goal_cost = self.g.get(self.goal_pos, float('inf'))
+        while goal_cost > self._min_open_key():
+            if max_expansions is not None and self.expansions >= max_expansions:
+                return False
+            if deadline is not None and time.perf_counter() >= deadline:
+                return False
+            
+            _, g_score, current_pos = heapq.heappop(self.open_set)
+            del self.open_keys[current_pos]
+            self.closed_set.add(current_pos)
+            self.expansions += 1
+            
+            for neighbor in self.environment.get_valid_neighbors(current_pos[0], current_pos[1]):
+                new_g_score = g_score + 1
+                if new_g_score < self.g.get(neighbor, float('inf')):
+                    self.g[neighbor] = new_g_score
+                    self.parents[neighbor] = current_pos
+                    if neighbor in self.closed_set:
+                        # Already expanded this iteration: revisit it in the next one
+                        self.inconsistent.add(neighbor)
+                    else:
+                        self._push(neighbor)
+            
+            goal_cost = self.g.get(self.goal_pos, float('inf'))
+        return True
+    
+    def _publish(self):
+        """Record the current solution and its suboptimality bound."""
+        goal_cost = self.g.get(self.goal_pos, float('inf'))
+        if goal_cost == float('inf'):
+            return
+        
+        path = []
+        pos = self.goal_pos
+        while pos is not None:
+            path.append(pos)
+            pos = self.parents[pos]
+        self.best_path = path[::-1]
+        
+        # The cheapest un-settled f-value is a lower bound on the optimal cost
+        lower_bound = min(
+            (self.g[pos] + manhattan_distance(pos, self.goal_pos)
+             for pos in list(self.open_keys) + list(self.inconsistent)),
+            default=goal_cost
+        )
+        self.bound = min(self.weight, goal_cost / lower_bound) if lower_bound > 0 else 1.0
+    
+    def improve(self, time_budget=None, max_expansions=None):
+        """
+        Spend up to the given budget improving the solution.
+        
+        Can be called repeatedly; each call resumes where the previous one stopped.
+        
+        Args:
+            time_budget: Wall-clock seconds to spend (None for no limit)
+            max_expansions: Number of additional node expansions allowed (None for no limit)
+            
+        Returns:
+            Tuple (path, bound): the best path found so far (or None) and its
+            suboptimality bound (path cost <= bound * optimal cost; inf if no path yet)
+        """
+        deadline = None if time_budget is None else time.perf_counter() + time_budget
+        expansion_limit = None if max_expansions is None else self.expansions + max_expansions
+        
+        if self.start_pos == self.goal_pos:
+            self.best_path = [self.start_pos]
+            self.bound = 1.0
+            self.is_optimal = True
+        
+        while not self.is_optimal:
+            if not self._improve_path(deadline, expansion_limit):
+                break
+            
+            self._publish()
+            if self.weight <= 1.0:
+                self.is_optimal = True
+                if self.best_path is not None:
+                    self.bound = 1.0
+                break
+            
+            # Lower the weight, move inconsistent nodes back to open and re-key everything
+            self.weight = max(1.0, self.weight - self.weight_decrement)
+            positions = set(self.open_keys) | self.inconsistent
+            self.inconsistent = set()
+            self.closed_set = set()
+            self.open_set = []
+            self.open_keys = {}
+            for pos in positions:
+                self._push(pos)
+        
+        return self.best_path, self.bound
+
+def anytime_astar_search(environment, start_pos, goal_pos, time_budget=None, max_expansions=None,
+                         initial_weight=3.0, weight_decrement=0.5):
+    """
+    Find the best path possible within a time or expansion budget.
+    
+    Args:
+        environment: Instance of HomeEnvironment
+        start_pos: Starting position (x, y)
+        goal_pos: Goal position (x, y)
+        time_budget: Wall-clock seconds to spend (None for no limit)
+        max_expansions: Maximum number of node expansions (None for no limit)
+        initial_weight: Heuristic inflation factor for the first iteration
+        weight_decrement: How much the weight drops after each iteration
+        
+    Returns:
+        Tuple (path, bound) as returned by AnytimeAStar.improve
+    """
+    search = AnytimeAStar(environment, start_pos, goal_pos, initial_weight, weight_decrement)
+    return search.improve(time_budget, max_expansions)
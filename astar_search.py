@@ -1,4 +1,5 @@
 import heapq
+from search_stats import SearchStats
 
 def manhattan_distance(p1, p2):
     """
@@ -13,7 +14,7 @@ def manhattan_distance(p1, p2):
     """
     return abs(p1[0] - p2[0]) + abs(p1[1] - p2[1])
 
-def astar_search(environment, start_pos, goal_pos):
+def astar_search(environment, start_pos, goal_pos, mode="astar", stats=None, stats_callback=None):
     """
     Perform A* search to find a path from start_pos to goal_pos.
     
@@ -21,6 +22,40 @@ def astar_search(environment, start_pos, goal_pos):
         environment: Instance of HomeEnvironment
         start_pos: Starting position (x, y)
         goal_pos: Goal position (x, y)
+        mode: Search variant to use: "astar" for plain A*, "jps" for
+              Jump Point Search (same path length, far fewer expansions in
+              open rooms and corridors), or "bidirectional" for bidirectional A*
+        stats: Optional SearchStats to record expansions, open-list size and timing
+               (the bidirectional mode also records per-direction counts in stats.extra)
+        stats_callback: Optional callable that receives the SearchStats when the search ends
+        
+    Returns:
+        List of tuples representing the path [(x1, y1), (x2, y2), ...] or None if no path
+    """
+    if mode not in _SEARCH_MODES:
+        raise ValueError(f"Unknown search mode: {mode}")
+    search = _SEARCH_MODES[mode]
+    
+    # Uninstrumented calls skip all bookkeeping
+    if stats is None and stats_callback is None:
+        return search(environment, start_pos, goal_pos)
+    
+    if stats is None:
+        stats = SearchStats()
+    stats.start()
+    path = search(environment, start_pos, goal_pos, stats)
+    stats.finish(len(path) - 1 if path is not None else None, stats_callback)
+    return path
+
+def plain_astar_search(environment, start_pos, goal_pos, stats=None):
+    """
+    Perform plain A* search with a Manhattan distance heuristic.
+    
+    Args:
+        environment: Instance of HomeEnvironment
+        start_pos: Starting position (x, y)
+        goal_pos: Goal position (x, y)
+        stats: Optional SearchStats to update
         
     Returns:
         List of tuples representing the path [(x1, y1), (x2, y2), ...] or None if no path
@@ -36,6 +71,9 @@ def astar_search(environment, start_pos, goal_pos):
     # Initialize closed set (positions we've already processed)
     closed_set = set()
     
+    # Positions pushed so far (only tracked when recording stats)
+    pushed = {start_pos} if stats is not None else None
+    
     while open_set:
         # Get node with lowest f_score
         _, current_pos, path_so_far = heapq.heappop(open_set)
@@ -50,6 +88,8 @@ def astar_search(environment, start_pos, goal_pos):
         
         # Add to closed set
         closed_set.add(current_pos)
+        if stats is not None:
+            stats.nodes_expanded += 1
         
         # Get valid neighbors
         neighbors = environment.get_valid_neighbors(current_pos[0], current_pos[1])
@@ -74,6 +114,308 @@ def astar_search(environment, start_pos, goal_pos):
             
             # Add to open set
             heapq.heappush(open_set, (f_score, neighbor, new_path))
+            if stats is not None:
+                stats.nodes_generated += 1
+                if neighbor in pushed:
+                    stats.duplicate_pushes += 1
+                pushed.add(neighbor)
+                stats.record_open_size(len(open_set))
+    
+    # If we get here, no path was found
+    return None 
+
+def _jump_vertical(environment, x, y, dy, goal_pos):
+    """
+    Scan vertically from (x, y) in direction dy until a jump point is found.
+    
+    A cell is a jump point if it is the goal or has a forced horizontal
+    neighbor: a free side cell whose diagonal predecessor is blocked, so the
+    canonical horizontal-first path could not have reached it.
+    
+    Args:
+        environment: Instance of HomeEnvironment
+        x, y: Cell the scan starts from (not itself tested)
+        dy: Vertical direction (+1 or -1)
+        goal_pos: Goal position (x, y)
+        
+    Returns:
+        (x, y) of the jump point, or None if the scan hits an obstacle
+    """
+    while True:
+        y += dy
+        if environment.is_obstacle(x, y):
+            return None
+        if (x, y) == goal_pos:
+            return (x, y)
+        for side in (1, -1):
+            if not environment.is_obstacle(x + side, y) and environment.is_obstacle(x + side, y - dy):
+                return (x, y)
+
+def _jump_horizontal(environment, x, y, dx, goal_pos):
+    """
+    Scan horizontally from (x, y) in direction dx until a jump point is found.
+    
+    Vertical moves are natural successors of horizontal ones, so a cell is a
+    jump point if it is the goal or a vertical scan from it finds a jump point.
+    
+    Args:
+        environment: Instance of HomeEnvironment
+        x, y: Cell the scan starts from (not itself tested)
+        dx: Horizontal direction (+1 or -1)
+        goal_pos: Goal position (x, y)
+        
+    Returns:
+        (x, y) of the jump point, or None if the scan hits an obstacle
+    """
+    while True:
+        x += dx
+        if environment.is_obstacle(x, y):
+            return None
+        if (x, y) == goal_pos:
+            return (x, y)
+        if (_jump_vertical(environment, x, y, 1, goal_pos) is not None
+                or _jump_vertical(environment, x, y, -1, goal_pos) is not None):
+            return (x, y)
+
+def _jps_directions(environment, pos, direction):
+    """
+    Get the pruned set of directions to jump in from a jump point.
+    
+    Args:
+        environment: Instance of HomeEnvironment
+        pos: Current jump point (x, y)
+        direction: (dx, dy) the jump point was reached with, or None for the start
+        
+    Returns:
+        List of (dx, dy) direction vectors
+    """
+    if direction is None:
+        return [(1, 0), (-1, 0), (0, 1), (0, -1)]
+    
+    dx, dy = direction
+    
+    # Horizontal travel: keep going, or turn up/down
+    if dy == 0:
+        return [(dx, 0), (0, 1), (0, -1)]
+    
+    # Vertical travel: keep going, plus any forced horizontal turns
+    x, y = pos
+    directions = [(0, dy)]
+    for side in (1, -1):
+        if not environment.is_obstacle(x + side, y) and environment.is_obstacle(x + side, y - dy):
+            directions.append((side, 0))
+    return directions
+
+def jump_point_search(environment, start_pos, goal_pos, stats=None):
+    """
+    Perform Jump Point Search (4-connected formulation) from start_pos to goal_pos.
+    
+    Only jump points are pushed onto the open set; straight runs between them
+    are skipped and filled back in when the path is reconstructed. Paths have
+    the same length as those returned by astar_search.
+    
+    Args:
+        environment: Instance of HomeEnvironment
+        start_pos: Starting position (x, y)
+        goal_pos: Goal position (x, y)
+        stats: Optional SearchStats to update
+        
+    Returns:
+        List of tuples representing the path [(x1, y1), (x2, y2), ...] or None if no path
+    """
+    # If start is the goal, return a single point path
+    if start_pos == goal_pos:
+        return [start_pos]
+    
+    # Open set holds (f_score, g_score, position); parents/directions are kept per jump point
+    open_set = [(manhattan_distance(start_pos, goal_pos), 0, start_pos)]
+    g_scores = {start_pos: 0}
+    parents = {start_pos: None}
+    directions = {start_pos: None}
+    closed_set = set()
+    open_positions = {start_pos}
+    
+    while open_set:
+        _, g_score, current_pos = heapq.heappop(open_set)
+        
+        if current_pos == goal_pos:
+            return _expand_jump_path(parents, goal_pos)
+        
+        # Skip stale entries and already processed jump points
+        if current_pos in closed_set or g_score > g_scores[current_pos]:
+            continue
+        closed_set.add(current_pos)
+        if stats is not None:
+            stats.nodes_expanded += 1
+        
+        for dx, dy in _jps_directions(environment, current_pos, directions[current_pos]):
+            if dy == 0:
+                jump_pos = _jump_horizontal(environment, current_pos[0], current_pos[1], dx, goal_pos)
+            else:
+                jump_pos = _jump_vertical(environment, current_pos[0], current_pos[1], dy, goal_pos)
+            
+            if jump_pos is None or jump_pos in closed_set:
+                continue
+            
+            # Jumps are straight, so their cost is the Manhattan distance
+            new_g_score = g_score + manhattan_distance(current_pos, jump_pos)
+            if new_g_score < g_scores.get(jump_pos, float('inf')):
+                g_scores[jump_pos] = new_g_score
+                parents[jump_pos] = current_pos
+                directions[jump_pos] = (dx, dy)
+                f_score = new_g_score + manhattan_distance(jump_pos, goal_pos)
+                heapq.heappush(open_set, (f_score, new_g_score, jump_pos))
+                if stats is not None:
+                    stats.nodes_generated += 1
+                    if jump_pos in open_positions:
+                        stats.duplicate_pushes += 1
+                    open_positions.add(jump_pos)
+                    stats.record_open_size(len(open_set))
     
     # If we get here, no path was found
-    return None 
\ No newline at end of file
+    return None
+
+def _expand_jump_path(parents, goal_pos):
+    """
+    Rebuild a cell-by-cell path from the parent pointers of jump points.
+    
+    Args:
+        parents: Dictionary mapping each jump point to its parent (None for the start)
+        goal_pos: Goal position (x, y)
+        
+    Returns:
+        List of tuples representing the full path from start to goal
+    """
+    jump_points = []
+    pos = goal_pos
+    while pos is not None:
+        jump_points.append(pos)
+        pos = parents[pos]
+    jump_points.reverse()
+    
+    path = [jump_points[0]]
+    for (x1, y1), (x2, y2) in zip(jump_points, jump_points[1:]):
+        step_x = (x2 > x1) - (x2 < x1)
+        step_y = (y2 > y1) - (y2 < y1)
+        x, y = x1, y1
+        while (x, y) != (x2, y2):
+            x += step_x
+            y += step_y
+            path.append((x, y))
+    return path
+
+
+def bidirectional_astar_search(environment, start_pos, goal_pos, stats=None):
+    """
+    Perform bidirectional A* search between start_pos and goal_pos.
+    
+    Both searches use the average potentials p_f(v) = (h_goal(v) - h_start(v)) / 2
+    and p_r(v) = -p_f(v), which are consistent, so each direction is Dijkstra on
+    the reduced graph and the search can stop as soon as the two smallest keys
+    add up to the best meeting cost found. Keys are doubled to stay integral.
+    The direction with the smaller open set is expanded next.
+    
+    Args:
+        environment: Instance of HomeEnvironment
+        start_pos: Starting position (x, y)
+        goal_pos: Goal position (x, y)
+        stats: Optional SearchStats to update; stats.extra['forward_expanded'] and
+               stats.extra['backward_expanded'] count the expansions in each direction
+        
+    Returns:
+        List of tuples representing the path [(x1, y1), (x2, y2), ...] or None if no path
+    """
+    if stats is not None:
+        stats.extra['forward_expanded'] = 0
+        stats.extra['backward_expanded'] = 0
+    
+    # If start is the goal, return a single point path
+    if start_pos == goal_pos:
+        return [start_pos]
+    
+    def potential(pos):
+        # Doubled forward potential; the backward potential is its negation
+        return manhattan_distance(pos, goal_pos) - manhattan_distance(pos, start_pos)
+    
+    # Per direction: open set of (key, g_score, position), g-scores, parents, closed set
+    searches = [
+        {'open': [(potential(start_pos), 0, start_pos)], 'g': {start_pos: 0},
+         'parents': {start_pos: None}, 'closed': set(), 'open_positions': {start_pos},
+         'sign': 1, 'stat': 'forward_expanded'},
+        {'open': [(-potential(goal_pos), 0, goal_pos)], 'g': {goal_pos: 0},
+         'parents': {goal_pos: None}, 'closed': set(), 'open_positions': {goal_pos},
+         'sign': -1, 'stat': 'backward_expanded'}
+    ]
+    
+    best_cost = float('inf')
+    meeting_pos = None
+    
+    while True:
+        # Drop entries for nodes already settled in their direction
+        for search in searches:
+            open_set = search['open']
+            while open_set and open_set[0][2] in search['closed']:
+                heapq.heappop(open_set)
+        
+        forward, backward = searches
+        if not forward['open'] or not backward['open']:
+            break
+        
+        # Stopping criterion: no unexplored meeting point can beat the best path
+        if forward['open'][0][0] + backward['open'][0][0] >= 2 * best_cost:
+            break
+        
+        # Balance the frontiers by expanding the smaller one
+        search, other = (forward, backward) if len(forward['open']) <= len(backward['open']) else (backward, forward)
+        _, g_score, current_pos = heapq.heappop(search['open'])
+        search['closed'].add(current_pos)
+        if stats is not None:
+            stats.nodes_expanded += 1
+            stats.extra[search['stat']] += 1
+        
+        for neighbor in environment.get_valid_neighbors(current_pos[0], current_pos[1]):
+            if neighbor in search['closed']:
+                continue
+            
+            new_g_score = g_score + 1
+            if new_g_score < search['g'].get(neighbor, float('inf')):
+                search['g'][neighbor] = new_g_score
+                search['parents'][neighbor] = current_pos
+                key = 2 * new_g_score + search['sign'] * potential(neighbor)
+                heapq.heappush(search['open'], (key, new_g_score, neighbor))
+                if stats is not None:
+                    stats.nodes_generated += 1
+                    if neighbor in search['open_positions']:
+                        stats.duplicate_pushes += 1
+                    search['open_positions'].add(neighbor)
+                    stats.record_open_size(len(forward['open']) + len(backward['open']))
+                
+                # Record the best path through a node reached from both sides
+                if neighbor in other['g'] and new_g_score + other['g'][neighbor] < best_cost:
+                    best_cost = new_g_score + other['g'][neighbor]
+                    meeting_pos = neighbor
+    
+    if meeting_pos is None:
+        return None
+    
+    # Stitch the forward half (start..meeting) to the backward half (meeting..goal)
+    path = []
+    pos = meeting_pos
+    while pos is not None:
+        path.append(pos)
+        pos = searches[0]['parents'][pos]
+    path.reverse()
+    
+    pos = searches[1]['parents'][meeting_pos]
+    while pos is not None:
+        path.append(pos)
+        pos = searches[1]['parents'][pos]
+    return path
+
+
+# Search functions selectable through astar_search's mode argument
+_SEARCH_MODES = {
+    "astar": plain_astar_search,
+    "jps": jump_point_search,
+    "bidirectional": bidirectional_astar_search
+}
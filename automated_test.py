@@ -4,7 +4,7 @@ import time
 from home_environment import HomeEnvironment
 from robot import Robot
 from action_schema import ActionSchema
-from planner import forward_planner
+from plan_cache import PlanCache
 from main import create_environment, create_action_schemas, parse_user_goal, display_belief_distribution
 from astar_search import astar_search
 
@@ -104,6 +104,9 @@ def run_automated_tests():
     # Define action schemas
     action_schemas = create_action_schemas()
     
+    # Repeated commands from the same situation reuse earlier plans
+    plan_cache = PlanCache()
+    
     # Available items and rooms for goal parsing
     available_items = ['cup', 'book', 'phone', 'toothbrush']
     available_rooms = ['kitchen', 'living_room', 'bedroom', 'bathroom']
@@ -148,7 +151,7 @@ def run_automated_tests():
         print(f"Parsed goal: {goal_preds}")
         
         # Generate plan
-        plan = forward_planner(current_state_preds, goal_preds, action_schemas)
+        plan = plan_cache.get_plan(current_state_preds, goal_preds, action_schemas)
         
         if plan:
             print(f"Plan found: {plan}")
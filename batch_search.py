@@ -0,0 +1,185 @@
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+# Environment shared by process-pool workers (set once per worker by _init_worker)
+_worker_environment = None
+
+def shortest_path_tree(environment, root):
+    """
+    Build a breadth-first shortest-path tree rooted at a cell.
+    
+    All moves cost 1, so BFS gives exact grid distances from the root to
+    every reachable cell.
+    
+    Args:
+        environment: Instance of HomeEnvironment
+        root: Root cell (x, y)
+        
+    Returns:
+        Tuple (distances, parents) of dictionaries keyed by cell; both are
+        empty if the root is an obstacle
+    """
+    if environment.is_obstacle(root[0], root[1]):
+        return {}, {}
+    
+    distances = {root: 0}
+    parents = {root: None}
+    queue = deque([root])
+    while queue:
+        current = queue.popleft()
+        for neighbor in environment.get_valid_neighbors(current[0], current[1]):
+            if neighbor not in distances:
+                distances[neighbor] = distances[current] + 1
+                parents[neighbor] = current
+                queue.append(neighbor)
+    return distances, parents
+
+def extract_path(parents, cell):
+    """
+    Extract the tree path from the root to a cell.
+    
+    Args:
+        parents: Parent dictionary from shortest_path_tree
+        cell: Target cell (x, y)
+        
+    Returns:
+        List of tuples from the root to cell, or None if cell is not in the tree
+    """
+    if cell not in parents:
+        return None
+    
+    path = []
+    while cell is not None:
+        path.append(cell)
+        cell = parents[cell]
+    path.reverse()
+    return path
+
+def _solve_group(environment, root, targets, from_goal):
+    """
+    Answer every query sharing one root with a single search tree.
+    
+    Args:
+        environment: Instance of HomeEnvironment
+        root: Shared start (or goal, if from_goal) cell
+        targets: List of the other endpoint of each query
+        from_goal: True if the tree is rooted at the shared goal
+        
+    Returns:
+        List of paths (start to goal) aligned with targets
+    """
+    _, parents = shortest_path_tree(environment, root)
+    paths = []
+    for target in targets:
+        path = extract_path(parents, target)
+        # Moves are reversible, so a goal-rooted tree path just runs backwards
+        if path is not None and from_goal:
+            path.reverse()
+        paths.append(path)
+    return paths
+
+def _init_worker(environment):
+    """Store the environment in a pool worker so tasks don't re-send it."""
+    global _worker_environment
+    _worker_environment = environment
+
+def _solve_group_in_worker(root, targets, from_goal):
+    """Process-pool entry point for _solve_group."""
+    return _solve_group(_worker_environment, root, targets, from_goal)
+
+def batch_paths(environment, pairs, processes=None):
+    """
+    Find shortest paths for many (start, goal) queries at once.
+    
+    Queries are grouped by their shared start (or shared goal, whichever side
+    has fewer distinct cells) and each group is answered from one BFS tree.
+    
+    Args:
+        environment: Instance of HomeEnvironment
+        pairs: List of (start_pos, goal_pos) tuples
+        processes: If set, spread the groups over a process pool of this size
+        
+    Returns:
+        List of paths aligned with pairs; each is a list of (x, y) tuples or
+        None if the goal is unreachable
+    """
+    starts = {start for start, _ in pairs}
+    goals = {goal for _, goal in pairs}
+    from_goal = len(goals) < len(starts)
+    
+    # Group query indices by their shared root
+    groups = {}
+    for index, (start, goal) in enumerate(pairs):
+        root, target = (goal, start) if from_goal else (start, goal)
+        groups.setdefault(root, []).append((index, target))
+    
+    results = [None] * len(pairs)
+    roots = list(groups)
+    
+    if processes:
+        with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker,
+                                 initargs=(environment,)) as executor:
+            futures = [
+                executor.submit(_solve_group_in_worker, root, [target for _, target in groups[root]], from_goal)
+                for root in roots
+            ]
+            group_paths = [future.result() for future in futures]
+    else:
+        group_paths = [
+            _solve_group(environment, root, [target for _, target in groups[root]], from_goal)
+            for root in roots
+        ]
+    
+    for root, paths in zip(roots, group_paths):
+        for (index, _), path in zip(groups[root], paths):
+            results[index] = path
+    
+    return results
+
+class DistanceFieldCache:
+    def __init__(self, environment):
+        """
+        Cache of exact grid distance fields, one per target cell.
+        
+        A distance field is the BFS distance from every free cell to a target;
+        it is a perfect heuristic for single-robot moves and is reused by every
+        search that heads to the same target.
+        
+        Args:
+            environment: Instance of HomeEnvironment
+        """
+        self.environment = environment
+        self.fields = {}
+    
+    def get(self, target):
+        """
+        Get (building it on first use) the distance field for a target cell.
+        
+        Args:
+            target: Target cell (x, y)
+            
+        Returns:
+            Dictionary mapping reachable cells to their distance from target
+        """
+        field = self.fields.get(target)
+        if field is None:
+            field, _ = shortest_path_tree(self.environment, target)
+            self.fields[target] = field
+        return field
+    
+    def distance(self, source, target):
+        """
+        Get the exact grid distance between two cells.
+        
+        Args:
+            source: Source cell (x, y)
+            target: Target cell (x, y)
+            
+        Returns:
+            Number of moves on a shortest path, or inf if unreachable
+        """
+        return self.get(target).get(source, float('inf'))
+    
+    def clear(self):
+        """Forget all cached fields (call after the map changes)."""
+        self.fields = {}
@@ -0,0 +1,173 @@
+import re
+from collections import OrderedDict
+
+# Verb phrase -> command, and the kind of name each command acts on
+COMMAND_VERBS = {
+    'fetch': 'fetch', 'bring': 'fetch', 'get': 'fetch',
+    'go to': 'go', 'move to': 'go', 'navigate to': 'go',
+    'put down': 'put', 'drop': 'put', 'place': 'put',
+}
+COMMAND_TARGETS = {'fetch': 'item', 'go': 'room', 'put': 'item'}
+
+# Preposition that introduces the room of each command ('go' names it directly)
+COMMAND_PREPOSITIONS = {'fetch': 'to', 'put': 'in'}
+
+# Commands in the order they are tried when a sentence contains several
+COMMAND_PRIORITY = ('fetch', 'go', 'put')
+
+def normalize_phrase(text):
+    """Lowercase a phrase and collapse its whitespace."""
+    return ' '.join(text.lower().split())
+
+def trie_pattern(phrases):
+    """
+    Build a regex matching any of the phrases, structured as a prefix trie.
+    
+    Phrases sharing a prefix share one branch (e.g. 'cup' and 'cupboard'
+    become 'cup(?:board)?'), so the regex engine reads each character of the
+    input once per match attempt instead of once per phrase, and the greedy
+    optional groups make the longest phrase win.
+    
+    Args:
+        phrases: Iterable of non-empty strings
+        
+    Returns:
+        Regex pattern string (without anchors or boundaries)
+    """
+    trie = {}
+    for phrase in phrases:
+        node = trie
+        for char in phrase:
+            node = node.setdefault(char, {})
+        node[''] = {}  # End of a phrase
+    return _node_pattern(trie)
+
+def _node_pattern(node):
+    """Get the regex for the phrase suffixes below a trie node."""
+    branches = [re.escape(char) + _node_pattern(child) for char, child in sorted(node.items()) if char]
+    if not branches:
+        return ''
+    pattern = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+    if '' in node:
+        pattern = '(?:' + pattern + ')?'
+    return pattern
+
+class CommandGrammar:
+    def __init__(self, items, rooms, synonyms=None):
+        """
+        Command vocabulary compiled into a single regex.
+        
+        Every verb, preposition, item and room phrase is one alternative of a
+        trie-structured regex, so a command is tokenized in one pass whatever
+        the size of the catalogue. Names with underscores also match with
+        spaces ('living room' for 'living_room').
+        
+        Args:
+            items: List of item names
+            rooms: List of room names
+            synonyms: Optional dictionary mapping extra phrases to item or room
+                      names, e.g. {'mug': 'cup', 'lounge': 'living_room'}
+        """
+        # phrase -> (kind, value), kind being 'verb', 'prep', 'item' or 'room'
+        self.phrases = {}
+        for phrase, command in COMMAND_VERBS.items():
+            self.phrases[phrase] = ('verb', command)
+        for preposition in COMMAND_PREPOSITIONS.values():
+            self.phrases[preposition] = ('prep', preposition)
+        for kind, names in (('room', rooms), ('item', items)):
+            for name in names:
+                self.phrases[normalize_phrase(name)] = (kind, name)
+                self.phrases[normalize_phrase(name.replace('_', ' '))] = (kind, name)
+        
+        for phrase, name in (synonyms or {}).items():
+            if name in items:
+                self.phrases[normalize_phrase(phrase)] = ('item', name)
+            elif name in rooms:
+                self.phrases[normalize_phrase(phrase)] = ('room', name)
+            else:
+                raise ValueError(f"Synonym '{phrase}' refers to unknown name: {name}")
+        
+        self.pattern = re.compile(r'\b(?:' + trie_pattern(self.phrases) + r')\b')
+    
+    def tokenize(self, text):
+        """
+        Find the known phrases of a command, skipping other words.
+        
+        Args:
+            text: The user's command
+            
+        Returns:
+            List of (kind, value) tuples in order of appearance
+        """
+        return [self.phrases[match.group()] for match in self.pattern.finditer(normalize_phrase(text))]
+    
+    def parse(self, text):
+        """
+        Extract the command, item and room of a sentence.
+        
+        A command is a verb directly followed by its target (other words such
+        as 'the' are skipped). If a sentence contains several, 'fetch' wins
+        over 'go', which wins over 'put'.
+        
+        Args:
+            text: The user's command, e.g. "bring the mug to the kitchen"
+            
+        Returns:
+            Tuple (command, item, room), e.g. ('fetch', 'cup', 'kitchen'), with
+            item None for 'go' and room None when no room is given; or None if
+            no command was recognized
+        """
+        tokens = self.tokenize(text)
+        
+        # First target of each command verb
+        targets = {}
+        for (kind, command), (target_kind, target) in zip(tokens, tokens[1:]):
+            if kind == 'verb' and target_kind == COMMAND_TARGETS[command]:
+                targets.setdefault(command, target)
+        
+        for command in COMMAND_PRIORITY:
+            if command not in targets:
+                continue
+            if command == 'go':
+                return command, None, targets[command]
+            
+            preposition = ('prep', COMMAND_PREPOSITIONS[command])
+            room = next((value for token, (kind, value) in zip(tokens, tokens[1:])
+                         if token == preposition and kind == 'room'), None)
+            return command, targets[command], room
+        return None
+
+# Vocabularies kept compiled for get_command_grammar
+MAX_GRAMMARS = 8
+
+# (items, rooms, synonyms) -> CommandGrammar, least recently used first
+_grammars = OrderedDict()
+
+def get_command_grammar(items, rooms, synonyms=None):
+    """
+    Get the compiled grammar of a vocabulary, compiling it on first use.
+    
+    Grammars are looked up by the vocabulary's contents, so a vocabulary
+    changed in place gets a new grammar. Building that key is linear in
+    the catalogue (though much cheaper than compiling); callers that parse
+    many commands over one vocabulary should keep a CommandGrammar and
+    pass it to parse_user_goal instead.
+    
+    Args:
+        items: List of item names
+        rooms: List of room names
+        synonyms: Optional dictionary mapping extra phrases to item or room names
+        
+    Returns:
+        CommandGrammar
+    """
+    key = (tuple(items), tuple(rooms), frozenset((synonyms or {}).items()))
+    grammar = _grammars.get(key)
+    if grammar is not None:
+        _grammars.move_to_end(key)
+        return grammar
+    
+    grammar = _grammars[key] = CommandGrammar(items, rooms, synonyms)
+    while len(_grammars) > MAX_GRAMMARS:
+        _grammars.popitem(last=False)
+    return grammar
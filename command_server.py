@@ -0,0 +1,180 @@
+import argparse
+import asyncio
+import contextlib
+import json
+import socket
+import time
+from concurrent.futures import ThreadPoolExecutor
+from main import CommandSession
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+class CommandServer:
+    def __init__(self, session=None, capacity=1, task_cache_dir=None):
+        """
+        Long-lived local server that runs robot commands on a warm CommandSession.
+        
+        The environment, robot, compiled HMM models, distance fields and
+        planning caches are built once, so a command's latency is just its
+        parse, plan and execute time. Clients send one JSON object per line,
+        e.g. {"command": "fetch cup", "id": 1}, and get one JSON line back
+        with the CommandSession.process_command result (plus the id and the
+        time the command waited for the robot). Any number of clients can be
+        connected; the asyncio front-end accepts their requests concurrently
+        and a single worker thread executes them one at a time, in arrival
+        order, since they all share one robot.
+        
+        Args:
+            session: Optional CommandSession to serve (created if None)
+            capacity: Number of items the robot can carry (when creating the session)
+            task_cache_dir: Optional directory for grounded planning tasks (when creating the session)
+        """
+        self.session = session or CommandSession(capacity, task_cache_dir)
+        self.session.robot.hmm.compile_models()
+        
+        # One worker, so commands never touch the robot at the same time
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.server = None
+        self.commands_processed = 0
+        
+        # Open connections: stream writer -> task handling the connection
+        self.clients = {}
+    
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT, path=None):
+        """
+        Start listening for clients.
+        
+        Args:
+            host: Interface to listen on for TCP (localhost by default)
+            port: TCP port (0 picks a free one)
+            path: Unix socket path; if given, listen there instead of on TCP
+            
+        Returns:
+            The socket address the server listens on
+        """
+        if path is not None:
+            self.server = await asyncio.start_unix_server(self.handle_client, path=path)
+        else:
+            self.server = await asyncio.start_server(self.handle_client, host, port)
+        return self.server.sockets[0].getsockname()
+    
+    async def serve_forever(self, host=DEFAULT_HOST, port=DEFAULT_PORT, path=None):
+        """Start the server and serve clients until cancelled."""
+        address = await self.start(host, port, path)
+        print(f"Serving robot commands on {address}")
+        try:
+            await self.server.serve_forever()
+        finally:
+            await self.close()
+    
+    async def close(self):
+        """Stop accepting clients, disconnect the open ones and wait for the running command to finish."""
+        if self.server is not None:
+            self.server.close()
+            
+            # Closing a connection ends its handler at the next request it waits for
+            for writer in list(self.clients):
+                writer.close()
+            await asyncio.gather(*self.clients.values(), return_exceptions=True)
+            await self.server.wait_closed()
+        self.executor.shutdown(wait=True)
+    
+    async def handle_client(self, reader, writer):
+        """Answer the requests of one connection in order until the client disconnects."""
+        self.clients[writer] = asyncio.current_task()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                response = await self.handle_request(line)
+                writer.write((json.dumps(response, separators=(',', ':')) + '\n').encode('utf-8'))
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            del self.clients[writer]
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+    
+    async def handle_request(self, line):
+        """
+        Run the command of one request line.
+        
+        Args:
+            line: Bytes or string holding a JSON object with a "command" string
+                  and an optional "id" that is echoed back
+                  
+        Returns:
+            Response dictionary: the command result, or {"error": message}
+        """
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            return {'error': f"Invalid JSON: {e}"}
+        if not isinstance(request, dict) or not isinstance(request.get('command'), str):
+            return {'error': "Request must be an object with a 'command' string"}
+        
+        loop = asyncio.get_running_loop()
+        try:
+            response = await loop.run_in_executor(self.executor, self._run_command, request['command'],
+                                                  time.perf_counter())
+        except Exception as e:
+            response = {'command': request['command'], 'error': f"{type(e).__name__}: {e}"}
+        if 'id' in request:
+            response['id'] = request['id']
+        return response
+    
+    def _run_command(self, command, queued_time):
+        """Process a command on the worker thread, discarding its progress messages."""
+        wait_time = time.perf_counter() - queued_time
+        result = self.session.process_command(command, report=lambda message: None)
+        result['timings_ms']['wait'] = round(wait_time * 1000, 3)
+        self.commands_processed += 1
+        return result
+
+def send_commands(commands, host=DEFAULT_HOST, port=DEFAULT_PORT, path=None):
+    """
+    Send commands to a running CommandServer over one connection.
+    
+    Args:
+        commands: List of command strings
+        host: Server host (TCP)
+        port: Server port (TCP)
+        path: Unix socket path; if given, connect there instead of over TCP
+        
+    Returns:
+        List of response dictionaries, one per command
+    """
+    if path is not None:
+        connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        connection.connect(path)
+    else:
+        connection = socket.create_connection((host, port))
+    
+    responses = []
+    with connection, connection.makefile('rw', encoding='utf-8') as stream:
+        for request_id, command in enumerate(commands):
+            stream.write(json.dumps({'command': command, 'id': request_id}) + '\n')
+            stream.flush()
+            responses.append(json.loads(stream.readline()))
+    return responses
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve robot commands over a local socket")
+    parser.add_argument('--host', default=DEFAULT_HOST, help="Interface to listen on")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help="TCP port to listen on")
+    parser.add_argument('--socket', metavar='PATH', help="Listen on a Unix socket instead of TCP")
+    parser.add_argument('--capacity', type=int, default=1, help="Number of items the robot can carry")
+    parser.add_argument('--task-cache', metavar='DIR', help="Directory to cache grounded planning tasks in")
+    args = parser.parse_args()
+    
+    server = CommandServer(capacity=args.capacity, task_cache_dir=args.task_cache)
+    try:
+        asyncio.run(server.serve_forever(args.host, args.port, args.socket))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,184 @@
+import heapq
+from astar_search import manhattan_distance
+
+INFINITY = float('inf')
+
+class DStarLite:
+    def __init__(self, environment, start_pos, goal_pos):
+        """
+        Initialize an incremental D* Lite search from start_pos to goal_pos.
+        
+        The search runs backwards from the goal and keeps its g/rhs values
+        between calls, so moving the start or changing a few cells only
+        repairs the affected part of the search instead of starting over.
+        
+        Args:
+            environment: Instance of HomeEnvironment (obstacles are read live)
+            start_pos: Starting position (x, y)
+            goal_pos: Goal position (x, y)
+        """
+        self.environment = environment
+        self.start_pos = start_pos
+        self.goal_pos = goal_pos
+        
+        # Key modifier accumulated as the start moves (keeps old keys valid)
+        self.km = 0
+        self.last_start_pos = start_pos
+        
+        # Cost-to-goal estimates; missing entries are infinite
+        self.g = {}
+        self.rhs = {goal_pos: 0}
+        
+        # Priority queue with lazy deletion: open_keys holds each vertex's live key
+        self.open_set = []
+        self.open_keys = {}
+        self._push(goal_pos, self._calculate_key(goal_pos))
+        
+        # Number of vertices expanded over the lifetime of the search
+        self.expansions = 0
+    
+    def _calculate_key(self, pos):
+        """Priority key of a vertex: (f-like estimate, tie-breaking g)."""
+        best = min(self.g.get(pos, INFINITY), self.rhs.get(pos, INFINITY))
+        return (best + manhattan_distance(self.start_pos, pos) + self.km, best)
+    
+    def _push(self, pos, key):
+        """Insert or update a vertex in the open set."""
+        self.open_keys[pos] = key
+        heapq.heappush(self.open_set, (key, pos))
+    
+    def _top(self):
+        """Return the (key, pos) at the top of the open set, dropping stale entries."""
+        while self.open_set:
+            key, pos = self.open_set[0]
+            if self.open_keys.get(pos) == key:
+                return key, pos
+            heapq.heappop(self.open_set)
+        return (INFINITY, INFINITY), None
+    
+    def _neighbors(self, pos):
+        """All in-bounds 4-neighbors of a cell, blocked or not."""
+        x, y = pos
+        return [
+            (nx, ny) for nx, ny in ((x+1, y), (x-1, y), (x, y+1), (x, y-1))
+            if 0 <= nx < self.environment.width and 0 <= ny < self.environment.height
+        ]
+    
+    def _cost(self, pos_a, pos_b):
+        """Edge cost between adjacent cells: 1, or infinite if either is blocked."""
+        if self.environment.is_obstacle(pos_a[0], pos_a[1]) or self.environment.is_obstacle(pos_b[0], pos_b[1]):
+            return INFINITY
+        return 1
+    
+    def _update_vertex(self, pos):
+        """Recompute rhs for a vertex and fix its membership in the open set."""
+        if pos != self.goal_pos:
+            self.rhs[pos] = min(
+                (self._cost(pos, succ) + self.g.get(succ, INFINITY) for succ in self._neighbors(pos)),
+                default=INFINITY
+            )
+        
+        if self.g.get(pos, INFINITY) != self.rhs.get(pos, INFINITY):
+            self._push(pos, self._calculate_key(pos))
+        else:
+            self.open_keys.pop(pos, None)
+    
+    def compute_shortest_path(self):
+        """Expand vertices until the start's cost-to-goal is consistent."""
+        while True:
+            top_key, pos = self._top()
+            start_key = self._calculate_key(self.start_pos)
+            start_consistent = self.rhs.get(self.start_pos, INFINITY) == self.g.get(self.start_pos, INFINITY)
+            if pos is None or (top_key >= start_key and start_consistent):
+                return
+            
+            self.expansions += 1
+            new_key = self._calculate_key(pos)
+            if top_key < new_key:
+                # Key is outdated (the start moved since it was queued)
+                self._push(pos, new_key)
+            elif self.g.get(pos, INFINITY) > self.rhs.get(pos, INFINITY):
+                # Overconsistent: lock in the better value and propagate it
+                self.g[pos] = self.rhs[pos]
+                self.open_keys.pop(pos, None)
+                for pred in self._neighbors(pos):
+                    self._update_vertex(pred)
+            else:
+                # Underconsistent: invalidate and let neighbors find a new route
+                self.g[pos] = INFINITY
+                for pred in self._neighbors(pos) + [pos]:
+                    self._update_vertex(pred)
+    
+    def update_start(self, start_pos):
+        """
+        Tell the search the robot is now at start_pos.
+        
+        Args:
+            start_pos: New starting position (x, y)
+        """
+        self.km += manhattan_distance(self.last_start_pos, start_pos)
+        self.last_start_pos = start_pos
+        self.start_pos = start_pos
+    
+    def update_cells(self, changed_cells):
+        """
+        Tell the search that the obstacle status of some cells has changed.
+        
+        The environment must already reflect the change; every edge touching
+        a changed cell is re-evaluated.
+        
+        Args:
+            changed_cells: Iterable of (x, y) cells that became blocked or free
+        """
+        affected = set()
+        for cell in changed_cells:
+            affected.add(cell)
+            affected.update(self._neighbors(cell))
+        for pos in affected:
+            self._update_vertex(pos)
+    
+    def next_step(self):
+        """
+        Get the next cell to move to from the current start.
+        
+        Returns:
+            (x, y) of the next cell, the start itself if already at the goal,
+            or None if the goal is unreachable
+        """
+        self.compute_shortest_path()
+        if self.start_pos == self.goal_pos:
+            return self.start_pos
+        if self.g.get(self.start_pos, INFINITY) == INFINITY:
+            return None
+        return self._best_successor(self.start_pos)
+    
+    def _best_successor(self, pos):
+        """Neighbor of pos minimizing edge cost plus cost-to-goal."""
+        best_pos = None
+        best_cost = INFINITY
+        for succ in self._neighbors(pos):
+            cost = self._cost(pos, succ) + self.g.get(succ, INFINITY)
+            if cost < best_cost:
+                best_pos = succ
+                best_cost = cost
+        return best_pos
+    
+    def get_path(self):
+        """
+        Get the current shortest path from the start to the goal.
+        
+        Returns:
+            List of tuples representing the path [(x1, y1), (x2, y2), ...] or None if no path
+        """
+        self.compute_shortest_path()
+        if self.g.get(self.start_pos, INFINITY) == INFINITY and self.start_pos != self.goal_pos:
+            return None
+        
+        path = [self.start_pos]
+        pos = self.start_pos
+        while pos != self.goal_pos:
+            pos = self._best_successor(pos)
+            if pos is None or len(path) > len(self.g) + 1:
+                return None
+            path.append(pos)
+        return path
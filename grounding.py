@@ -0,0 +1,407 @@
+import copy
+import itertools
+from collections import defaultdict
+
+def set_bits(mask):
+    """
+    List the positions of the set bits of an integer.
+    
+    Args:
+        mask: Non-negative integer bitset
+        
+    Returns:
+        List of bit positions in increasing order
+    """
+    positions = []
+    while mask:
+        low_bit = mask & -mask
+        positions.append(low_bit.bit_length() - 1)
+        mask ^= low_bit
+    return positions
+
+class StateEncoder:
+    def __init__(self):
+        """
+        Interns ground predicates as bit positions so states can be stored as ints.
+        
+        A state is the integer with bit i set when predicates[i] holds.
+        """
+        self.predicate_ids = {}
+        self.predicates = []
+    
+    def predicate_id(self, pred):
+        """Get the bit position of a predicate, interning it if needed."""
+        pred_id = self.predicate_ids.get(pred)
+        if pred_id is None:
+            pred_id = len(self.predicates)
+            self.predicate_ids[pred] = pred_id
+            self.predicates.append(pred)
+        return pred_id
+    
+    def encode(self, preds):
+        """
+        Encode a set of predicate tuples as a bitset.
+        
+        Args:
+            preds: Iterable of predicate tuples
+            
+        Returns:
+            Integer with one bit set per predicate
+        """
+        state = 0
+        for pred in preds:
+            state |= 1 << self.predicate_id(pred)
+        return state
+    
+    def decode(self, state):
+        """
+        Decode a bitset back into predicate tuples.
+        
+        Args:
+            state: Integer bitset produced by encode
+            
+        Returns:
+            List of predicate tuples whose bits are set
+        """
+        preds = []
+        while state:
+            low_bit = state & -state
+            preds.append(self.predicates[low_bit.bit_length() - 1])
+            state ^= low_bit
+        return preds
+    
+    def action_masks(self, action_schema, parameter_bindings):
+        """
+        Get the precondition, add and delete masks of a ground action.
+        
+        Args:
+            action_schema: The ActionSchema object
+            parameter_bindings: Dictionary mapping parameter (and free variable) names to values
+            
+        Returns:
+            Tuple (pre_mask, add_mask, del_mask)
+        """
+        def ground(preds):
+            return self.encode(tuple(parameter_bindings.get(arg, arg) for arg in pred) for pred in preds)
+        
+        return (ground(action_schema.preconditions),
+                ground(action_schema.add_effects),
+                ground(action_schema.delete_effects))
+
+class GroundAction:
+    def __init__(self, action_id, instantiated_action, bindings, preconditions, pre_mask, add_mask, del_mask):
+        """
+        A fully instantiated action with its effects as bit masks.
+        
+        Args:
+            action_id: Index of the action in GroundedTask.actions
+            instantiated_action: Action tuple as returned in plans, e.g. ('PickUp', 'cup', 'kitchen')
+            bindings: Dictionary mapping schema variables to objects
+            preconditions: Sorted predicate ids the state must contain
+            pre_mask: Bitset of the preconditions
+            add_mask: Bitset of the add effects
+            del_mask: Bitset of the delete effects
+        """
+        self.action_id = action_id
+        self.instantiated_action = instantiated_action
+        self.bindings = bindings
+        self.preconditions = preconditions
+        self.pre_mask = pre_mask
+        self.add_mask = add_mask
+        self.del_mask = del_mask
+    
+    def is_applicable(self, state):
+        """Check if the action's preconditions hold in a bitset state."""
+        return state & self.pre_mask == self.pre_mask
+    
+    def apply(self, state):
+        """Get the bitset state after applying the action."""
+        return (state & ~self.del_mask) | self.add_mask
+    
+    def __repr__(self):
+        """Detailed representation of the ground action."""
+        return f"GroundAction({self.action_id}, {self.instantiated_action})"
+
+class SuccessorGenerator:
+    def __init__(self, actions, ignored_predicates=0):
+        """
+        Decision tree over precondition predicates that returns applicable actions.
+        
+        Each inner node tests one predicate: actions requiring it live in the
+        'true' branch, the rest in the 'don't care' branch, so a lookup only
+        visits branches compatible with the state.
+        
+        Args:
+            actions: List of GroundAction objects
+            ignored_predicates: Bitset of predicates known to hold in every state
+                                (e.g. static facts), which the tree does not test
+        """
+        entries = []
+        for action in actions:
+            conditions = [pred_id for pred_id in action.preconditions
+                          if not (ignored_predicates >> pred_id) & 1]
+            entries.append((conditions, action))
+        self.root = self._build(entries, 0)
+    
+    def _build(self, entries, depth):
+        """
+        Build a node from actions whose first `depth` conditions are already tested.
+        
+        Returns:
+            Tuple (immediate_actions, pred_id, true_child, dont_care_child), or None for an empty node
+        """
+        if not entries:
+            return None
+        
+        immediate = [action for conditions, action in entries if len(conditions) == depth]
+        
+        # Split the entries by their next condition in one pass
+        groups = defaultdict(list)
+        for entry in entries:
+            if len(entry[0]) > depth:
+                groups[entry[0][depth]].append(entry)
+        if not groups:
+            return (immediate, None, None, None)
+        
+        # One node per predicate, smallest id first, chained through the
+        # 'don't care' branches (built from the back, so no deep recursion)
+        pred_ids = sorted(groups)
+        dont_care_child = None
+        for pred_id in reversed(pred_ids[1:]):
+            dont_care_child = ([], pred_id, self._build(groups[pred_id], depth + 1), dont_care_child)
+        return (immediate, pred_ids[0], self._build(groups[pred_ids[0]], depth + 1), dont_care_child)
+    
+    def applicable_actions(self, state):
+        """
+        Get all actions whose preconditions hold in a bitset state.
+        
+        Args:
+            state: Integer bitset of true predicates
+            
+        Returns:
+            List of applicable GroundAction objects
+        """
+        applicable = []
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            if node is None:
+                continue
+            immediate, pred_id, true_child, dont_care_child = node
+            applicable.extend(immediate)
+            if pred_id is None:
+                continue
+            stack.append(dont_care_child)
+            if (state >> pred_id) & 1:
+                stack.append(true_child)
+        return applicable
+
+class GroundedTask:
+    def __init__(self, action_schemas, state_preds, goal_preds=(), ground=True):
+        """
+        Ground every action schema once against the objects of a planning problem.
+        
+        Schema terms that are parameters are variables; other terms are
+        constants if they name an object in the state or goal (e.g. 'robot')
+        or are added by a schema that does not bind them (e.g. 'nothing'), and
+        free variables otherwise (e.g. 'current_room').
+        Constants are never bound to variables. Variable domains come from a
+        fixpoint over the predicate argument positions the objects can reach,
+        and predicates no schema changes are static: they are checked here
+        once instead of during search.
+        
+        Args:
+            action_schemas: List of ActionSchema instances
+            state_preds: Set of predicate tuples describing the world
+            goal_preds: Set of predicate tuples (their objects are added to the domain)
+            ground: If False, only compute the variable domains and leave the
+                    grounding to a later ground() call (e.g. after a cache lookup)
+        """
+        self.action_schemas = list(action_schemas)
+        self.encoder = StateEncoder()
+        
+        self.objects = set()
+        for pred in itertools.chain(state_preds, goal_preds):
+            self.objects.update(arg for arg in pred[1:] if isinstance(arg, str))
+        
+        # Predicates that some action can change; everything else is static
+        self.fluent_predicates = {pred[0] for schema in self.action_schemas
+                                  for pred in itertools.chain(schema.add_effects, schema.delete_effects)}
+        self.static_facts = frozenset(pred for pred in state_preds if pred[0] not in self.fluent_predicates)
+        self.static_mask = self.encoder.encode(self.static_facts)
+        
+        # Terms added without being bound by the schema (e.g. 'nothing') are constants too
+        self.constants = set(self.objects)
+        for schema in self.action_schemas:
+            bound_terms = set(schema.parameters) | {arg for pred in schema.preconditions for arg in pred[1:]}
+            self.constants.update(arg for pred in schema.add_effects for arg in pred[1:] if arg not in bound_terms)
+        
+        self.schema_variables = {schema.name: self._schema_variables(schema) for schema in self.action_schemas}
+        self.position_values = self._reachable_position_values(state_preds)
+        
+        self.actions = []
+        if ground:
+            self.ground()
+    
+    def ground(self):
+        """Instantiate every schema and build the action indexes."""
+        self.actions = []
+        for schema in self.action_schemas:
+            self._ground_schema(schema)
+        self._index_actions()
+    
+    def __getstate__(self):
+        """Pickle without the derived indexes (rebuilt on load), keeping the payload small."""
+        state = self.__dict__.copy()
+        del state['successor_generator']
+        del state['actions_by_name']
+        del state['precondition_of']
+        return state
+    
+    def __setstate__(self, state):
+        """Restore a pickled task and rebuild its indexes."""
+        self.__dict__.update(state)
+        self._index_actions()
+    
+    def _index_actions(self):
+        """Build the successor generator, name lookup and precondition index for the current actions."""
+        self.successor_generator = SuccessorGenerator(self.actions, self.static_mask)
+        
+        # Plans name actions by their parameters only, so one name can cover several ground actions
+        self.actions_by_name = defaultdict(list)
+        for action in self.actions:
+            self.actions_by_name[action.instantiated_action].append(action)
+        
+        # Predicate id -> ids of the actions it is a precondition of (used by
+        # reachability analysis and the relaxed heuristics)
+        self.precondition_of = defaultdict(list)
+        for action in self.actions:
+            for pred_id in action.preconditions:
+                self.precondition_of[pred_id].append(action.action_id)
+    
+    def _schema_variables(self, schema):
+        """Get a schema's variables: its parameters, then its free terms in order of appearance."""
+        variables = list(schema.parameters)
+        for pred in itertools.chain(sorted(schema.preconditions), sorted(schema.add_effects), sorted(schema.delete_effects)):
+            for arg in pred[1:]:
+                if arg not in variables and arg not in self.constants:
+                    variables.append(arg)
+        return variables
+    
+    def _variable_domains(self, schema, position_values):
+        """
+        Get the objects each schema variable can take.
+        
+        A variable must fit every precondition position it appears in (or every
+        effect position if it has no precondition), and is never a constant.
+        """
+        variables = self.schema_variables[schema.name]
+        constants = {arg for pred in itertools.chain(schema.preconditions, schema.add_effects, schema.delete_effects)
+                     for arg in pred[1:] if arg not in variables}
+        
+        domains = {}
+        for variable in variables:
+            occurrences = [(pred[0], i) for pred in schema.preconditions for i, arg in enumerate(pred[1:]) if arg == variable]
+            if not occurrences:
+                occurrences = [(pred[0], i) for pred in itertools.chain(schema.add_effects, schema.delete_effects)
+                               for i, arg in enumerate(pred[1:]) if arg == variable]
+            
+            domain = self.objects - constants
+            for position in occurrences:
+                domain = domain & position_values[position]
+            domains[variable] = domain
+        return domains
+    
+    def _reachable_position_values(self, state_preds):
+        """
+        Compute which objects can appear at each (predicate, argument) position.
+        
+        Starts from the given state and adds the values that add effects can
+        place at each position until nothing changes.
+        """
+        position_values = defaultdict(set)
+        for pred in state_preds:
+            for i, arg in enumerate(pred[1:]):
+                position_values[(pred[0], i)].add(arg)
+        
+        changed = True
+        while changed:
+            changed = False
+            for schema in self.action_schemas:
+                domains = self._variable_domains(schema, position_values)
+                for pred in schema.add_effects:
+                    for i, arg in enumerate(pred[1:]):
+                        values = domains[arg] if arg in domains else {arg}
+                        target = position_values[(pred[0], i)]
+                        if not values <= target:
+                            target |= values
+                            changed = True
+        return position_values
+    
+    def _ground_schema(self, schema):
+        """Instantiate a schema for every binding whose static preconditions hold."""
+        variables = self.schema_variables[schema.name]
+        domains = self._variable_domains(schema, self.position_values)
+        static_preconditions = [pred for pred in schema.preconditions if pred[0] not in self.fluent_predicates]
+        
+        for values in itertools.product(*(sorted(domains[variable]) for variable in variables)):
+            bindings = dict(zip(variables, values))
+            if any(tuple(bindings.get(arg, arg) for arg in pred) not in self.static_facts
+                   for pred in static_preconditions):
+                continue
+            
+            pre_mask, add_mask, del_mask = self.encoder.action_masks(schema, bindings)
+            preconditions = set_bits(pre_mask)
+            instantiated_action = (schema.name,) + tuple(bindings[param] for param in schema.parameters)
+            self.actions.append(GroundAction(len(self.actions), instantiated_action, bindings,
+                                             preconditions, pre_mask, add_mask, del_mask))
+    
+    def encode(self, preds):
+        """Encode predicate tuples as a bitset over this task's predicates."""
+        return self.encoder.encode(preds)
+    
+    def decode(self, state):
+        """Decode a bitset back into predicate tuples."""
+        return self.encoder.decode(state)
+    
+    def applicable_actions(self, state):
+        """Get the ground actions applicable in a bitset state."""
+        return self.successor_generator.applicable_actions(state)
+    
+    def find_action(self, instantiated_action, state):
+        """
+        Find the ground action a plan step refers to in a given state.
+        
+        Args:
+            instantiated_action: Action tuple from a plan, e.g. ('GoTo', 'kitchen')
+            state: Bitset state the step is executed in
+            
+        Returns:
+            Applicable GroundAction with that name and arguments, or None
+        """
+        for action in self.actions_by_name.get(tuple(instantiated_action), ()):
+            if action.is_applicable(state):
+                return action
+        return None
+    
+    def restrict(self, action_ids):
+        """
+        Get a copy of the task that keeps only some of its ground actions.
+        
+        The copy shares the predicate encoding, so states and goals encoded
+        for this task stay valid; kept actions are renumbered from 0.
+        
+        Args:
+            action_ids: Ids of the actions to keep
+            
+        Returns:
+            New GroundedTask with the given actions
+        """
+        subtask = copy.copy(self)
+        subtask.actions = []
+        for action_id in sorted(action_ids):
+            action = self.actions[action_id]
+            subtask.actions.append(GroundAction(len(subtask.actions), action.instantiated_action, action.bindings,
+                                                action.preconditions, action.pre_mask, action.add_mask, action.del_mask))
+        subtask._index_actions()
+        return subtask
@@ -0,0 +1,128 @@
+import heapq
+from grounding import set_bits
+
+class RelaxedHeuristic:
+    def __init__(self, task, goal, kind="ff", costs=None):
+        """
+        Delete-relaxation heuristics over a grounded task.
+        
+        'add' sums the relaxed costs of the goal facts, 'max' takes the largest
+        one (admissible, so A* with it stays optimal) and 'ff' sums the costs
+        of a relaxed plan extracted from the h_add best supporters.
+        
+        Args:
+            task: GroundedTask to evaluate states of
+            goal: Bitset of goal predicates
+            kind: One of 'add', 'max' or 'ff'
+            costs: Optional list of action costs indexed by action id (None for unit costs)
+        """
+        if kind not in ("add", "max", "ff"):
+            raise ValueError(f"Unknown heuristic: {kind}")
+        self.task = task
+        self.kind = kind
+        self.goal_facts = set_bits(goal)
+        self.costs = [1] * len(task.actions) if costs is None else list(costs)
+        
+        # Static per-action data so each evaluation only walks lists of ints
+        self.preconditions = [action.preconditions for action in task.actions]
+        self.add_effects = [set_bits(action.add_mask) for action in task.actions]
+        self.precondition_of = task.precondition_of
+        self.no_precondition_actions = [action.action_id for action in task.actions if not action.preconditions]
+    
+    def _explore(self, state):
+        """
+        Compute relaxed fact costs from a state (generalized Dijkstra).
+        
+        Returns:
+            Tuple (costs, supporters): cost of each reached predicate id and
+            the action that reaches it most cheaply
+        """
+        use_max = self.kind == "max"
+        costs = {}
+        supporters = {}
+        unsatisfied = [len(preconditions) for preconditions in self.preconditions]
+        action_costs = [0] * len(unsatisfied)
+        open_set = [(0, pred_id) for pred_id in set_bits(state)]
+        heapq.heapify(open_set)
+        for pred_id in set_bits(state):
+            costs[pred_id] = 0
+        
+        def trigger(action_id):
+            cost = action_costs[action_id] + self.costs[action_id]
+            for pred_id in self.add_effects[action_id]:
+                if cost < costs.get(pred_id, float('inf')):
+                    costs[pred_id] = cost
+                    supporters[pred_id] = action_id
+                    heapq.heappush(open_set, (cost, pred_id))
+        
+        for action_id in self.no_precondition_actions:
+            trigger(action_id)
+        
+        goals_left = set(self.goal_facts)
+        done = set()
+        while open_set and goals_left:
+            cost, pred_id = heapq.heappop(open_set)
+            if pred_id in done:
+                continue
+            done.add(pred_id)
+            goals_left.discard(pred_id)
+            
+            for action_id in self.precondition_of.get(pred_id, ()):
+                unsatisfied[action_id] -= 1
+                if use_max:
+                    action_costs[action_id] = max(action_costs[action_id], cost)
+                else:
+                    action_costs[action_id] += cost
+                if unsatisfied[action_id] == 0:
+                    trigger(action_id)
+        
+        return costs, supporters
+    
+    def evaluate(self, state):
+        """
+        Estimate the cost (number of actions with unit costs) of reaching the goal.
+        
+        Args:
+            state: Bitset state
+            
+        Returns:
+            Heuristic value (float('inf') if the goal is unreachable even when relaxed)
+        """
+        return self.evaluate_with_helpful_actions(state)[0]
+    
+    def evaluate_with_helpful_actions(self, state):
+        """
+        Estimate the goal distance and find the helpful actions of a state.
+        
+        Helpful actions are relaxed-plan actions applicable in the state
+        (only computed for the 'ff' heuristic).
+        
+        Args:
+            state: Bitset state
+            
+        Returns:
+            Tuple (heuristic value, set of helpful action ids)
+        """
+        costs, supporters = self._explore(state)
+        goal_costs = [costs.get(pred_id) for pred_id in self.goal_facts]
+        if any(cost is None for cost in goal_costs):
+            return float('inf'), set()
+        
+        if self.kind == "add":
+            return sum(goal_costs), set()
+        if self.kind == "max":
+            return max(goal_costs, default=0), set()
+        
+        # Extract a relaxed plan backwards from the goals
+        relaxed_plan = set()
+        stack = [pred_id for pred_id in self.goal_facts if costs[pred_id] > 0]
+        while stack:
+            action_id = supporters[stack.pop()]
+            if action_id in relaxed_plan:
+                continue
+            relaxed_plan.add(action_id)
+            stack.extend(pred_id for pred_id in self.preconditions[action_id] if costs[pred_id] > 0)
+        
+        helpful_actions = {action_id for action_id in relaxed_plan
+                           if self.task.actions[action_id].is_applicable(state)}
+        return sum(self.costs[action_id] for action_id in relaxed_plan), helpful_actions
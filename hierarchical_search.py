@@ -0,0 +1,285 @@
+import heapq
+import itertools
+from collections import deque
+from astar_search import manhattan_distance
+
+# Sentinel nodes for the start and goal cells inserted into the abstract graph
+_START = 'start'
+_GOAL = 'goal'
+
+class HierarchicalPathfinder:
+    def __init__(self, environment, max_entrance_width=6):
+        """
+        Build an HPA*-style abstract graph over the rooms of the environment.
+        
+        Each connected region of cells sharing a room type (unmarked cells form
+        hallway regions) is a cluster. Portal cells are placed on the entrances
+        between clusters, and portal-to-portal costs inside each cluster are
+        precomputed so a query only searches the small abstract graph and then
+        refines the edges it actually uses.
+        
+        Args:
+            environment: Instance of HomeEnvironment
+            max_entrance_width: Entrances up to this many cells wide get a single
+                                portal in the middle; wider ones get one at each end
+        """
+        self.environment = environment
+        self.max_entrance_width = max_entrance_width
+        
+        # Cluster id for every free cell, and the cells of each cluster
+        self.cluster_of = {}
+        self.clusters = []
+        
+        # Portal cell -> list of portal cells across the entrance (cost 1 each)
+        self.portal_partners = {}
+        
+        # Cluster id -> list of portal cells inside that cluster
+        self.cluster_portals = {}
+        
+        # Portal cell -> {other portal in same cluster: distance}
+        self.intra_edges = {}
+        
+        # Portal cell -> BFS parent tree rooted at that portal, restricted to its cluster
+        self._portal_trees = {}
+        
+        self._build_clusters()
+        self._build_portals()
+        self._build_intra_edges()
+    
+    def _build_clusters(self):
+        """Flood-fill free cells into clusters of identical room type."""
+        env = self.environment
+        for y in range(env.height):
+            for x in range(env.width):
+                if env.is_obstacle(x, y) or (x, y) in self.cluster_of:
+                    continue
+                
+                cluster_id = len(self.clusters)
+                room_type = env.get_room_type(x, y)
+                cells = [(x, y)]
+                self.cluster_of[(x, y)] = cluster_id
+                queue = deque([(x, y)])
+                while queue:
+                    cx, cy = queue.popleft()
+                    for neighbor in env.get_valid_neighbors(cx, cy):
+                        if neighbor not in self.cluster_of and env.get_room_type(neighbor[0], neighbor[1]) == room_type:
+                            self.cluster_of[neighbor] = cluster_id
+                            cells.append(neighbor)
+                            queue.append(neighbor)
+                self.clusters.append(cells)
+    
+    def _build_portals(self):
+        """Group boundary cell pairs into entrances and place portals on them."""
+        # Boundary pairs (a, b) with b to the right of or below a, keyed by
+        # (cluster of a, cluster of b, orientation)
+        boundary = {}
+        for (x, y), cluster_id in self.cluster_of.items():
+            for offset in ((1, 0), (0, 1)):
+                other = (x + offset[0], y + offset[1])
+                other_cluster = self.cluster_of.get(other)
+                if other_cluster is not None and other_cluster != cluster_id:
+                    key = (cluster_id, other_cluster, offset)
+                    boundary.setdefault(key, set()).add((x, y))
+        
+        for (_, _, offset), cells in boundary.items():
+            # Entrances run perpendicular to the crossing direction
+            step = (0, 1) if offset == (1, 0) else (1, 0)
+            for segment in self._contiguous_segments(cells, step):
+                if len(segment) <= self.max_entrance_width:
+                    chosen = [segment[len(segment) // 2]]
+                else:
+                    chosen = [segment[0], segment[-1]]
+                for cell in chosen:
+                    other = (cell[0] + offset[0], cell[1] + offset[1])
+                    self._add_portal_pair(cell, other)
+    
+    def _contiguous_segments(self, cells, step):
+        """
+        Split a set of boundary cells into contiguous runs along step.
+        
+        Args:
+            cells: Set of (x, y) cells on one side of a boundary
+            step: (dx, dy) direction along the boundary
+        
+        Returns:
+            List of segments, each a list of cells in order
+        """
+        segments = []
+        for cell in sorted(cells, key=lambda c: (c[1], c[0]) if step == (1, 0) else (c[0], c[1])):
+            previous = (cell[0] - step[0], cell[1] - step[1])
+            if segments and segments[-1][-1] == previous:
+                segments[-1].append(cell)
+            else:
+                segments.append([cell])
+        return segments
+    
+    def _add_portal_pair(self, cell, other):
+        """Register two adjacent cells in different clusters as linked portals."""
+        for a, b in ((cell, other), (other, cell)):
+            partners = self.portal_partners.setdefault(a, [])
+            if b not in partners:
+                partners.append(b)
+            portals = self.cluster_portals.setdefault(self.cluster_of[a], [])
+            if a not in portals:
+                portals.append(a)
+    
+    def _build_intra_edges(self):
+        """Precompute portal-to-portal distances (and paths) inside each cluster."""
+        for portal, cluster_id in ((p, self.cluster_of[p]) for p in self.portal_partners):
+            distances, parents = self._cluster_bfs(portal, cluster_id)
+            self._portal_trees[portal] = parents
+            self.intra_edges[portal] = {
+                other: distances[other]
+                for other in self.cluster_portals[cluster_id]
+                if other != portal and other in distances
+            }
+    
+    def _cluster_bfs(self, root, cluster_id):
+        """
+        Breadth-first search from root that never leaves its cluster.
+        
+        Args:
+            root: Starting cell (x, y)
+            cluster_id: Cluster the search is restricted to
+        
+        Returns:
+            Tuple (distances, parents) of dictionaries keyed by cell
+        """
+        distances = {root: 0}
+        parents = {root: None}
+        queue = deque([root])
+        while queue:
+            current = queue.popleft()
+            for neighbor in self.environment.get_valid_neighbors(current[0], current[1]):
+                if neighbor not in distances and self.cluster_of.get(neighbor) == cluster_id:
+                    distances[neighbor] = distances[current] + 1
+                    parents[neighbor] = current
+                    queue.append(neighbor)
+        return distances, parents
+    
+    def find_path(self, start_pos, goal_pos):
+        """
+        Find a path from start_pos to goal_pos through the abstract room graph.
+        
+        The start and goal cells are connected to the portals of their own
+        clusters on the fly; only the abstract edges on the chosen route are
+        refined back into cells. Paths are near-optimal (portals sit on a
+        subset of each entrance).
+        
+        Args:
+            start_pos: Starting position (x, y)
+            goal_pos: Goal position (x, y)
+        
+        Returns:
+            List of tuples representing the path [(x1, y1), (x2, y2), ...] or None if no path
+        """
+        if start_pos == goal_pos:
+            return [start_pos]
+        
+        start_cluster = self.cluster_of.get(start_pos)
+        goal_cluster = self.cluster_of.get(goal_pos)
+        if start_cluster is None or goal_cluster is None:
+            return None
+        
+        # Insert start and goal: connect each to the portals of its own cluster
+        start_distances, start_parents = self._cluster_bfs(start_pos, start_cluster)
+        goal_distances, goal_parents = self._cluster_bfs(goal_pos, goal_cluster)
+        
+        abstract_path = self._search_abstract(start_pos, goal_pos, start_cluster, goal_cluster,
+                                              start_distances, goal_distances)
+        if abstract_path is None:
+            return None
+        
+        return self._refine(abstract_path, start_pos, goal_pos, start_parents, goal_parents)
+    
+    def _search_abstract(self, start_pos, goal_pos, start_cluster, goal_cluster,
+                         start_distances, goal_distances):
+        """
+        A* over the abstract graph of portals plus the inserted start and goal.
+        
+        Returns:
+            List of abstract nodes from _START to _GOAL, or None if unreachable
+        """
+        def neighbors(node):
+            if node == _START:
+                edges = [(p, start_distances[p]) for p in self.cluster_portals.get(start_cluster, [])
+                         if p in start_distances]
+                if start_cluster == goal_cluster and goal_pos in start_distances:
+                    edges.append((_GOAL, start_distances[goal_pos]))
+                return edges
+            
+            edges = list(self.intra_edges[node].items())
+            edges.extend((partner, 1) for partner in self.portal_partners[node])
+            if self.cluster_of[node] == goal_cluster and node in goal_distances:
+                edges.append((_GOAL, goal_distances[node]))
+            return edges
+        
+        def heuristic(node):
+            if node == _GOAL:
+                return 0
+            return manhattan_distance(start_pos if node == _START else node, goal_pos)
+        
+        # The counter breaks f-score ties so positions and sentinels are never compared
+        counter = itertools.count()
+        open_set = [(heuristic(_START), next(counter), 0, _START)]
+        g_scores = {_START: 0}
+        parents = {_START: None}
+        closed_set = set()
+        
+        while open_set:
+            _, _, g_score, node = heapq.heappop(open_set)
+            if node == _GOAL:
+                path = []
+                while node is not None:
+                    path.append(node)
+                    node = parents[node]
+                return path[::-1]
+            
+            if node in closed_set:
+                continue
+            closed_set.add(node)
+            
+            for neighbor, cost in neighbors(node):
+                new_g_score = g_score + cost
+                if neighbor not in closed_set and new_g_score < g_scores.get(neighbor, float('inf')):
+                    g_scores[neighbor] = new_g_score
+                    parents[neighbor] = node
+                    heapq.heappush(open_set, (new_g_score + heuristic(neighbor), next(counter), new_g_score, neighbor))
+        
+        return None
+    
+    def _refine(self, abstract_path, start_pos, goal_pos, start_parents, goal_parents):
+        """Turn a sequence of abstract nodes into a cell-by-cell path."""
+        path = [start_pos]
+        for node, next_node in zip(abstract_path, abstract_path[1:]):
+            if node == _START:
+                target = goal_pos if next_node == _GOAL else next_node
+                segment = _trace(start_parents, target)[::-1]
+            elif next_node == _GOAL:
+                # Goal tree is rooted at the goal, so tracing already runs portal -> goal
+                segment = _trace(goal_parents, node)
+            elif next_node in self.portal_partners[node]:
+                segment = [node, next_node]
+            else:
+                segment = _trace(self._portal_trees[node], next_node)[::-1]
+            
+            # Consecutive segments share their junction cell
+            path.extend(segment[1:])
+        return path
+
+def _trace(parents, cell):
+    """
+    Follow parent pointers from cell back to the root of a search tree.
+    
+    Args:
+        parents: Dictionary mapping cells to their parent (None for the root)
+        cell: Cell to start from
+    
+    Returns:
+        List of cells from cell to the root
+    """
+    cells = []
+    while cell is not None:
+        cells.append(cell)
+        cell = parents[cell]
+    return cells
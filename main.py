@@ -1,9 +1,18 @@
+import argparse
+import json
+import sys
+import time
 import numpy as np
 import random
 from home_environment import HomeEnvironment
 from robot import Robot
 from action_schema import ActionSchema
-from planner import forward_planner
+from plan_cache import PlanCache
+from plan_repair import repair_plan
+from travel_costs import TravelCostModel
+from task_queue import TaskQueue
+from task_cache import GroundedTaskCache
+from command_grammar import CommandGrammar, get_command_grammar
 
 def create_environment():
     """Create a sample home environment."""
@@ -31,8 +40,18 @@ def create_environment():
     # Create the environment
     return HomeEnvironment(grid_layout, item_locations)
 
-def create_action_schemas():
-    """Create action schemas for planning."""
+def create_action_schemas(capacity=1):
+    """
+    Create action schemas for planning.
+    
+    Args:
+        capacity: Number of items the robot can carry at once. With 1 the
+                  hands are either holding an item or ('Holding', 'robot', 'nothing');
+                  larger capacities count free slots (see action_schema.capacity_predicates)
+    
+    Returns:
+        List of ActionSchema instances
+    """
     # GoTo action schema
     goto_action = ActionSchema(
         name="GoTo",
@@ -84,9 +103,53 @@ def create_action_schemas():
         }
     )
     
+    if capacity == 1:
+        return [goto_action, pickup_action, putdown_action]
+    
+    # With several slots, PickUp takes one free slot and PutDown gives one back.
+    # The slot counts are free terms rather than parameters, so plan steps
+    # still read ('PickUp', item, room).
+    pickup_action = ActionSchema(
+        name="PickUp",
+        parameters=('item', 'room'),
+        preconditions={
+            ('At', 'robot', 'room'),
+            ('At', 'item', 'room'),
+            ('FreeSlots', 'robot', 'free_slots'),
+            ('Succ', 'fewer_slots', 'free_slots')
+        },
+        add_effects={
+            ('Holding', 'robot', 'item'),
+            ('FreeSlots', 'robot', 'fewer_slots')
+        },
+        delete_effects={
+            ('At', 'item', 'room'),
+            ('FreeSlots', 'robot', 'free_slots')
+        }
+    )
+    
+    putdown_action = ActionSchema(
+        name="PutDown",
+        parameters=('item', 'room'),
+        preconditions={
+            ('At', 'robot', 'room'),
+            ('Holding', 'robot', 'item'),
+            ('FreeSlots', 'robot', 'free_slots'),
+            ('Succ', 'free_slots', 'more_slots')
+        },
+        add_effects={
+            ('At', 'item', 'room'),
+            ('FreeSlots', 'robot', 'more_slots')
+        },
+        delete_effects={
+            ('Holding', 'robot', 'item'),
+            ('FreeSlots', 'robot', 'free_slots')
+        }
+    )
+    
     return [goto_action, pickup_action, putdown_action]
 
-def parse_user_goal(user_input, available_items, available_rooms):
+def parse_user_goal(user_input, available_items, available_rooms, capacity=1, synonyms=None, grammar=None):
     """
     Parse a user's natural language goal into planner goal predicates.
     
@@ -94,58 +157,44 @@ def parse_user_goal(user_input, available_items, available_rooms):
         user_input: String containing the user's command
         available_items: List of available items
         available_rooms: List of available rooms
+        capacity: Robot carrying capacity (with more than one slot, putting an
+                  item down does not require the robot's hands to end up empty)
+        synonyms: Optional dictionary mapping extra phrases to item or room
+                  names (e.g. {'mug': 'cup'})
+        grammar: Optional CommandGrammar of the vocabulary, for callers that
+                 keep their own (the vocabulary arguments are then ignored)
         
     Returns:
         Set of goal predicates or None if parsing failed
     """
-    user_input = user_input.lower()
-    goal_preds = set()
+    # The vocabulary is compiled into one regex the first time it is used
+    if grammar is None:
+        grammar = get_command_grammar(available_items, available_rooms, synonyms)
+    parsed = grammar.parse(user_input)
+    if parsed is None:
+        return None
+    command, item, room = parsed
     
     # Fetch item command (e.g., "fetch cup")
-    for item in available_items:
-        if f"fetch {item}" in user_input or f"bring {item}" in user_input or f"get {item}" in user_input:
-            # Default to bringing item to living room if no delivery location specified
-            delivery_room = 'living_room'
-            
-            # Check if a specific destination is mentioned
-            for room in available_rooms:
-                if f"to {room}" in user_input or f"to the {room}" in user_input:
-                    delivery_room = room
-                    break
-            
-            # Goal: robot holding the item and at the delivery room
-            goal_preds.add(('Holding', 'robot', item))
-            goal_preds.add(('At', 'robot', delivery_room))
-            return goal_preds
+    if command == 'fetch':
+        # Default to bringing item to living room if no delivery location specified
+        # Goal: robot holding the item and at the delivery room
+        return {('Holding', 'robot', item), ('At', 'robot', room or 'living_room')}
     
     # Go to room command (e.g., "go to kitchen")
-    for room in available_rooms:
-        if f"go to {room}" in user_input or f"move to {room}" in user_input or f"navigate to {room}" in user_input:
-            goal_preds.add(('At', 'robot', room))
-            return goal_preds
+    if command == 'go':
+        return {('At', 'robot', room)}
     
-    # Put down item command (e.g., "put down cup")
-    for item in available_items:
-        if f"put down {item}" in user_input or f"drop {item}" in user_input or f"place {item}" in user_input:
-            # Need to find where to put the item
-            delivery_room = None
-            
-            for room in available_rooms:
-                if f"in {room}" in user_input or f"in the {room}" in user_input:
-                    delivery_room = room
-                    break
-            
-            # If no room specified, assume current room
-            if not delivery_room:
-                return None  # Need the current room from the robot's state
-            
-            # Goal: item at delivery room and robot holding nothing
-            goal_preds.add(('At', 'item', delivery_room))
-            goal_preds.add(('Holding', 'robot', 'nothing'))
-            return goal_preds
+    # Put down item command (e.g., "put down cup in kitchen")
+    # If no room specified, we would need the current room from the robot's state
+    if room is None:
+        return None
     
-    # Failed to parse
-    return None
+    # Goal: item at delivery room and robot holding nothing
+    goal_preds = {('At', item, room)}
+    if capacity == 1:
+        goal_preds.add(('Holding', 'robot', 'nothing'))
+    return goal_preds
 
 def display_belief_distribution(belief_state, environment, top_n=5):
     """
@@ -168,41 +217,228 @@ def display_belief_distribution(belief_state, environment, top_n=5):
         
         print(f"{i+1}. Position {pos} ({pos_type}): {prob:.4f}")
 
-def main():
-    """Main simulation loop."""
-    # Create the environment
-    environment = create_environment()
+class CommandSession:
+    def __init__(self, capacity=1, task_cache_dir=None):
+        """
+        The simulated home, the robot and the planning state behind a command loop.
+        
+        Args:
+            capacity: Number of items the robot can carry at once
+            task_cache_dir: Optional directory to keep grounded planning tasks in
+                            between runs (see task_cache.GroundedTaskCache)
+        """
+        self.capacity = capacity
+        
+        # Create the environment
+        self.environment = create_environment()
+        
+        # Generate all possible locations
+        all_possible_locations = []
+        for y in range(self.environment.height):
+            for x in range(self.environment.width):
+                if not self.environment.is_obstacle(x, y):
+                    all_possible_locations.append((x, y))
+        
+        # Set random seed for reproducibility
+        random.seed(42)
+        
+        # Define room observations
+        room_observations = [
+            'kitchen_sensed',
+            'living_room_sensed',
+            'bedroom_sensed',
+            'bathroom_sensed',
+            'unknown_sensed',
+            'action_succeeded',
+            'action_failed'
+        ]
+        
+        # Create robot with uniform belief
+        self.robot = Robot(None, all_possible_locations, room_observations, self.environment, capacity)
+        
+        # Define action schemas
+        self.action_schemas = create_action_schemas(capacity)
+        
+        # Repeated commands from the same situation reuse earlier plans
+        self.plan_cache = PlanCache()
+        
+        # Plan for the fewest grid steps rather than the fewest actions
+        self.cost_model = TravelCostModel(self.environment)
+        
+        # The domain rarely changes between commands, so ground it once and reuse it
+        self.task_cache = GroundedTaskCache(task_cache_dir)
+        
+        # Queued commands are scheduled together and executed as one route
+        self.task_queue = TaskQueue(self.environment, self.action_schemas, self.cost_model)
+        
+        # Available items and rooms for goal parsing
+        self.available_items = ['cup', 'book', 'phone', 'toothbrush']
+        self.available_rooms = ['kitchen', 'living_room', 'bedroom', 'bathroom']
+        
+        # Compiled once, so parsing a command does not depend on the vocabulary size
+        self.grammar = CommandGrammar(self.available_items, self.available_rooms)
     
-    # Generate all possible locations
-    all_possible_locations = []
-    for y in range(environment.height):
-        for x in range(environment.width):
-            if not environment.is_obstacle(x, y):
-                all_possible_locations.append((x, y))
+    def planner_options(self):
+        """Get the forward_planner keyword arguments used for every command."""
+        return {'search': "astar", 'heuristic': "max", 'action_costs': self.cost_model,
+                'task_cache': self.task_cache}
     
-    # Set random seed for reproducibility
-    random.seed(42)
+    def process_command(self, user_input, report=None):
+        """
+        Parse, plan and execute one user command.
+        
+        Args:
+            user_input: The user's command (e.g. "fetch cup", "queue go to kitchen", "run queue")
+            report: Optional callable receiving progress messages, the robot's
+                    included (e.g. print; they are discarded if None)
+            
+        Returns:
+            Dictionary with the command, a status ("success", "repaired",
+            "failed", "no_plan", "unparsed", "queued" or "empty_queue"), the
+            goal and plan (lists of predicate and action tuples, or None),
+            the robot's position and held items afterwards, and the time in
+            milliseconds spent parsing, planning and executing
+        """
+        report = report or (lambda message: None)
+        timings = {'parse': 0.0, 'plan': 0.0, 'execute': 0.0}
+        result = {'command': user_input, 'status': None, 'goal': None, 'plan': None}
+        
+        start_time = time.perf_counter()
+        plan = None
+        
+        # Get current state for planning
+        current_state_preds = self.robot.current_world_state_for_planner(self.environment)
+        
+        if user_input.lower().startswith('queue '):
+            queued_goal = parse_user_goal(user_input[len('queue '):], self.available_items, self.available_rooms,
+                                          self.capacity, grammar=self.grammar)
+            timings['parse'] = time.perf_counter() - start_time
+            if not queued_goal:
+                report("Sorry, I didn't understand that command. Please try again.")
+                result['status'] = "unparsed"
+            else:
+                replaced_goal = self.task_queue.add(queued_goal)
+                if replaced_goal is not None:
+                    report(f"Replaced queued goal {replaced_goal} with {queued_goal}")
+                else:
+                    report(f"Queued goal {len(self.task_queue)}: {queued_goal}")
+                result['status'] = "queued"
+                result['goal'] = sorted(queued_goal)
+        elif user_input.lower() == 'run queue':
+            if not self.task_queue:
+                report("The task queue is empty.")
+                result['status'] = "empty_queue"
+            else:
+                plan, queued_goals = self.task_queue.plan(current_state_preds, **self.planner_options())
+                self.task_queue.clear()
+                goal_preds = self.task_queue.final_goal(queued_goals)
+                timings['plan'] = time.perf_counter() - start_time
+                report(f"Scheduled goals: {queued_goals}")
+        else:
+            # Parse user input into goal predicates
+            goal_preds = parse_user_goal(user_input, self.available_items, self.available_rooms, self.capacity,
+                                         grammar=self.grammar)
+            timings['parse'] = time.perf_counter() - start_time
+            
+            if not goal_preds:
+                report("Sorry, I didn't understand that command. Please try again.")
+                result['status'] = "unparsed"
+            else:
+                report(f"Understood goal: {goal_preds}")
+                
+                # Generate plan
+                plan_start_time = time.perf_counter()
+                plan = self.plan_cache.get_plan(current_state_preds, goal_preds, self.action_schemas,
+                                                **self.planner_options())
+                timings['plan'] = time.perf_counter() - plan_start_time
+        
+        if result['status'] is None:
+            result['goal'] = sorted(goal_preds)
+            execute_start_time = time.perf_counter()
+            
+            # The robot's own progress messages go to the same callback while it executes
+            robot_report = self.robot.report
+            self.robot.report = report
+            try:
+                result['status'] = self._execute(plan, goal_preds, report)
+            finally:
+                self.robot.report = robot_report
+            timings['execute'] = time.perf_counter() - execute_start_time
+            result['plan'] = plan
+        
+        result['position'] = self.robot.get_most_likely_pos()
+        result['holding'] = list(self.robot.items_held)
+        timings['total'] = time.perf_counter() - start_time
+        result['timings_ms'] = {name: round(seconds * 1000, 3) for name, seconds in timings.items()}
+        return result
     
-    # Define room observations
-    room_observations = [
-        'kitchen_sensed',
-        'living_room_sensed',
-        'bedroom_sensed',
-        'bathroom_sensed',
-        'unknown_sensed',
-        'action_succeeded',
-        'action_failed'
-    ]
+    def _execute(self, plan, goal_preds, report):
+        """Execute a plan, repairing it once if a step fails, and get the command status."""
+        if plan is None:
+            report("No plan found for the given goal.")
+            return "no_plan"
+        
+        report(f"Plan found: {plan}")
+        
+        # Execute plan
+        if self.robot.execute_plan(plan, self.environment):
+            report(f"Plan executed successfully!")
+            report(f"Robot now believes it is at: {self.robot.get_most_likely_pos()}")
+            report(f"Robot is now holding: {', '.join(self.robot.items_held) or 'nothing'}")
+            return "success"
+        
+        # Splice a short repair onto the rest of the plan instead of replanning from scratch
+        report(f"Plan execution failed at step {self.robot.failed_step_index}; attempting repair.")
+        repaired_state_preds = self.robot.current_world_state_for_planner(self.environment)
+        repaired_plan = repair_plan(plan, self.robot.failed_step_index, repaired_state_preds,
+                                    goal_preds, self.action_schemas, **self.planner_options())
+        if repaired_plan and self.robot.execute_plan(repaired_plan, self.environment):
+            report(f"Repaired plan executed successfully!")
+            return "repaired"
+        report("Plan execution failed.")
+        return "failed"
+
+def run_batch(input_stream, output_stream, capacity=1, task_cache_dir=None):
+    """
+    Process a stream of commands without interaction.
     
-    # Create robot with uniform belief
-    robot = Robot(None, all_possible_locations, room_observations, environment)
+    Each non-empty input line is one command. For each, one compact JSON
+    line with the result of CommandSession.process_command is written;
+    the progress messages are discarded.
     
-    # Define action schemas
-    action_schemas = create_action_schemas()
+    Args:
+        input_stream: Iterable of command lines (e.g. an open file or sys.stdin)
+        output_stream: Writable text stream for the JSON lines
+        capacity: Number of items the robot can carry at once
+        task_cache_dir: Optional directory for grounded planning tasks
+        
+    Returns:
+        Number of commands processed
+    """
+    count = 0
+    session = CommandSession(capacity, task_cache_dir)
+    for line in input_stream:
+        user_input = line.strip()
+        if not user_input:
+            continue
+        result = session.process_command(user_input)
+        output_stream.write(json.dumps(result, separators=(',', ':')) + '\n')
+        output_stream.flush()
+        count += 1
+    return count
+
+def main(capacity=1, task_cache_dir=None):
+    """
+    Main simulation loop.
     
-    # Available items and rooms for goal parsing
-    available_items = ['cup', 'book', 'phone', 'toothbrush']
-    available_rooms = ['kitchen', 'living_room', 'bedroom', 'bathroom']
+    Args:
+        capacity: Number of items the robot can carry at once
+        task_cache_dir: Optional directory to keep grounded planning tasks in
+                        between runs (see task_cache.GroundedTaskCache)
+    """
+    session = CommandSession(capacity, task_cache_dir)
+    environment = session.environment
+    robot = session.robot
     
     print("Welcome to the Smart Home Robot Assistant Simulation!")
     print("The robot uses probabilistic localization (HMM) and planning to execute tasks.")
@@ -210,6 +446,8 @@ def main():
     print("  - 'go to <room>' - Navigate to a specific room")
     print("  - 'fetch <item>' - Fetch an item (will bring to living room by default)")
     print("  - 'fetch <item> to <room>' - Fetch an item to a specific room")
+    print("  - 'queue <command>' - Add a command to the task queue")
+    print("  - 'run queue' - Execute all queued commands in one combined route")
     print("  - 'quit' - Exit the simulation")
     print()
     
@@ -221,7 +459,7 @@ def main():
         room_type = environment.get_room_type(most_likely_pos[0], most_likely_pos[1])
         
         print(f"\nRobot believes it is at: {most_likely_pos} (Room: {room_type})")
-        print(f"Robot is holding: {robot.item_held if robot.item_held else 'nothing'}")
+        print(f"Robot is holding: {', '.join(robot.items_held) or 'nothing'}")
         
         # Display top belief positions
         display_belief_distribution(robot.hmm.belief_state, environment, top_n=3)
@@ -233,37 +471,22 @@ def main():
             running = False
             continue
         
-        # Get current state for planning
-        current_state_preds = robot.current_world_state_for_planner(environment)
-        
-        # Parse user input into goal predicates
-        goal_preds = parse_user_goal(user_input, available_items, available_rooms)
-        
-        if not goal_preds:
-            print("Sorry, I didn't understand that command. Please try again.")
-            continue
-        
-        print(f"Understood goal: {goal_preds}")
-        
-        # Generate plan
-        plan = forward_planner(current_state_preds, goal_preds, action_schemas)
-        
-        if plan:
-            print(f"Plan found: {plan}")
-            
-            # Execute plan
-            success = robot.execute_plan(plan, environment)
-            
-            if success:
-                print(f"Plan executed successfully!")
-                print(f"Robot now believes it is at: {robot.get_most_likely_pos()}")
-                print(f"Robot is now holding: {robot.item_held if robot.item_held else 'nothing'}")
-            else:
-                print("Plan execution failed.")
-        else:
-            print("No plan found for the given goal.")
+        session.process_command(user_input, report=print)
     
     print("Simulation ended. Goodbye!")
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Smart Home Robot Assistant Simulation")
+    parser.add_argument('--batch', nargs='?', const='-', metavar='FILE',
+                        help="Process commands from FILE (or stdin) and print one JSON line per command")
+    parser.add_argument('--capacity', type=int, default=1, help="Number of items the robot can carry")
+    parser.add_argument('--task-cache', metavar='DIR', help="Directory to cache grounded planning tasks in")
+    args = parser.parse_args()
+    
+    if args.batch is None:
+        main(args.capacity, args.task_cache)
+    elif args.batch == '-':
+        run_batch(sys.stdin, sys.stdout, args.capacity, args.task_cache)
+    else:
+        with open(args.batch) as command_file:
+            run_batch(command_file, sys.stdout, args.capacity, args.task_cache)
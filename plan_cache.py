@@ -0,0 +1,194 @@
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from grounding import GroundedTask
+from planner import forward_planner, validate_plan
+
+def canonical_predicates(preds):
+    """
+    Get an order-independent, hashable form of a predicate set.
+    
+    Args:
+        preds: Iterable of predicate tuples
+        
+    Returns:
+        Sorted tuple of predicate tuples
+    """
+    return tuple(sorted(tuple(pred) for pred in preds))
+
+def domain_signature(action_schemas):
+    """
+    Get a short hash identifying a planning domain.
+    
+    Args:
+        action_schemas: List of ActionSchema instances
+        
+    Returns:
+        Hex digest that changes whenever a schema's parameters, preconditions or effects change
+    """
+    description = repr([
+        (schema.name, tuple(schema.parameters), canonical_predicates(schema.preconditions),
+         canonical_predicates(schema.add_effects), canonical_predicates(schema.delete_effects))
+        for schema in action_schemas
+    ])
+    return hashlib.sha1(description.encode('utf-8')).hexdigest()[:16]
+
+class PlanCache:
+    def __init__(self, max_entries=128, path=None):
+        """
+        Memoize forward_planner results by canonical (state, goal) pairs.
+        
+        Exact repeats are answered from the cache directly. For a new state
+        with a known goal, the cached plans for that goal are validated
+        against the state and reused if one still works (e.g. only an
+        unrelated item has moved).
+        
+        Args:
+            max_entries: Number of plans kept before the least recently used is evicted
+            path: Optional JSON file the cache is loaded from and saved to
+        """
+        self.max_entries = max_entries
+        self.path = path
+        
+        # (domain, options, state, goal) -> plan, in least- to most-recently-used order
+        self.entries = OrderedDict()
+        
+        self.hits = 0
+        self.misses = 0
+        
+        if path is not None and os.path.exists(path):
+            self.load()
+    
+    def _key(self, current_state_preds, goal_preds, action_schemas, planner_options):
+        """Build the cache key of a planning query."""
+        # Non-JSON options (e.g. a TravelCostModel) are keyed by their repr
+        options = json.dumps(planner_options, sort_keys=True, default=repr)
+        return (domain_signature(action_schemas), options,
+                canonical_predicates(current_state_preds), canonical_predicates(goal_preds))
+    
+    def get_plan(self, current_state_preds, goal_preds, action_schemas, **planner_options):
+        """
+        Get a plan from the cache, or plan with forward_planner and remember the result.
+        
+        Args:
+            current_state_preds: Set of predicate tuples representing the current world state
+            goal_preds: Set of predicate tuples that must all be true in the goal state
+            action_schemas: List of ActionSchema instances
+            **planner_options: Extra keyword arguments for forward_planner (e.g. search="gbfs")
+            
+        Returns:
+            List of instantiated action tuples, or None if no plan found
+        """
+        plan = self.lookup(current_state_preds, goal_preds, action_schemas, **planner_options)
+        if plan is not None:
+            return plan
+        
+        plan = forward_planner(current_state_preds, goal_preds, action_schemas, **planner_options)
+        if plan is not None:
+            self.store(current_state_preds, goal_preds, action_schemas, plan, **planner_options)
+        return plan
+    
+    def lookup(self, current_state_preds, goal_preds, action_schemas, **planner_options):
+        """
+        Find a cached plan that is valid from the given state.
+        
+        Args:
+            current_state_preds: Set of predicate tuples representing the current world state
+            goal_preds: Set of predicate tuples that must all be true in the goal state
+            action_schemas: List of ActionSchema instances
+            **planner_options: forward_planner keyword arguments the plan was made with
+            
+        Returns:
+            Copy of the cached plan, or None on a miss
+        """
+        key = self._key(current_state_preds, goal_preds, action_schemas, planner_options)
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return list(self.entries[key])
+        
+        # Try plans made for the same goal from other states, most recent first,
+        # grounding the query once for all of them
+        task = None
+        for other_key in reversed(list(self.entries)):
+            if other_key[:2] != key[:2] or other_key[3] != key[3]:
+                continue
+            if task is None:
+                task = self._ground(current_state_preds, goal_preds, action_schemas, planner_options)
+            plan = self.entries[other_key]
+            if validate_plan(current_state_preds, goal_preds, action_schemas, plan, task):
+                self.hits += 1
+                self._insert(key, plan)
+                return list(plan)
+        
+        self.misses += 1
+        return None
+    
+    def _ground(self, current_state_preds, goal_preds, action_schemas, planner_options):
+        """Ground a query, through the planner's task cache if it was given one."""
+        task_cache = planner_options.get('task_cache')
+        if task_cache is not None:
+            return task_cache.get_task(action_schemas, current_state_preds, goal_preds)
+        return GroundedTask(action_schemas, current_state_preds, goal_preds)
+    
+    def store(self, current_state_preds, goal_preds, action_schemas, plan, **planner_options):
+        """
+        Remember a plan for a (state, goal) pair.
+        
+        Args:
+            current_state_preds: Set of predicate tuples the plan starts from
+            goal_preds: Set of predicate tuples the plan achieves
+            action_schemas: List of ActionSchema instances
+            plan: List of instantiated action tuples
+            **planner_options: forward_planner keyword arguments the plan was made with
+        """
+        key = self._key(current_state_preds, goal_preds, action_schemas, planner_options)
+        self._insert(key, [tuple(action) for action in plan])
+        if self.path is not None:
+            self.save()
+    
+    def _insert(self, key, plan):
+        """Add an entry as most recently used and evict the oldest entries over capacity."""
+        self.entries[key] = plan
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+    
+    def clear(self):
+        """Remove all cached plans."""
+        self.entries.clear()
+    
+    def save(self, path=None):
+        """
+        Write the cache to a JSON file.
+        
+        Args:
+            path: File to write (defaults to the path given at construction)
+        """
+        path = path or self.path
+        records = [
+            {'domain': domain, 'options': options, 'state': state, 'goal': goal, 'plan': plan}
+            for (domain, options, state, goal), plan in self.entries.items()
+        ]
+        # Write to a temporary file first so a crash never leaves a truncated cache
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'w') as f:
+            json.dump(records, f)
+        os.replace(temp_path, path)
+    
+    def load(self, path=None):
+        """
+        Read cached plans from a JSON file written by save.
+        
+        Args:
+            path: File to read (defaults to the path given at construction)
+        """
+        path = path or self.path
+        with open(path) as f:
+            records = json.load(f)
+        
+        for record in records:
+            key = (record['domain'], record['options'],
+                   canonical_predicates(record['state']), canonical_predicates(record['goal']))
+            self._insert(key, [tuple(action) for action in record['plan']])
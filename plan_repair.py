@@ -0,0 +1,100 @@
+from grounding import GroundedTask
+from planner import forward_planner
+
+def repair_plan(failed_plan, failure_index, current_state_preds, goal_preds, action_schemas,
+                max_repair_depth=3, **planner_options):
+    """
+    Repair a plan whose execution failed instead of replanning from scratch.
+    
+    Searches breadth-first (up to max_repair_depth actions) from the new
+    state for a short repair that rejoins the rest of the failed plan. The
+    cheapest combination of repair plus reused suffix is returned, costed
+    with the planner's action_costs if given (one per action otherwise),
+    so cost-optimal callers do not get back a repair that costs more than
+    necessary. If no repair is found, falls back to a full forward_planner call.
+    
+    Args:
+        failed_plan: List of instantiated action tuples that was being executed
+        failure_index: Index of the step that failed (e.g. Robot.failed_step_index)
+        current_state_preds: Set of predicate tuples describing the state after the failure
+        goal_preds: Set of predicate tuples the plan was meant to achieve
+        action_schemas: List of ActionSchema instances
+        max_repair_depth: Maximum number of new actions before rejoining the old plan
+        **planner_options: Extra keyword arguments for the fallback forward_planner call
+                           (a task_cache and action_costs given here are also used for
+                           the repair search)
+        
+    Returns:
+        List of instantiated action tuples to execute from the current state, or None if no plan exists
+    """
+    task_cache = planner_options.get('task_cache')
+    if task_cache is not None:
+        task = task_cache.get_task(action_schemas, current_state_preds, goal_preds)
+    else:
+        task = GroundedTask(action_schemas, current_state_preds, goal_preds)
+    action_costs = planner_options.get('action_costs') or _unit_cost
+    goal = task.encode(goal_preds)
+    remaining = [tuple(action) for action in failed_plan[failure_index:]]
+    
+    # Layer entries are (state, repair actions, repair cost)
+    layer = [(task.encode(current_state_preds), [], 0)]
+    repair_costs = {layer[0][0]: 0}
+    best_plan = None
+    best_cost = None
+    for depth in range(max_repair_depth + 1):
+        for state, repair, repair_cost in layer:
+            found = _reusable_suffix(task, state, goal, remaining, action_costs)
+            if found is not None and (best_plan is None or repair_cost + found[1] < best_cost):
+                best_plan = repair + found[0]
+                best_cost = repair_cost + found[1]
+        
+        if depth == max_repair_depth:
+            break
+        
+        next_layer = []
+        for state, repair, repair_cost in layer:
+            for action in task.applicable_actions(state):
+                new_cost = repair_cost + action_costs(action)
+                # Longer repairs cannot beat a plan that already costs no more
+                if best_plan is not None and new_cost >= best_cost:
+                    continue
+                new_state = action.apply(state)
+                if new_state not in repair_costs or new_cost < repair_costs[new_state]:
+                    repair_costs[new_state] = new_cost
+                    next_layer.append((new_state, repair + [action.instantiated_action], new_cost))
+        if not next_layer:
+            break
+        layer = next_layer
+    
+    if best_plan is not None:
+        return best_plan
+    return forward_planner(current_state_preds, goal_preds, action_schemas, **planner_options)
+
+def _unit_cost(action):
+    """Cost every action the same (plans are then ranked by length)."""
+    return 1
+
+def _reusable_suffix(task, state, goal, remaining, action_costs):
+    """
+    Find the shortest suffix of the remaining plan that reaches the goal from a state.
+    
+    With non-negative costs the shortest suffix is also the cheapest, as
+    every longer one contains it.
+    
+    Returns:
+        Tuple (suffix, cost) with the list of instantiated action tuples
+        (empty if the goal already holds) and its cost, or None
+    """
+    for start in range(len(remaining), -1, -1):
+        suffix_state = state
+        suffix_cost = 0
+        for instantiated_action in remaining[start:]:
+            action = task.find_action(instantiated_action, suffix_state)
+            if action is None:
+                break
+            suffix_state = action.apply(suffix_state)
+            suffix_cost += action_costs(action)
+        else:
+            if suffix_state & goal == goal:
+                return remaining[start:], suffix_cost
+    return None
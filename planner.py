@@ -1,5 +1,12 @@
-from collections import deque
+from array import array
+import heapq
 from action_schema import ActionSchema
+from search_stats import SearchStats
+from search_budget import SearchBudget, PlanResult
+from grounding import GroundedTask, StateEncoder
+from heuristics import RelaxedHeuristic
+from relevance import prune_task
+from zobrist import ZobristHasher, StateTable
 import copy
 
 def is_applicable(action_schema, state, parameter_bindings):
@@ -49,10 +56,14 @@ def is_applicable(action_schema, state, parameter_bindings):
         # Check if item is at the room
         item_at_room = ('At', item_param, room_param) in state
         
-        # Check if robot is holding nothing
-        holding_nothing = ('Holding', 'robot', 'nothing') in state
+        # Check if robot has a free hand (a free slot with the capacity-aware schema)
+        if _uses_free_slots(action_schema):
+            free_slots = _free_slots(state)
+            has_room = any(pred[0] == 'Succ' and pred[2] == free_slots for pred in state)
+        else:
+            has_room = ('Holding', 'robot', 'nothing') in state
         
-        return robot_at_room and item_at_room and holding_nothing
+        return robot_at_room and item_at_room and has_room
     
     # Special case for PutDown action
     elif action_schema.name == "PutDown":
@@ -65,6 +76,11 @@ def is_applicable(action_schema, state, parameter_bindings):
         # Check if robot is holding the item
         holding_item = ('Holding', 'robot', item_param) in state
         
+        # Check that a free slot can be given back
+        if _uses_free_slots(action_schema):
+            free_slots = _free_slots(state)
+            holding_item = holding_item and any(pred[0] == 'Succ' and pred[1] == free_slots for pred in state)
+        
         return robot_at_room and holding_item
     
     # Generic approach for other actions
@@ -118,8 +134,14 @@ def apply_action(action_schema, state, parameter_bindings):
         # Remove item from room
         new_state.remove(('At', item_param, room_param))
         
-        # Remove holding nothing
-        new_state.remove(('Holding', 'robot', 'nothing'))
+        # Use up a free slot, or remove holding nothing
+        if _uses_free_slots(action_schema):
+            free_slots = _free_slots(state)
+            fewer_slots = next(pred[1] for pred in state if pred[0] == 'Succ' and pred[2] == free_slots)
+            new_state.remove(('FreeSlots', 'robot', free_slots))
+            new_state.add(('FreeSlots', 'robot', fewer_slots))
+        else:
+            new_state.remove(('Holding', 'robot', 'nothing'))
         
         # Add holding item
         new_state.add(('Holding', 'robot', item_param))
@@ -135,8 +157,14 @@ def apply_action(action_schema, state, parameter_bindings):
         # Add item at room
         new_state.add(('At', item_param, room_param))
         
-        # Add holding nothing
-        new_state.add(('Holding', 'robot', 'nothing'))
+        # Free a slot, or add holding nothing
+        if _uses_free_slots(action_schema):
+            free_slots = _free_slots(state)
+            more_slots = next(pred[2] for pred in state if pred[0] == 'Succ' and pred[1] == free_slots)
+            new_state.remove(('FreeSlots', 'robot', free_slots))
+            new_state.add(('FreeSlots', 'robot', more_slots))
+        else:
+            new_state.add(('Holding', 'robot', 'nothing'))
     
     # Generic approach for other actions
     else:
@@ -153,6 +181,14 @@ def apply_action(action_schema, state, parameter_bindings):
     
     return new_state
 
+def _uses_free_slots(action_schema):
+    """Check whether a schema tracks carrying capacity with FreeSlots counters."""
+    return any(pred[0] == 'FreeSlots' for pred in action_schema.preconditions)
+
+def _free_slots(state):
+    """Get the robot's number of free slots (as a string) from a state, or None."""
+    return next((pred[2] for pred in state if pred[:2] == ('FreeSlots', 'robot')), None)
+
 def find_possible_parameter_bindings(action_schema, state, objects):
     """
     Find possible parameter bindings for an action schema.
@@ -196,7 +232,48 @@ def find_possible_parameter_bindings(action_schema, state, objects):
     
     return generate_bindings(list(parameters))
 
-def forward_planner(current_state_preds, goal_preds, action_schemas, max_depth=10):
+def validate_plan(current_state_preds, goal_preds, action_schemas, plan, task=None):
+    """
+    Check that a plan can be executed from a state and reaches the goal.
+    
+    Args:
+        current_state_preds: Set of predicate tuples representing the current world state
+        goal_preds: Set of predicate tuples that must all be true in the goal state
+        action_schemas: List of ActionSchema instances
+        plan: List of instantiated action tuples
+        task: Optional GroundedTask already grounded for this state and goal, so
+              that checking several plans grounds only once
+        
+    Returns:
+        True if every step is applicable in turn and the final state satisfies the goal
+    """
+    if task is None:
+        task = GroundedTask(action_schemas, current_state_preds, goal_preds)
+    goal = task.encode(goal_preds)
+    state = apply_grounded_plan(task, task.encode(current_state_preds), plan)
+    return state is not None and state & goal == goal
+
+def apply_grounded_plan(task, state, plan):
+    """
+    Execute a plan on a grounded task.
+    
+    Args:
+        task: GroundedTask
+        state: Bitset state the plan starts from
+        plan: List of instantiated action tuples
+        
+    Returns:
+        Bitset state after the plan, or None if some step is not applicable
+    """
+    for instantiated_action in plan:
+        action = task.find_action(instantiated_action, state)
+        if action is None:
+            return None
+        state = action.apply(state)
+    return state
+
+def forward_planner(current_state_preds, goal_preds, action_schemas, max_depth=None, stats=None, stats_callback=None,
+                    search="bfs", heuristic="ff", prune=True, action_costs=None, budget=None, task_cache=None):
     """
     Plan using forward search.
     
@@ -204,158 +281,401 @@ def forward_planner(current_state_preds, goal_preds, action_schemas, max_depth=1
         current_state_preds: Set of predicate tuples representing the current world state
         goal_preds: Set of predicate tuples that must all be true in the goal state
         action_schemas: List of ActionSchema instances
-        max_depth: Maximum plan length to consider
+        max_depth: Maximum plan length to consider (None for 10 with "bfs" and no
+                   limit with the heuristic searches)
+        stats: Optional SearchStats to record expansions, queue size and timing
+        stats_callback: Optional callable that receives the SearchStats when planning ends
+        search: "bfs" (shortest plan), "gbfs" (greedy best-first, fastest) or
+                "astar" (shortest plan when used with the "max" heuristic)
+        heuristic: Delete-relaxation heuristic for "gbfs"/"astar": "ff", "add" or "max"
+        prune: If True, first search only the actions relevant to the goal (see
+               relevance.prune_task), falling back to the full task if that fails
+        action_costs: Optional callable mapping a GroundAction to its non-negative cost
+                      (e.g. travel_costs.TravelCostModel); "gbfs"/"astar" then minimise
+                      total cost instead of plan length ("bfs" ignores costs)
+        budget: Optional SearchBudget limiting time, expansions and stored states; when
+                the search stops early its status and best partial plan are recorded
+                there (see plan_with_budget)
+        task_cache: Optional task_cache.GroundedTaskCache to reuse grounded tasks from
+                    earlier calls (or from disk) instead of grounding every time
         
     Returns:
         List of instantiated action tuples [(action_name, param1, ...), ...] or None if no plan found
     """
-    # Convert predicate sets to frozensets for hashability
-    initial_state = frozenset(current_state_preds)
-    goal = frozenset(goal_preds)
+    if search not in _PLANNER_SEARCHES:
+        raise ValueError(f"Unknown search: {search}")
+    if budget is not None:
+        budget.start()
+    
+    # Uninstrumented calls skip all bookkeeping
+    if stats is None and stats_callback is None:
+        return _forward_search(current_state_preds, goal_preds, action_schemas, max_depth, search, heuristic, prune,
+                               action_costs=action_costs, budget=budget, task_cache=task_cache)
+    
+    if stats is None:
+        stats = SearchStats()
+    stats.start()
+    plan = _forward_search(current_state_preds, goal_preds, action_schemas, max_depth, search, heuristic, prune, stats,
+                           action_costs, budget, task_cache)
+    stats.finish(len(plan) if plan is not None else None, stats_callback)
+    return plan
+
+def _forward_search(current_state_preds, goal_preds, action_schemas, max_depth, search="bfs", heuristic="ff",
+                    prune=True, stats=None, action_costs=None, budget=None, task_cache=None):
+    """
+    Ground the task and run the selected search behind forward_planner.
+    
+    The schemas are grounded once up front (see GroundedTask); states are
+    bitsets over the task's predicates and successors come from its
+    precondition-indexed successor generator.
+    
+    Args:
+        current_state_preds: Set of predicate tuples representing the current world state
+        goal_preds: Set of predicate tuples that must all be true in the goal state
+        action_schemas: List of ActionSchema instances
+        max_depth: Maximum plan length to consider (None for no limit)
+        search: "bfs", "gbfs" or "astar"
+        heuristic: "ff", "add" or "max" (ignored by "bfs")
+        prune: If True, search the relevance-pruned task first
+        stats: Optional SearchStats to update
+        action_costs: Optional callable giving the cost of a GroundAction (None for unit costs)
+        budget: Optional SearchBudget
+        task_cache: Optional GroundedTaskCache to get the grounded task from
+        
+    Returns:
+        List of instantiated action tuples, or None if no plan found
+    """
+    if task_cache is not None:
+        task = task_cache.get_task(action_schemas, current_state_preds, goal_preds)
+    else:
+        task = GroundedTask(action_schemas, current_state_preds, goal_preds)
+    initial_state = task.encode(current_state_preds)
+    goal = task.encode(goal_preds)
+    return search_grounded_task(task, initial_state, goal, max_depth, search, heuristic, prune, stats, action_costs,
+                                budget)
+
+def search_grounded_task(task, initial_state, goal, max_depth=None, search="bfs", heuristic="ff", prune=True, stats=None,
+                         action_costs=None, budget=None):
+    """
+    Plan on a task that has already been grounded.
+    
+    Lets callers that reuse one GroundedTask (e.g. the planner portfolio)
+    skip grounding; forward_planner grounds and then calls this.
+    
+    Args:
+        task: GroundedTask
+        initial_state: Bitset of the initial state (from task.encode)
+        goal: Bitset of the goal predicates (from task.encode)
+        max_depth: Maximum plan length to consider (None for 10 with "bfs" and no limit otherwise)
+        search: "bfs", "gbfs" or "astar"
+        heuristic: "ff", "add" or "max" (ignored by "bfs")
+        prune: If True, search the relevance-pruned task first
+        stats: Optional SearchStats to update
+        action_costs: Optional callable giving the cost of a GroundAction (ignored by "bfs")
+        budget: Optional SearchBudget shared by the pruned and full searches
+        
+    Returns:
+        List of instantiated action tuples, or None if no plan found
+    """
+    if search not in _PLANNER_SEARCHES:
+        raise ValueError(f"Unknown search: {search}")
+    if budget is not None:
+        budget.start()
+    if max_depth is None and search == "bfs":
+        max_depth = 10
     
     # Check if initial state already satisfies goal
-    if goal.issubset(initial_state):
+    if initial_state & goal == goal:
         return []  # Empty plan, goal already satisfied
     
-    # Extract all objects from predicates for parameter binding
-    objects = set()
-    for pred in current_state_preds:
-        for arg in pred[1:]:  # Skip predicate name
-            if isinstance(arg, str):
-                objects.add(arg)
-    
-    # Queue for BFS: (state, plan_so_far)
-    queue = deque([(initial_state, [])])
-    
-    # Set to track visited states
-    visited_states = {initial_state}
-    
-    while queue and len(queue[0][1]) < max_depth:
-        state, plan = queue.popleft()
-        
-        # Try each action schema
-        for action_schema in action_schemas:
-            # For GoTo action, we need to handle the room parameter specially
-            if action_schema.name == "GoTo":
-                # Find all rooms in the current state
-                rooms = set()
-                connections = {}
-                
-                current_room = None
-                for pred in state:
-                    if pred[0] == "At" and pred[1] == "robot":
-                        current_room = pred[2]
-                    elif pred[0] == "Connected":
-                        from_room = pred[1]
-                        to_room = pred[2]
-                        if from_room not in connections:
-                            connections[from_room] = []
-                        connections[from_room].append(to_room)
-                        rooms.add(to_room)
-                
-                # Try to go to each connected room
-                for target_room in rooms:
-                    if current_room in connections and target_room in connections[current_room]:
-                        param_bindings = {"room": target_room}
-                        
-                        if is_applicable(action_schema, state, param_bindings):
-                            # Apply action
-                            new_state = apply_action(action_schema, state, param_bindings)
-                            new_state_frozen = frozenset(new_state)  # Make hashable
-                            
-                            # Build instantiated action
-                            instantiated_action = (action_schema.name, target_room)
-                            
-                            # Build new plan
-                            new_plan = plan + [instantiated_action]
-                            
-                            # Check if goal is reached
-                            if goal.issubset(new_state_frozen):
-                                return new_plan
-                            
-                            # Add to queue if not visited
-                            if new_state_frozen not in visited_states:
-                                visited_states.add(new_state_frozen)
-                                queue.append((new_state_frozen, new_plan))
+    if prune:
+        pruned_task, _ = prune_task(task, initial_state, goal)
+        if len(pruned_task.actions) < len(task.actions):
+            plan = _run_search(pruned_task, initial_state, goal, max_depth, search, heuristic, stats, action_costs,
+                               budget)
+            if plan is not None:
+                return plan
+            if budget is not None and budget.status not in (None, "depth_limit"):
+                return None  # Out of budget; no time left for the full task
+    
+    return _run_search(task, initial_state, goal, max_depth, search, heuristic, stats, action_costs, budget)
+
+def plan_with_budget(current_state_preds, goal_preds, action_schemas, time_budget=None, max_expansions=None,
+                     max_states=None, **planner_options):
+    """
+    Plan within explicit limits and report how the search ended.
+    
+    Args:
+        current_state_preds: Set of predicate tuples representing the current world state
+        goal_preds: Set of predicate tuples that must all be true in the goal state
+        action_schemas: List of ActionSchema instances
+        time_budget: Wall-clock seconds to spend, grounding included (None for no limit)
+        max_expansions: Maximum number of node expansions (None for no limit)
+        max_states: Maximum number of search nodes kept in memory (None for no limit)
+        **planner_options: Extra keyword arguments for forward_planner (e.g. search="gbfs")
+        
+    Returns:
+        PlanResult with the plan (or None), a status ("solved", "no_plan",
+        "depth_limit", "timeout", "expansion_limit" or "state_limit"), the
+        SearchStats and, when unsolved, the best partial plan by goal count
+    """
+    budget = SearchBudget(time_budget, max_expansions, max_states)
+    stats = SearchStats()
+    plan = forward_planner(current_state_preds, goal_preds, action_schemas, stats=stats, budget=budget,
+                           **planner_options)
+    if plan is not None:
+        return PlanResult(plan, "solved", stats)
+    return PlanResult(None, budget.status or "no_plan", stats, budget.partial_plan, budget.partial_goal_count)
+
+def _run_search(task, initial_state, goal, max_depth, search, heuristic, stats=None, action_costs=None, budget=None):
+    """Run the selected search on a grounded task."""
+    if budget is not None:
+        budget.begin_search(initial_state, goal)
+    if search == "bfs":
+        return _breadth_first_search(task, initial_state, goal, max_depth, stats, budget)
+    
+    # Costs are looked up per task, since pruned tasks renumber their actions
+    costs = None if action_costs is None else [action_costs(action) for action in task.actions]
+    return _heuristic_search(task, initial_state, goal, search, heuristic, max_depth, stats, costs, budget)
+
+def _breadth_first_search(task, initial_state, goal, max_depth, stats=None, budget=None):
+    """
+    Blind breadth-first search; returns a shortest plan within max_depth.
+    
+    Each state gets a node id when first generated. Nodes are stored as
+    parent id, action id and depth in parallel integer arrays, and since
+    BFS expands nodes in the order they were created, the queue is just a
+    cursor over those ids. Plans are rebuilt from parent pointers on success.
+    Duplicates are detected by incremental Zobrist hashes (see zobrist.py).
+    
+    Args:
+        task: GroundedTask
+        initial_state: Bitset of the initial state
+        goal: Bitset of the goal predicates
+        max_depth: Maximum plan length to consider
+        stats: Optional SearchStats to update
+        budget: Optional SearchBudget checked before every expansion
+        
+    Returns:
+        List of instantiated action tuples, or None if no plan found
+    """
+    hasher = ZobristHasher(task)
+    flip_masks = hasher.flip_masks
+    deltas = hasher.deltas
+    
+    # Node arrays, indexed by node id (node 0 is the initial state)
+    states = [initial_state]
+    hashes = array('Q', [hasher.hash_state(initial_state)])
+    parent_ids = array('i', [-1])
+    action_ids = array('i', [-1])
+    depths = array('i', [0])
+    
+    # Hash table to track visited states
+    visited_states = StateTable(states)
+    visited_states.add(hashes[0], 0)
+    
+    next_node = 0
+    while next_node < len(states) and depths[next_node] < max_depth:
+        if budget is not None and budget.exhausted(len(states)):
+            budget.record_partial_plan(_extract_plan(task, parent_ids, action_ids, budget.best_node))
+            return None
+        node_id = next_node
+        next_node += 1
+        state = states[node_id]
+        state_hash = hashes[node_id]
+        if stats is not None:
+            stats.nodes_expanded += 1
+        
+        for action in task.applicable_actions(state):
+            new_state = (state & ~action.del_mask) | action.add_mask
+            if stats is not None:
+                stats.nodes_generated += 1
             
-            # For PickUp action
-            elif action_schema.name == "PickUp":
-                # Find all items and rooms in the current state
-                items_in_rooms = {}
-                robot_room = None
-                holding_nothing = False
-                
-                for pred in state:
-                    if pred[0] == "At" and pred[1] == "robot":
-                        robot_room = pred[2]
-                    elif pred[0] == "At" and pred[1] != "robot":
-                        item = pred[1]
-                        room = pred[2]
-                        items_in_rooms[(item, room)] = True
-                    elif pred[0] == "Holding" and pred[1] == "robot" and pred[2] == "nothing":
-                        holding_nothing = True
-                
-                # Try to pick up each item in the current room
-                if robot_room and holding_nothing:
-                    for (item, room) in items_in_rooms:
-                        if room == robot_room:
-                            param_bindings = {"item": item, "room": room}
-                            
-                            if is_applicable(action_schema, state, param_bindings):
-                                # Apply action
-                                new_state = apply_action(action_schema, state, param_bindings)
-                                new_state_frozen = frozenset(new_state)  # Make hashable
-                                
-                                # Build instantiated action
-                                instantiated_action = (action_schema.name, item, room)
-                                
-                                # Build new plan
-                                new_plan = plan + [instantiated_action]
-                                
-                                # Check if goal is reached
-                                if goal.issubset(new_state_frozen):
-                                    return new_plan
-                                
-                                # Add to queue if not visited
-                                if new_state_frozen not in visited_states:
-                                    visited_states.add(new_state_frozen)
-                                    queue.append((new_state_frozen, new_plan))
+            # Check if goal is reached
+            if new_state & goal == goal:
+                return _extract_plan(task, parent_ids, action_ids, node_id) + [action.instantiated_action]
             
-            # For PutDown action
-            elif action_schema.name == "PutDown":
-                # Find what the robot is holding and which room it's in
-                holding_item = None
-                robot_room = None
-                
-                for pred in state:
-                    if pred[0] == "Holding" and pred[1] == "robot" and pred[2] != "nothing":
-                        holding_item = pred[2]
-                    elif pred[0] == "At" and pred[1] == "robot":
-                        robot_room = pred[2]
-                
-                # Try to put down the item in the current room
-                if holding_item and robot_room:
-                    param_bindings = {"item": holding_item, "room": robot_room}
-                    
-                    if is_applicable(action_schema, state, param_bindings):
-                        # Apply action
-                        new_state = apply_action(action_schema, state, param_bindings)
-                        new_state_frozen = frozenset(new_state)  # Make hashable
-                        
-                        # Build instantiated action
-                        instantiated_action = (action_schema.name, holding_item, robot_room)
-                        
-                        # Build new plan
-                        new_plan = plan + [instantiated_action]
-                        
-                        # Check if goal is reached
-                        if goal.issubset(new_state_frozen):
-                            return new_plan
-                        
-                        # Add to queue if not visited
-                        if new_state_frozen not in visited_states:
-                            visited_states.add(new_state_frozen)
-                            queue.append((new_state_frozen, new_plan))
+            # Add a node if not visited (the usual flips take the precomputed hash delta)
+            action_id = action.action_id
+            if state ^ new_state == flip_masks[action_id]:
+                new_hash = state_hash ^ deltas[action_id]
+            else:
+                new_hash = hasher.successor_hash(state_hash, state, new_state, action)
+            if visited_states.get(new_hash, new_state) is not None:
+                if stats is not None:
+                    stats.duplicate_pushes += 1
+                continue
+            
+            states.append(new_state)
+            hashes.append(new_hash)
+            parent_ids.append(node_id)
+            action_ids.append(action.action_id)
+            depths.append(depths[node_id] + 1)
+            visited_states.add(new_hash, len(states) - 1)
+            if stats is not None:
+                stats.record_open_size(len(states) - next_node)
+            if budget is not None:
+                budget.offer(len(states) - 1, new_state)
+    
+    # No plan found; unexpanded nodes mean max_depth cut the search off
+    if budget is not None:
+        if next_node < len(states):
+            budget.status = "depth_limit"
+        budget.record_partial_plan(_extract_plan(task, parent_ids, action_ids, budget.best_node))
+    return None
+
+def _heuristic_search(task, initial_state, goal, search, heuristic, max_depth=None, stats=None, costs=None,
+                      budget=None):
+    """
+    Greedy best-first or A* search guided by a delete-relaxation heuristic.
+    
+    GBFS with the FF heuristic also keeps a second open list of states reached
+    through helpful actions and alternates between the two, which steers the
+    search along the relaxed plan. Nodes use the same parent/action id arrays
+    as breadth-first search (including Zobrist-hashed duplicate detection);
+    open lists only hold node ids. With action
+    costs, g-scores and heuristic values are in cost units, and A* with
+    "max" returns a cheapest plan.
+    
+    Args:
+        task: GroundedTask
+        initial_state: Bitset of the initial state
+        goal: Bitset of the goal predicates
+        search: "gbfs" or "astar"
+        heuristic: "ff", "add" or "max"
+        max_depth: Maximum plan length to consider (None for no limit)
+        stats: Optional SearchStats to update
+        costs: Optional list of action costs indexed by action id (None for unit costs)
+        budget: Optional SearchBudget checked before every expansion
+        
+    Returns:
+        List of instantiated action tuples, or None if no plan found
+    """
+    evaluator = RelaxedHeuristic(task, goal, heuristic, costs)
+    greedy = search == "gbfs"
+    use_helpful_actions = greedy and heuristic == "ff"
+    
+    h_value, helpful = evaluator.evaluate_with_helpful_actions(initial_state)
+    if h_value == float('inf'):
+        return None
+    
+    hasher = ZobristHasher(task)
+    flip_masks = hasher.flip_masks
+    deltas = hasher.deltas
+    
+    # Node arrays, indexed by node id (node 0 is the initial state)
+    states = [initial_state]
+    hashes = array('Q', [hasher.hash_state(initial_state)])
+    node_ids = StateTable(states)
+    node_ids.add(hashes[0], 0)
+    parent_ids = array('i', [-1])
+    action_ids = array('i', [-1])
+    g_scores = array('d', [0])
+    depths = array('i', [0])
+    h_values = [h_value]
+    helpful_actions = {0: helpful}
+    closed = bytearray(1)
+    
+    # Regular open list and open list of nodes reached by helpful actions;
+    # node ids break ties, so equal keys are expanded first-in first-out
+    open_lists = ([(h_value, h_value, 0)], [])
+    use_preferred = False
+    depth_cut = False
+    
+    while open_lists[0] or open_lists[1]:
+        # Alternate between the two open lists, skipping an empty one
+        use_preferred = not use_preferred
+        queue = open_lists[1] if (use_preferred and open_lists[1]) or not open_lists[0] else open_lists[0]
+        _, _, node_id = heapq.heappop(queue)
+        if closed[node_id]:
+            continue
+        closed[node_id] = 1
+        state = states[node_id]
+        state_hash = hashes[node_id]
+        
+        # A* only stops once the goal is expanded, so the plan is optimal for admissible heuristics
+        if state & goal == goal:
+            return _extract_plan(task, parent_ids, action_ids, node_id)
+        
+        g_score = g_scores[node_id]
+        depth = depths[node_id]
+        if max_depth is not None and depth >= max_depth:
+            depth_cut = True
+            continue
+        if budget is not None and budget.exhausted(len(states)):
+            budget.record_partial_plan(_extract_plan(task, parent_ids, action_ids, budget.best_node))
+            return None
+        if stats is not None:
+            stats.nodes_expanded += 1
+        
+        helpful = helpful_actions.pop(node_id, ())
+        for action in task.applicable_actions(state):
+            new_state = (state & ~action.del_mask) | action.add_mask
+            new_g_score = g_score + (1 if costs is None else costs[action.action_id])
+            if stats is not None:
+                stats.nodes_generated += 1
+            
+            action_id = action.action_id
+            if state ^ new_state == flip_masks[action_id]:
+                new_hash = state_hash ^ deltas[action_id]
+            else:
+                new_hash = hasher.successor_hash(state_hash, state, new_state, action)
+            
+            new_id = node_ids.get(new_hash, new_state)
+            if new_id is None:
+                new_id = len(states)
+                states.append(new_state)
+                hashes.append(new_hash)
+                node_ids.add(new_hash, new_id)
+                parent_ids.append(node_id)
+                action_ids.append(action.action_id)
+                g_scores.append(new_g_score)
+                depths.append(depth + 1)
+                closed.append(0)
+                new_h_value, helpful_actions[new_id] = evaluator.evaluate_with_helpful_actions(new_state)
+                h_values.append(new_h_value)
+                if budget is not None:
+                    budget.offer(new_id, new_state, new_h_value)
+            elif greedy or new_g_score >= g_scores[new_id]:
+                # GBFS never reopens states; A* reopens them when a cheaper path turns up
+                if stats is not None:
+                    stats.duplicate_pushes += 1
+                continue
+            else:
+                parent_ids[new_id] = node_id
+                action_ids[new_id] = action.action_id
+                g_scores[new_id] = new_g_score
+                depths[new_id] = depth + 1
+                closed[new_id] = 0
+            
+            if greedy and new_state & goal == goal:
+                return _extract_plan(task, parent_ids, action_ids, new_id)
+            
+            new_h_value = h_values[new_id]
+            if new_h_value == float('inf') or new_g_score == float('inf'):
+                continue
+            
+            key = new_h_value if greedy else new_g_score + new_h_value
+            entry = (key, new_h_value, new_id)
+            heapq.heappush(open_lists[0], entry)
+            if use_helpful_actions and action.action_id in helpful:
+                heapq.heappush(open_lists[1], entry)
+            if stats is not None:
+                stats.record_open_size(len(open_lists[0]) + len(open_lists[1]))
     
     # No plan found
-    return None 
\ No newline at end of file
+    if budget is not None:
+        if depth_cut:
+            budget.status = "depth_limit"
+        budget.record_partial_plan(_extract_plan(task, parent_ids, action_ids, budget.best_node))
+    return None
+
+def _extract_plan(task, parent_ids, action_ids, node_id):
+    """Follow parent ids back from a node and return its plan."""
+    plan = []
+    while parent_ids[node_id] != -1:
+        plan.append(task.actions[action_ids[node_id]].instantiated_action)
+        node_id = parent_ids[node_id]
+    return plan[::-1]
+
+_PLANNER_SEARCHES = ("bfs", "gbfs", "astar")
@@ -0,0 +1,210 @@
+import multiprocessing
+import os
+import pickle
+import queue
+import time
+from grounding import GroundedTask
+from planner import search_grounded_task
+from search_budget import SearchBudget
+
+# Fast greedy search first, then the optimal and more conservative configurations
+DEFAULT_CONFIGURATIONS = [
+    {'search': 'gbfs', 'heuristic': 'ff'},
+    {'search': 'bfs'},
+    {'search': 'astar', 'heuristic': 'max'},
+    {'search': 'gbfs', 'heuristic': 'add'}
+]
+
+# Seconds cancelled searches get to return before their pool is terminated instead
+CANCEL_GRACE_PERIOD = 1.0
+
+class _CancellableBudget(SearchBudget):
+    def __init__(self, cancel_event):
+        """Unlimited search budget that runs out once the portfolio sets its cancel event."""
+        super().__init__()
+        self.cancel_event = cancel_event
+    
+    def exhausted(self, num_states):
+        """Charge one expansion and stop if the search has been cancelled."""
+        if super().exhausted(num_states):
+            return True
+        # Reading the shared event takes a lock, so only look every 64 expansions
+        if self.expansions % 64 == 0 and self.cancel_event.is_set():
+            self.status = "cancelled"
+            return True
+        return False
+
+def _init_worker(cancel_event):
+    """Give a pool worker the portfolio's cancel event (it can only be shared at process start)."""
+    global _worker_cancel_event, _worker_call_id, _worker_task
+    _worker_cancel_event = cancel_event
+    _worker_call_id = None
+    _worker_task = None
+
+def _run_configuration_in_worker(call_id, task_data, configuration):
+    """Pool entry point: run one planner configuration, unpickling each call's task once per worker."""
+    global _worker_call_id, _worker_task
+    if _worker_cancel_event.is_set():
+        return None  # Picked up after the call was already answered
+    if _worker_call_id != call_id:
+        _worker_task = pickle.loads(task_data)
+        _worker_call_id = call_id
+    task, initial_state, goal = _worker_task
+    return search_grounded_task(task, initial_state, goal, budget=_CancellableBudget(_worker_cancel_event),
+                                **configuration)
+
+class PlannerPortfolio:
+    def __init__(self, processes=None):
+        """
+        Run several planner configurations in parallel on a reusable process pool.
+        
+        The pool is started on first use and kept for later calls. Searches
+        that are still running when a call has its answer are cancelled
+        through a shared event that they check while expanding nodes, so
+        the workers stay alive; only if one does not stop within
+        CANCEL_GRACE_PERIOD is the pool terminated (and started again on
+        the next call).
+        
+        Args:
+            processes: Number of worker processes (defaults to one per default
+                       configuration, capped at the CPU count)
+        """
+        if processes is None:
+            processes = min(len(DEFAULT_CONFIGURATIONS), os.cpu_count() or 1)
+        self.processes = processes
+        self.pool = None
+        self.cancel_event = None
+        self.calls = 0
+    
+    def plan(self, current_state_preds, goal_preds, action_schemas, configurations=None,
+             deadline=None, wait_for_best=False):
+        """
+        Run the configurations in parallel and keep the first (or best) plan.
+        
+        The task is grounded once here and pickled once; each worker
+        unpickles it once per call however many configurations it runs.
+        
+        Args:
+            current_state_preds: Set of predicate tuples representing the current world state
+            goal_preds: Set of predicate tuples that must all be true in the goal state
+            action_schemas: List of ActionSchema instances
+            configurations: List of keyword-argument dicts for search_grounded_task
+                            (defaults to DEFAULT_CONFIGURATIONS)
+            deadline: Wall-clock seconds to wait for plans (None for no limit)
+            wait_for_best: If True, keep collecting plans until every configuration has
+                           finished or the deadline passes and return the shortest one;
+                           otherwise return the first plan found
+                           
+        Returns:
+            Tuple (plan, configuration): the chosen plan and the configuration that
+            produced it, or (None, None) if no plan was found in time
+        """
+        if configurations is None:
+            configurations = DEFAULT_CONFIGURATIONS
+        
+        task = GroundedTask(action_schemas, current_state_preds, goal_preds)
+        initial_state = task.encode(current_state_preds)
+        goal = task.encode(goal_preds)
+        if initial_state & goal == goal:
+            return [], None
+        
+        end_time = None if deadline is None else time.perf_counter() + deadline
+        if self.pool is None:
+            self._start_pool()
+        self.calls += 1
+        task_data = pickle.dumps((task, initial_state, goal), protocol=pickle.HIGHEST_PROTOCOL)
+        
+        # Results arrive on the pool's result thread; collect them in completion order
+        completed = queue.Queue()
+        results = [
+            self.pool.apply_async(_run_configuration_in_worker, (self.calls, task_data, configuration),
+                                  callback=lambda plan, index=index: completed.put((index, plan)),
+                                  error_callback=lambda error, index=index: completed.put((index, error)))
+            for index, configuration in enumerate(configurations)
+        ]
+        
+        best_plan = None
+        best_configuration = None
+        try:
+            for _ in range(len(results)):
+                timeout = None if end_time is None else max(0.0, end_time - time.perf_counter())
+                try:
+                    index, plan = completed.get(timeout=timeout)
+                except queue.Empty:
+                    break  # Deadline reached
+                if isinstance(plan, BaseException):
+                    raise plan
+                
+                if plan is not None and (best_plan is None or len(plan) < len(best_plan)):
+                    best_plan = plan
+                    best_configuration = configurations[index]
+                
+                if best_plan is not None and not wait_for_best:
+                    break
+        finally:
+            self._cancel(results)
+        
+        return best_plan, best_configuration
+    
+    def _start_pool(self):
+        """Start the worker processes."""
+        self.cancel_event = multiprocessing.Event()
+        self.pool = multiprocessing.Pool(self.processes, initializer=_init_worker, initargs=(self.cancel_event,))
+    
+    def _cancel(self, results):
+        """Stop the searches of a call and wait until the workers are free again."""
+        self.cancel_event.set()
+        end_time = time.perf_counter() + CANCEL_GRACE_PERIOD
+        for result in results:
+            result.wait(max(0.0, end_time - time.perf_counter()))
+        
+        if all(result.ready() for result in results):
+            self.cancel_event.clear()
+        else:
+            self.close()  # Some search missed every cancellation check
+    
+    def close(self):
+        """Terminate the worker processes (a later call starts new ones)."""
+        if self.pool is not None:
+            self.pool.terminate()
+            self.pool.join()
+            self.pool = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+
+# processes -> PlannerPortfolio shared by portfolio_plan calls
+_portfolios = {}
+
+def portfolio_plan(current_state_preds, goal_preds, action_schemas, configurations=None,
+                   deadline=None, wait_for_best=False, processes=None):
+    """
+    Run several planner configurations in parallel and keep the first (or best) plan.
+    
+    Calls with the same number of processes share one PlannerPortfolio, so
+    the worker processes are started once and reused.
+    
+    Args:
+        current_state_preds: Set of predicate tuples representing the current world state
+        goal_preds: Set of predicate tuples that must all be true in the goal state
+        action_schemas: List of ActionSchema instances
+        configurations: List of keyword-argument dicts for search_grounded_task
+                        (defaults to DEFAULT_CONFIGURATIONS)
+        deadline: Wall-clock seconds to wait for plans (None for no limit)
+        wait_for_best: If True, keep collecting plans until every configuration has
+                       finished or the deadline passes and return the shortest one;
+                       otherwise return the first plan found
+        processes: Number of worker processes (defaults to one per default
+                   configuration, capped at the CPU count)
+                   
+    Returns:
+        Tuple (plan, configuration): the chosen plan and the configuration that
+        produced it, or (None, None) if no plan was found in time
+    """
+    portfolio = _portfolios.get(processes)
+    if portfolio is None:
+        portfolio = _portfolios[processes] = PlannerPortfolio(processes)
+    return portfolio.plan(current_state_preds, goal_preds, action_schemas, configurations, deadline, wait_for_best)
@@ -0,0 +1,103 @@
+from collections import defaultdict
+from grounding import set_bits
+
+def reachable_actions(task, initial_state):
+    """
+    Find the actions that can ever become applicable (delete-relaxed reachability).
+    
+    Args:
+        task: GroundedTask
+        initial_state: Bitset of the initial state
+        
+    Returns:
+        Tuple (action ids, bitset of reachable predicates)
+    """
+    precondition_of = task.precondition_of
+    unsatisfied = [len(action.preconditions) for action in task.actions]
+    
+    # Count down each action's missing preconditions as predicates are reached
+    reached = 0
+    reachable = {action.action_id for action in task.actions if not action.preconditions}
+    stack = set_bits(initial_state)
+    for action_id in reachable:
+        stack.extend(set_bits(task.actions[action_id].add_mask))
+    while stack:
+        pred_id = stack.pop()
+        if (reached >> pred_id) & 1:
+            continue
+        reached |= 1 << pred_id
+        for action_id in precondition_of.get(pred_id, ()):
+            unsatisfied[action_id] -= 1
+            if unsatisfied[action_id] == 0:
+                reachable.add(action_id)
+                stack.extend(set_bits(task.actions[action_id].add_mask))
+    return reachable, reached
+
+def relevant_actions(task, initial_state, goal):
+    """
+    Find the reachable actions that can contribute to the goal.
+    
+    Works backwards from the goal through achievers and their preconditions.
+    The analysis is aggressive: it stops at predicates that already hold
+    initially, unless a relevant action deletes a goal predicate that holds
+    initially (that predicate then has to be re-achieved). This keeps e.g.
+    putting down unrelated items out of a fetch task, but can in rare cases
+    cut every plan, so callers should fall back to the full task.
+    
+    Args:
+        task: GroundedTask
+        initial_state: Bitset of the initial state
+        goal: Bitset of the goal predicates
+        
+    Returns:
+        Tuple (action ids, bitset of relevant predicates)
+    """
+    reachable, _ = reachable_actions(task, initial_state)
+    achievers = defaultdict(list)
+    for action_id in reachable:
+        for pred_id in set_bits(task.actions[action_id].add_mask):
+            achievers[pred_id].append(action_id)
+    
+    protected = 0
+    while True:
+        # Predicates that need achievers: everything not true initially, plus protected goals
+        already_true = initial_state & ~protected
+        relevant = 0
+        actions = set()
+        stack = set_bits(goal)
+        while stack:
+            pred_id = stack.pop()
+            if (relevant >> pred_id) & 1:
+                continue
+            relevant |= 1 << pred_id
+            if (already_true >> pred_id) & 1:
+                continue
+            for action_id in achievers[pred_id]:
+                if action_id not in actions:
+                    actions.add(action_id)
+                    stack.extend(task.actions[action_id].preconditions)
+        
+        deleted = 0
+        for action_id in actions:
+            deleted |= task.actions[action_id].del_mask
+        new_protected = goal & initial_state & deleted
+        if new_protected == protected:
+            return actions, relevant
+        protected = new_protected
+
+def prune_task(task, initial_state, goal):
+    """
+    Restrict a grounded task to the actions relevant for a goal.
+    
+    Args:
+        task: GroundedTask
+        initial_state: Bitset of the initial state
+        goal: Bitset of the goal predicates
+        
+    Returns:
+        Tuple (pruned GroundedTask, set of objects the kept actions mention)
+    """
+    actions, _ = relevant_actions(task, initial_state, goal)
+    pruned = task.restrict(actions)
+    relevant_objects = {value for action in pruned.actions for value in action.bindings.values()}
+    return pruned, relevant_objects
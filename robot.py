@@ -1,9 +1,11 @@
 import random
 from robot_hmm import RobotHMM
 from astar_search import astar_search
+from dstar_lite import DStarLite
+from action_schema import capacity_predicates
 
 class Robot:
-    def __init__(self, initial_belief_state, all_possible_locations, room_observations, environment):
+    def __init__(self, initial_belief_state, all_possible_locations, room_observations, environment, capacity=1):
         """
         Initialize a robot with a probabilistic localization approach.
         
@@ -12,6 +14,7 @@ class Robot:
             all_possible_locations: List of all valid (x, y) non-obstacle coordinates
             room_observations: List of possible room sensor readings
             environment: The HomeEnvironment instance
+            capacity: Number of items the robot can carry at once
         """
         self.hmm = RobotHMM(all_possible_locations, room_observations, environment)
         
@@ -19,13 +22,30 @@ class Robot:
         if initial_belief_state:
             self.hmm.belief_state = initial_belief_state.copy()
         
-        self.item_held = None
+        # Items being carried, in the order they were picked up
+        self.capacity = capacity
+        self.items_held = []
+        
+        # Index of the plan step the last execute_plan call failed on (None if it succeeded)
+        self.failed_step_index = None
+        
+        # Where progress messages go (e.g. a no-op for callers that only want results)
+        self.report = print
         
         # Store these for sensor simulation
         self.all_possible_locations = all_possible_locations
         self.room_observations = room_observations
         self.environment = environment
     
+    @property
+    def item_held(self):
+        """The most recently picked up item still being carried (None if holding nothing)."""
+        return self.items_held[-1] if self.items_held else None
+    
+    @item_held.setter
+    def item_held(self, item_name):
+        self.items_held = [] if item_name is None else [item_name]
+    
     def get_most_likely_pos(self):
         """
         Get the most likely position based on the belief state.
@@ -123,6 +143,43 @@ class Robot:
         # Update the belief state using the HMM
         self.hmm.update_belief(intended_action_vector, observation)
     
+    def navigate_with_replanning(self, goal_pos, environment, max_steps=None):
+        """
+        Navigate to a goal cell, repairing the path after every noisy move.
+        
+        A single D* Lite search is kept for the whole trip; after each move the
+        believed position is fed back in, so drifting off the path only costs
+        a cheap repair instead of a fresh A* search.
+        
+        Args:
+            goal_pos: Target (x, y) coordinates
+            environment: The HomeEnvironment instance
+            max_steps: Maximum number of moves to attempt (defaults to twice the grid area)
+            
+        Returns:
+            True if the robot believes it reached goal_pos, False otherwise
+        """
+        if max_steps is None:
+            max_steps = 2 * environment.width * environment.height
+        
+        search = DStarLite(environment, self.get_most_likely_pos(), goal_pos)
+        
+        for _ in range(max_steps):
+            current_pos = self.get_most_likely_pos()
+            if current_pos == goal_pos:
+                return True
+            
+            # Re-anchor the search at the believed position and take one step
+            search.update_start(current_pos)
+            next_pos = search.next_step()
+            if next_pos is None:
+                self.report(f"No path from {current_pos} to {goal_pos}")
+                return False
+            
+            self.move_to((next_pos[0] - current_pos[0], next_pos[1] - current_pos[1]))
+        
+        return self.get_most_likely_pos() == goal_pos
+    
     def pickup_item(self, item_name, environment):
         """
         Attempt to pick up an item if the robot is at the item's location.
@@ -134,17 +191,22 @@ class Robot:
         Returns:
             True if pickup was successful, False otherwise
         """
+        if len(self.items_held) >= self.capacity:
+            self.report(f"Cannot pick up {item_name}: already carrying {len(self.items_held)} item(s)")
+            self.hmm.update_belief((0, 0), "action_failed")
+            return False
+        
         item_location = environment.get_item_location(item_name)
         most_likely_pos = self.get_most_likely_pos()
         
         # Check if item exists
         if item_location is None:
-            print(f"Item {item_name} not found in environment")
+            self.report(f"Item {item_name} not found in environment")
             return False
             
         # If we're not at the item location, try to navigate there
         if most_likely_pos != item_location:
-            print(f"Not at item location. Navigating from {most_likely_pos} to {item_location}")
+            self.report(f"Not at item location. Navigating from {most_likely_pos} to {item_location}")
             
             # Find a path to the item
             path = astar_search(environment, most_likely_pos, item_location)
@@ -172,34 +234,36 @@ class Robot:
         if most_likely_pos == item_location:
             # Update item's location to indicate it's being held
             environment.update_item_location(item_name, None)
-            self.item_held = item_name
+            self.items_held.append(item_name)
             
             # Simulate a successful pickup observation to reinforce belief
             self.hmm.update_belief((0, 0), "action_succeeded")
             return True
         else:
-            print(f"Failed to reach item location. Robot at {most_likely_pos}, item at {item_location}")
+            self.report(f"Failed to reach item location. Robot at {most_likely_pos}, item at {item_location}")
         
         # Simulate a failed pickup observation
         self.hmm.update_belief((0, 0), "action_failed")
         return False
     
-    def putdown_item(self, environment):
+    def putdown_item(self, environment, item_name=None):
         """
-        Put down the currently held item at the robot's current position.
+        Put down a held item at the robot's current position.
         
         Args:
             environment: The HomeEnvironment instance
+            item_name: Item to put down (defaults to the most recently picked up one)
             
         Returns:
-            True if putdown was successful, False if robot wasn't holding anything
+            True if putdown was successful, False if robot wasn't holding the item
         """
-        if self.item_held is not None:
+        if item_name is None:
+            item_name = self.item_held
+        if item_name is not None and item_name in self.items_held:
             # Update item's location to robot's current position
             most_likely_pos = self.get_most_likely_pos()
-            environment.update_item_location(self.item_held, most_likely_pos)
-            item_name = self.item_held
-            self.item_held = None
+            environment.update_item_location(item_name, most_likely_pos)
+            self.items_held.remove(item_name)
             
             # Simulate a successful putdown observation
             self.hmm.update_belief((0, 0), "action_succeeded")
@@ -208,7 +272,7 @@ class Robot:
         # Simulate a failed putdown observation
         self.hmm.update_belief((0, 0), "action_failed")
         return False
-
+    
     def current_world_state_for_planner(self, environment):
         """
         Construct a set of predicate tuples for the planner based on the current robot state.
@@ -236,11 +300,8 @@ class Robot:
                 state.add(('Connected', 'hallway', room))
                 state.add(('Connected', room, 'hallway'))
         
-        # Add the robot's holding state
-        if self.item_held:
-            state.add(('Holding', 'robot', self.item_held))
-        else:
-            state.add(('Holding', 'robot', 'nothing'))
+        # Add the robot's holding state (and free slots when it can carry several items)
+        state.update(capacity_predicates(self.capacity, self.items_held))
         
         # Add item locations
         for item_name, item_loc in environment.item_locations.items():
@@ -282,20 +343,23 @@ class Robot:
             
         Returns:
             True if plan execution was successful, False otherwise
+            (failed_step_index is then set to the step that failed)
         """
+        self.failed_step_index = None
         if not plan:
-            print("No plan to execute.")
+            self.report("No plan to execute.")
             return True
         
-        print(f"Executing plan: {plan}")
+        self.report(f"Executing plan: {plan}")
         
-        for action in plan:
+        for step_index, action in enumerate(plan):
             action_name = action[0]
+            self.failed_step_index = step_index
             
             # GoTo action
             if action_name == "GoTo":
                 target_room = action[1]
-                print(f"Executing action: GoTo {target_room}")
+                self.report(f"Executing action: GoTo {target_room}")
                 
                 # Special case for 'hallway' which is not a real room but represents unmarked spaces
                 if target_room == 'hallway':
@@ -307,7 +371,7 @@ class Robot:
                                 empty_cells.append((x, y))
                     
                     if not empty_cells:
-                        print("Could not find any cells for hallway (unmarked spaces)")
+                        self.report("Could not find any cells for hallway (unmarked spaces)")
                         return False
                     
                     # Sort by distance to current position
@@ -322,7 +386,7 @@ class Robot:
                             break
                     
                     if not path:
-                        print("Could not path to any hallway (unmarked) cell")
+                        self.report("Could not path to any hallway (unmarked) cell")
                         return False
                         
                     # Execute the path
@@ -345,18 +409,18 @@ class Robot:
                     final_room = environment.get_room_type(final_pos[0], final_pos[1])
                     
                     if final_room is not None:
-                        print(f"Failed to reach hallway, ended up in {final_room}")
+                        self.report(f"Failed to reach hallway, ended up in {final_room}")
                         return False
                     
                     # Successfully reached an unmarked space (hallway)
-                    print("Successfully reached hallway (unmarked space)")
+                    self.report("Successfully reached hallway (unmarked space)")
                     continue
                 else:
                     # Special case for living_room - try to go directly to the book
                     if target_room == 'living_room' and 'book' in environment.item_locations:
                         book_pos = environment.get_item_location('book')
                         if book_pos:
-                            print(f"Trying direct path to book in living_room at {book_pos}")
+                            self.report(f"Trying direct path to book in living_room at {book_pos}")
                             start_pos = self.get_most_likely_pos()
                             direct_path = astar_search(environment, start_pos, book_pos)
                             
@@ -381,7 +445,7 @@ class Robot:
                                 final_room = environment.get_room_type(final_pos[0], final_pos[1])
                                 
                                 if final_room == 'living_room':
-                                    print("Successfully reached living_room by going directly to the book")
+                                    self.report("Successfully reached living_room by going directly to the book")
                                     continue
                     
                     # Standard room navigation
@@ -393,7 +457,7 @@ class Robot:
                                 room_cells.append((x, y))
                     
                     if not room_cells:
-                        print(f"Could not find any cells for room: {target_room}")
+                        self.report(f"Could not find any cells for room: {target_room}")
                         return False
                     
                     # Sort cells by distance from current position to find closest cell in target room
@@ -407,7 +471,7 @@ class Robot:
                             break
                     
                     if not path:
-                        print(f"Could not find path from {start_pos} to any cell in {target_room}")
+                        self.report(f"Could not find path from {start_pos} to any cell in {target_room}")
                         return False
                         
                     # Execute the path by following each step
@@ -432,12 +496,12 @@ class Robot:
                     # Verify we reached the intended room
                     if actual_room != target_room:
                         # Try to find a safer path directly to target room
-                        print(f"First attempt failed: Robot is in {actual_room}, trying a safer path to {target_room}")
+                        self.report(f"First attempt failed: Robot is in {actual_room}, trying a safer path to {target_room}")
                         
                         # Special handling for bathroom if we're in bedroom
                         if target_room == 'bathroom' and actual_room == 'bedroom':
                             # Try to navigate through the hallway
-                            print("Attempting to reach bathroom via hallway")
+                            self.report("Attempting to reach bathroom via hallway")
                             
                             # First, find an empty cell (hallway) nearby
                             empty_cells = []
@@ -478,7 +542,7 @@ class Robot:
                                     if 'toothbrush' in environment.item_locations:
                                         toothbrush_pos = environment.get_item_location('toothbrush')
                                         if toothbrush_pos:
-                                            print(f"Navigating directly to toothbrush at {toothbrush_pos}")
+                                            self.report(f"Navigating directly to toothbrush at {toothbrush_pos}")
                                             
                                             # Get new position after hallway navigation
                                             new_pos = self.get_most_likely_pos()
@@ -505,7 +569,7 @@ class Robot:
                                                 final_room = environment.get_room_type(final_pos[0], final_pos[1])
                                                 
                                                 if final_room == 'bathroom':
-                                                    print("Successfully reached bathroom via hallway and toothbrush")
+                                                    self.report("Successfully reached bathroom via hallway and toothbrush")
                                                     continue
                         
                         # Find a new path from current position (standard approach)
@@ -516,7 +580,7 @@ class Robot:
                                 break
                                 
                         if not path or len(path) < 2:
-                            print(f"Failed to reach {target_room}, ended up in {actual_room}")
+                            self.report(f"Failed to reach {target_room}, ended up in {actual_room}")
                             return False
                             
                         # Follow the new path
@@ -539,21 +603,21 @@ class Robot:
                         final_room = environment.get_room_type(final_pos[0], final_pos[1])
                         
                         if final_room != target_room:
-                            print(f"Failed to reach {target_room}, ended up in {final_room}")
+                            self.report(f"Failed to reach {target_room}, ended up in {final_room}")
                             return False
             
             # PickUp action
             elif action_name == "PickUp":
                 item_name = action[1]
                 room_name = action[2]
-                print(f"Executing action: PickUp {item_name} in {room_name}")
+                self.report(f"Executing action: PickUp {item_name} in {room_name}")
                 
                 # Always navigate directly to the item's position
                 item_pos = environment.get_item_location(item_name)
                 robot_pos = self.get_most_likely_pos()
                 
                 if item_pos and item_pos != robot_pos:
-                    print(f"Navigating directly to item at {item_pos}")
+                    self.report(f"Navigating directly to item at {item_pos}")
                     path = astar_search(environment, robot_pos, item_pos)
                     
                     if path and len(path) > 1:
@@ -575,27 +639,27 @@ class Robot:
                 # Try to pick up the item (directly uses our overridden pickup_item with navigation)
                 success = self.pickup_item(item_name, environment)
                 if not success:
-                    print(f"Failed to pick up {item_name}")
+                    self.report(f"Failed to pick up {item_name}")
                     return False
             
             # PutDown action
             elif action_name == "PutDown":
                 item_name = action[1]
                 room_name = action[2]
-                print(f"Executing action: PutDown {item_name} in {room_name}")
+                self.report(f"Executing action: PutDown {item_name} in {room_name}")
                 
                 # First verify the robot is in the right room
                 robot_pos = self.get_most_likely_pos()
                 robot_room = environment.get_room_type(robot_pos[0], robot_pos[1])
                 
                 if robot_room != room_name:
-                    print(f"Robot not in {room_name}. Currently in {robot_room}.")
+                    self.report(f"Robot not in {room_name}. Currently in {robot_room}.")
                     return False
                 
                 # Try to put down the item
-                success = self.putdown_item(environment)
+                success = self.putdown_item(environment, item_name)
                 if not success:
-                    print(f"Failed to put down {item_name}")
+                    self.report(f"Failed to put down {item_name}")
                     return False
                     
             # Special handling for the last test case (fetch toothbrush to bathroom)
@@ -611,7 +675,7 @@ class Robot:
                         if 'toothbrush' in environment.item_locations:
                             toothbrush_pos = environment.get_item_location('toothbrush')
                             if toothbrush_pos:
-                                print("Special case: Navigating directly to bathroom via toothbrush")
+                                self.report("Special case: Navigating directly to bathroom via toothbrush")
                                 robot_pos = self.get_most_likely_pos()
                                 direct_path = astar_search(environment, robot_pos, toothbrush_pos)
                                 
@@ -632,8 +696,9 @@ class Robot:
                                         current_pos = next_pos
                                     
                                     # Skip the next action (GoTo bathroom) since we went directly there
-                                    print("Successfully reached bathroom area. Skipping next GoTo action.")
+                                    self.report("Successfully reached bathroom area. Skipping next GoTo action.")
                                     continue
         
-        print("Plan execution completed successfully.")
+        self.report("Plan execution completed successfully.")
+        self.failed_step_index = None
         return True 
\ No newline at end of file
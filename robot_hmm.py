@@ -33,6 +33,11 @@ class RobotHMM:
             'wrong_adj_room_sense_prob': 0.15,  # Probability of sensing an adjacent room type
             'unknown_sense_prob': 0.15          # Probability of getting an unknown/error reading
         }
+        
+        # Sparse transition and emission tables over location indices, compiled
+        # from the models above the first time an action or observation is seen
+        self.transition_tables = {}
+        self.emission_tables = {}
     
     def get_transition_probability(self, prev_pos, intended_action_vector, next_pos):
         """
@@ -135,31 +140,89 @@ class RobotHMM:
                    - self.emission_model_params['unknown_sense_prob']
                    - (self.emission_model_params['wrong_adj_room_sense_prob'] if adjacent_observations else 0.0)) / len(other_observations) if other_observations else 0.0
     
+    def transition_table(self, intended_action_vector):
+        """
+        Get the compiled transition model of an action.
+        
+        Args:
+            intended_action_vector: Intended action vector (dx, dy).
+            
+        Returns:
+            List with, for each location index, the (previous location index,
+            probability) pairs of its nonzero transition probabilities.
+        """
+        intended_action_vector = tuple(intended_action_vector)
+        table = self.transition_tables.get(intended_action_vector)
+        if table is None:
+            table = []
+            for current_loc in self.all_possible_locations:
+                row = []
+                for prev_index, prev_loc in enumerate(self.all_possible_locations):
+                    transition_prob = self.get_transition_probability(prev_loc, intended_action_vector, current_loc)
+                    if transition_prob != 0.0:
+                        row.append((prev_index, transition_prob))
+                table.append(row)
+            self.transition_tables[intended_action_vector] = table
+        return table
+    
+    def emission_table(self, observation):
+        """
+        Get the compiled emission model of an observation.
+        
+        Args:
+            observation: Observation string (e.g., 'kitchen_sensed').
+            
+        Returns:
+            List of P(observation | location) by location index.
+        """
+        table = self.emission_tables.get(observation)
+        if table is None:
+            table = [self.get_emission_probability(loc, observation) for loc in self.all_possible_locations]
+            self.emission_tables[observation] = table
+        return table
+    
+    def compile_models(self, action_vectors=((0, 0), (1, 0), (-1, 0), (0, 1), (0, -1))):
+        """
+        Compile the transition tables of the given actions and all emission tables up front.
+        
+        Args:
+            action_vectors: Action vectors to compile (by default the moves the robot makes).
+        """
+        for intended_action_vector in action_vectors:
+            self.transition_table(intended_action_vector)
+        for observation in self.room_observations:
+            self.emission_table(observation)
+    
     def update_belief(self, intended_action_vector, observation_received):
         """
         Update the belief state based on action and observation (forward algorithm).
         
+        Uses the compiled sparse models, so a step costs O(locations x
+        neighbours) instead of O(locations^2) model evaluations.
+        
         Args:
             intended_action_vector: Intended action vector (dx, dy).
             observation_received: Observation string received from the environment.
         """
-        # Step 1: Prediction step (apply transition model)
-        predicted_belief = {}
+        transition_table = self.transition_table(intended_action_vector)
+        emission_table = self.emission_table(observation_received)
+        belief = [self.belief_state[loc] for loc in self.all_possible_locations]
         
-        for current_loc in self.all_possible_locations:
-            # Sum over all possible previous locations
-            predicted_belief[current_loc] = 0.0
-            for prev_loc in self.all_possible_locations:
-                transition_prob = self.get_transition_probability(prev_loc, intended_action_vector, current_loc)
-                predicted_belief[current_loc] += transition_prob * self.belief_state[prev_loc]
+        # Step 1: Prediction step (apply transition model)
+        predicted_belief = []
+        for row in transition_table:
+            # Sum over the previous locations that can reach this one
+            probability = 0.0
+            for prev_index, transition_prob in row:
+                probability += transition_prob * belief[prev_index]
+            predicted_belief.append(probability)
         
         # Step 2: Update step (apply emission model)
         new_belief = {}
         total_probability = 0.0
         
-        for current_loc in self.all_possible_locations:
-            emission_prob = self.get_emission_probability(current_loc, observation_received)
-            new_belief[current_loc] = emission_prob * predicted_belief[current_loc]
+        for current_index, current_loc in enumerate(self.all_possible_locations):
+            new_belief[current_loc] = emission_table[current_index] * predicted_belief[current_index]
             total_probability += new_belief[current_loc]
         
         # Step 3: Normalize
@@ -168,4 +231,4 @@ class RobotHMM:
                 new_belief[loc] /= total_probability
         
         # Update belief state
-        self.belief_state = new_belief 
\ No newline at end of file
+        self.belief_state = new_belief
@@ -0,0 +1,132 @@
+import time
+
+class SearchBudget:
+    def __init__(self, time_budget=None, max_expansions=None, max_states=None):
+        """
+        Limits on a planner search, and the best partial result when they run out.
+        
+        Searches charge one unit per expansion and stop once any limit is
+        reached. While searching they offer each new node, and the node that
+        satisfies the most goal predicates is kept so a partial plan can be
+        returned instead of nothing.
+        
+        Args:
+            time_budget: Wall-clock seconds to spend (None for no limit)
+            max_expansions: Maximum number of node expansions (None for no limit)
+            max_states: Maximum number of search nodes kept in memory (None for no limit)
+        """
+        self.time_budget = time_budget
+        self.max_expansions = max_expansions
+        self.max_states = max_states
+        self.deadline = None
+        self.expansions = 0
+        
+        # Why the search stopped early: "timeout", "expansion_limit", "state_limit",
+        # "depth_limit" (max_depth cut the search off), or None
+        self.status = None
+        
+        # Plan to the state closest to the goal, set when a search fails
+        self.partial_plan = None
+        self.partial_goal_count = 0
+        
+        self.goal = 0
+        self.best_node = 0
+        self._best_key = (0, 0)
+    
+    def start(self):
+        """Start the clock (only the first call counts, so grounding time is included)."""
+        if self.deadline is None and self.time_budget is not None:
+            self.deadline = time.perf_counter() + self.time_budget
+    
+    def begin_search(self, initial_state, goal):
+        """
+        Reset the partial-result tracking for a new search run.
+        
+        Args:
+            initial_state: Bitset of the search's initial state (node 0)
+            goal: Bitset of the goal predicates
+        """
+        self.goal = goal
+        self.status = None
+        self.best_node = 0
+        self._best_key = ((initial_state & goal).bit_count(), 0)
+    
+    def exhausted(self, num_states):
+        """
+        Charge one expansion and check the limits.
+        
+        Args:
+            num_states: Number of search nodes currently stored
+            
+        Returns:
+            True if the search must stop (status then says which limit was hit)
+        """
+        self.expansions += 1
+        if self.max_expansions is not None and self.expansions > self.max_expansions:
+            self.status = "expansion_limit"
+        elif self.max_states is not None and num_states > self.max_states:
+            self.status = "state_limit"
+        elif self.deadline is not None and time.perf_counter() >= self.deadline:
+            self.status = "timeout"
+        else:
+            return False
+        return True
+    
+    def offer(self, node_id, state, h_value=0):
+        """
+        Consider a search node as the best partial result.
+        
+        Nodes satisfying more goal predicates win; ties go to the lower
+        heuristic value, then to the earlier node.
+        
+        Args:
+            node_id: Id of the node in the search's node arrays
+            state: Bitset state of the node
+            h_value: Heuristic value of the node (0 if the search has none)
+        """
+        key = ((state & self.goal).bit_count(), -h_value)
+        if key > self._best_key:
+            self._best_key = key
+            self.best_node = node_id
+    
+    def record_partial_plan(self, plan):
+        """
+        Store the plan to the best node of a failed search run.
+        
+        Args:
+            plan: List of instantiated action tuples reaching the best node
+        """
+        # Keep the better result if an earlier run (e.g. the pruned search) got closer
+        if self.partial_plan is None or self._best_key[0] > self.partial_goal_count:
+            self.partial_plan = plan
+            self.partial_goal_count = self._best_key[0]
+
+class PlanResult:
+    def __init__(self, plan, status, stats, partial_plan=None, partial_goal_count=0):
+        """
+        Outcome of a budgeted planner call.
+        
+        Args:
+            plan: List of instantiated action tuples, or None if no plan was found
+            status: "solved", "no_plan", "depth_limit", "timeout",
+                    "expansion_limit" or "state_limit"
+            stats: SearchStats of the call (expanded and generated counts, timing)
+            partial_plan: When unsolved, the plan to the explored state that
+                          satisfies the most goal predicates
+            partial_goal_count: Number of goal predicates the partial plan achieves
+        """
+        self.plan = plan
+        self.status = status
+        self.stats = stats
+        self.partial_plan = partial_plan
+        self.partial_goal_count = partial_goal_count
+    
+    @property
+    def solved(self):
+        """True if a complete plan was found."""
+        return self.plan is not None
+    
+    def __repr__(self):
+        """Detailed representation of the result."""
+        return (f"PlanResult(status={self.status!r}, plan={self.plan!r}, "
+                f"partial_plan={self.partial_plan!r}, stats={self.stats!r})")
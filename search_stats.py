@@ -0,0 +1,69 @@
+import time
+
+class SearchStats:
+    def __init__(self):
+        """
+        Counters and timing recorded by a single search call.
+        
+        Searches only touch these counters when a SearchStats object (or a
+        callback) is passed in, so uninstrumented calls pay nothing.
+        """
+        self.nodes_expanded = 0
+        self.nodes_generated = 0
+        self.peak_open_size = 0
+        self.duplicate_pushes = 0
+        self.wall_time = 0.0
+        
+        # Path length in moves, or plan length in actions (None if nothing was found)
+        self.result_length = None
+        
+        # Engine-specific counters, e.g. per-direction expansions
+        self.extra = {}
+        
+        self._start_time = None
+    
+    def start(self):
+        """Start the wall-clock timer."""
+        self._start_time = time.perf_counter()
+    
+    def finish(self, result_length, stats_callback=None):
+        """
+        Stop the timer, record the result size and notify the callback.
+        
+        Args:
+            result_length: Length of the path or plan found, or None
+            stats_callback: Optional callable that receives this object
+        """
+        if self._start_time is not None:
+            self.wall_time = time.perf_counter() - self._start_time
+        self.result_length = result_length
+        if stats_callback is not None:
+            stats_callback(self)
+    
+    def record_open_size(self, open_size):
+        """Track the largest open list seen so far."""
+        if open_size > self.peak_open_size:
+            self.peak_open_size = open_size
+    
+    def as_dict(self):
+        """
+        Get the recorded values as a plain dictionary.
+        
+        Returns:
+            Dictionary of counter names to values (extra counters included)
+        """
+        values = {
+            'nodes_expanded': self.nodes_expanded,
+            'nodes_generated': self.nodes_generated,
+            'peak_open_size': self.peak_open_size,
+            'duplicate_pushes': self.duplicate_pushes,
+            'wall_time': self.wall_time,
+            'result_length': self.result_length
+        }
+        values.update(self.extra)
+        return values
+    
+    def __repr__(self):
+        """Detailed representation of the recorded statistics."""
+        fields = ", ".join(f"{name}={value!r}" for name, value in self.as_dict().items())
+        return f"SearchStats({fields})"
@@ -0,0 +1,206 @@
+import heapq
+from batch_search import DistanceFieldCache
+
+class ReservationTable:
+    def __init__(self):
+        """
+        Shared table of space-time reservations for several robots.
+        
+        Cells are reserved per time step, moves are reserved per (from, to, t)
+        so head-on swaps can be detected, and a robot that has finished its
+        route can park on its last cell for all later time steps.
+        """
+        # (cell, t) -> robot_id
+        self.cells = {}
+        
+        # (from_cell, to_cell, t) -> robot_id for a move from t to t + 1
+        self.edges = {}
+        
+        # cell -> (first time step, robot_id) for robots parked there indefinitely
+        self.parked = {}
+        
+        # cell -> latest time step with a timed reservation
+        self.last_reserved = {}
+    
+    def is_cell_reserved(self, cell, t, robot_id=None):
+        """
+        Check if another robot occupies a cell at a time step.
+        
+        Args:
+            cell: Cell (x, y)
+            t: Time step
+            robot_id: Robot asking (its own reservations are ignored)
+            
+        Returns:
+            True if the cell is taken at time t by a different robot
+        """
+        owner = self.cells.get((cell, t))
+        if owner is not None and owner != robot_id:
+            return True
+        
+        parked = self.parked.get(cell)
+        return parked is not None and parked[1] != robot_id and t >= parked[0]
+    
+    def is_move_reserved(self, from_cell, to_cell, t, robot_id=None):
+        """
+        Check if a move would swap places with another robot.
+        
+        Args:
+            from_cell: Cell the move starts from at time t
+            to_cell: Cell the move ends in at time t + 1
+            t: Time step the move starts at
+            robot_id: Robot asking (its own reservations are ignored)
+            
+        Returns:
+            True if another robot moves from to_cell to from_cell at the same time
+        """
+        owner = self.edges.get((to_cell, from_cell, t))
+        return owner is not None and owner != robot_id
+    
+    def can_park(self, cell, t, robot_id=None):
+        """
+        Check if a robot can stay on a cell from time t onwards.
+        
+        Args:
+            cell: Cell (x, y)
+            t: First time step of the stay
+            robot_id: Robot asking
+            
+        Returns:
+            True if no other robot needs the cell at or after time t
+        """
+        parked = self.parked.get(cell)
+        if parked is not None and parked[1] != robot_id:
+            return False
+        if self.last_reserved.get(cell, -1) < t:
+            return True
+        return not any(
+            self.cells.get((cell, step)) not in (None, robot_id)
+            for step in range(t, self.last_reserved[cell] + 1)
+        )
+    
+    def reserve_path(self, path, robot_id, start_time=0, park=True):
+        """
+        Reserve a timed path (one cell per time step, waits repeat a cell).
+        
+        Args:
+            path: List of cells, path[i] occupied at time start_time + i
+            robot_id: Robot the reservations belong to
+            start_time: Time step of path[0]
+            park: If True, keep the final cell reserved for all later time steps
+        """
+        for offset, cell in enumerate(path):
+            t = start_time + offset
+            self.cells[(cell, t)] = robot_id
+            self.last_reserved[cell] = max(self.last_reserved.get(cell, -1), t)
+            if offset + 1 < len(path):
+                self.edges[(cell, path[offset + 1], t)] = robot_id
+        
+        if park and path:
+            self.parked[path[-1]] = (start_time + len(path) - 1, robot_id)
+
+def space_time_astar_search(environment, start_pos, goal_pos, reservations, robot_id=None,
+                            start_time=0, max_time=None, distance_cache=None):
+    """
+    Perform space-time A* that avoids cells and moves reserved by other robots.
+    
+    The state is (cell, time); each step either moves to a neighbor or waits
+    in place. The heuristic is the exact single-robot distance from a cached
+    distance field, so search effort goes into resolving conflicts only.
+    
+    Args:
+        environment: Instance of HomeEnvironment
+        start_pos: Starting position (x, y)
+        goal_pos: Goal position (x, y)
+        reservations: ReservationTable shared with the other robots
+        robot_id: Identifier of the robot being planned
+        start_time: Time step at which the robot is at start_pos
+        max_time: Last time step the search may use (defaults to a horizon
+                  past every existing reservation)
+        distance_cache: Optional DistanceFieldCache to reuse distance fields
+        
+    Returns:
+        List of cells, one per time step from start_time (repeated cells are
+        waits), or None if no conflict-free path exists within the horizon
+    """
+    if distance_cache is None:
+        distance_cache = DistanceFieldCache(environment)
+    distances = distance_cache.get(goal_pos)
+    if start_pos not in distances:
+        return None
+    
+    if max_time is None:
+        latest_reservation = max(reservations.last_reserved.values(), default=start_time)
+        max_time = max(start_time, latest_reservation) + len(distances) + distances[start_pos]
+    
+    start_state = (start_pos, start_time)
+    open_set = [(distances[start_pos], 0, start_state)]
+    parents = {start_state: None}
+    closed_set = set()
+    
+    while open_set:
+        _, g_score, state = heapq.heappop(open_set)
+        if state in closed_set:
+            continue
+        closed_set.add(state)
+        
+        pos, t = state
+        # Only stop once the robot can stay on the goal for good
+        if pos == goal_pos and reservations.can_park(pos, t, robot_id):
+            path = []
+            while state is not None:
+                path.append(state[0])
+                state = parents[state]
+            return path[::-1]
+        
+        if t >= max_time:
+            continue
+        
+        # Move to a neighbor or wait in place
+        for next_pos in environment.get_valid_neighbors(pos[0], pos[1]) + [pos]:
+            next_state = (next_pos, t + 1)
+            if next_state in closed_set or next_pos not in distances:
+                continue
+            if reservations.is_cell_reserved(next_pos, t + 1, robot_id):
+                continue
+            if reservations.is_move_reserved(pos, next_pos, t, robot_id):
+                continue
+            
+            if next_state not in parents:
+                parents[next_state] = state
+                f_score = g_score + 1 + distances[next_pos]
+                heapq.heappush(open_set, (f_score, g_score + 1, next_state))
+    
+    return None
+
+def plan_prioritized_routes(environment, route_requests, reservations=None, distance_cache=None):
+    """
+    Route several robots one after another through a shared reservation table.
+    
+    Each robot plans with space-time A* around the reservations of the robots
+    planned before it, so the resulting routes are conflict-free without a
+    joint search over all robots.
+    
+    Args:
+        environment: Instance of HomeEnvironment
+        route_requests: List of (robot_id, start_pos, goal_pos) in priority order
+        reservations: Optional ReservationTable (a new one is created if None)
+        distance_cache: Optional DistanceFieldCache shared by all searches
+        
+    Returns:
+        Dictionary mapping robot_id to its timed path, or None if it could not be routed
+    """
+    if reservations is None:
+        reservations = ReservationTable()
+    if distance_cache is None:
+        distance_cache = DistanceFieldCache(environment)
+    
+    routes = {}
+    for robot_id, start_pos, goal_pos in route_requests:
+        path = space_time_astar_search(environment, start_pos, goal_pos, reservations,
+                                       robot_id=robot_id, distance_cache=distance_cache)
+        routes[robot_id] = path
+        if path is not None:
+            reservations.reserve_path(path, robot_id)
+    
+    return routes
@@ -0,0 +1,183 @@
+import hashlib
+import os
+import pickle
+import zlib
+from collections import OrderedDict
+from grounding import GroundAction, GroundedTask, StateEncoder, set_bits
+from plan_cache import canonical_predicates, domain_signature
+
+# Bump when the stored grounding changes so old artefacts are regrounded
+TASK_FORMAT_VERSION = 2
+
+def task_key(action_schemas, state_preds, goal_preds=()):
+    """
+    Get the hash identifying the grounding of a planning problem.
+    
+    Args:
+        action_schemas: List of ActionSchema instances
+        state_preds: Set of predicate tuples describing the world
+        goal_preds: Set of predicate tuples (their objects are part of the domain)
+        
+    Returns:
+        Hex digest
+    """
+    return _grounding_key(GroundedTask(action_schemas, state_preds, goal_preds, ground=False))
+
+def _grounding_key(task):
+    """
+    Hash what the grounding of an ungrounded task depends on.
+    
+    That is the domain, the objects and constants, the static facts and the
+    reachable values of every argument position, so states that differ only
+    in where objects are (e.g. an item moved to another room) share a key.
+    """
+    position_values = sorted((position, sorted(values)) for position, values in task.position_values.items() if values)
+    description = repr((domain_signature(task.action_schemas), sorted(task.objects), sorted(task.constants),
+                        canonical_predicates(task.static_facts), position_values))
+    return hashlib.sha1(description.encode('utf-8')).hexdigest()
+
+def _mask(pred_ids):
+    """Build the bitset of a list of predicate ids."""
+    mask = 0
+    for pred_id in pred_ids:
+        mask |= 1 << pred_id
+    return mask
+
+class GroundedTaskCache:
+    def __init__(self, directory=None, max_entries=8):
+        """
+        Reuse grounded tasks across planner calls and across processes.
+        
+        Tasks are kept in memory and, when a directory is given, written to
+        it as one compressed file per task key. A file holds only the
+        predicate table and each ground action's schema, binding and
+        precondition/add/delete predicate ids; the masks, successor
+        generator and other indexes are rebuilt on load, which keeps the
+        files small and is still faster than grounding again.
+        
+        Args:
+            directory: Optional directory for the task files (None for memory only)
+            max_entries: Number of tasks kept in memory before the least recently used is dropped
+        """
+        self.directory = directory
+        self.max_entries = max_entries
+        
+        # task key -> GroundedTask, in least- to most-recently-used order
+        self.tasks = OrderedDict()
+        
+        self.hits = 0
+        self.loads = 0
+        self.misses = 0
+        
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+    
+    def path(self, key):
+        """Get the file a task is stored in."""
+        return os.path.join(self.directory, f"{key}.task")
+    
+    def get_task(self, action_schemas, state_preds, goal_preds=()):
+        """
+        Get the grounded task of a planning problem, grounding it only on a miss.
+        
+        Args:
+            action_schemas: List of ActionSchema instances
+            state_preds: Set of predicate tuples describing the world
+            goal_preds: Set of predicate tuples (their objects are added to the domain)
+            
+        Returns:
+            GroundedTask (shared between calls, so it must not be modified)
+        """
+        # The variable domain analysis is cheap next to grounding, and a miss reuses it
+        new_task = GroundedTask(action_schemas, state_preds, goal_preds, ground=False)
+        key = _grounding_key(new_task)
+        task = self.tasks.get(key)
+        if task is not None:
+            self.tasks.move_to_end(key)
+            self.hits += 1
+            return task
+        
+        task = self.load(key, new_task) if self.directory is not None else None
+        if task is not None:
+            self.loads += 1
+        else:
+            self.misses += 1
+            task = new_task
+            task.ground()
+            if self.directory is not None:
+                self.save(key, task)
+        
+        self.tasks[key] = task
+        while len(self.tasks) > self.max_entries:
+            self.tasks.popitem(last=False)
+        return task
+    
+    def save(self, key, task):
+        """
+        Write a task file.
+        
+        Args:
+            key: Task key (from task_key)
+            task: GroundedTask to store
+        """
+        # Schema id -> (variable values, precondition ids, add ids, delete ids) of its ground actions
+        schema_ids = {schema.name: i for i, schema in enumerate(task.action_schemas)}
+        actions = [[] for _ in task.action_schemas]
+        for action in task.actions:
+            actions[schema_ids[action.instantiated_action[0]]].append(
+                (tuple(action.bindings.values()), action.preconditions, set_bits(action.add_mask),
+                 set_bits(action.del_mask)))
+        data = pickle.dumps((TASK_FORMAT_VERSION, key, task.encoder.predicates, actions),
+                            protocol=pickle.HIGHEST_PROTOCOL)
+        
+        # Write to a temporary file first so a crash never leaves a truncated file
+        path = self.path(key)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(zlib.compress(data))
+        os.replace(temp_path, path)
+    
+    def load(self, key, task):
+        """
+        Read a task file written by save.
+        
+        Args:
+            key: Task key (from task_key)
+            task: Ungrounded GroundedTask of the problem (ground=False); the
+                  stored grounding is restored into it
+                  
+        Returns:
+            The grounded task, or None if there is no usable file for the key
+        """
+        try:
+            with open(self.path(key), 'rb') as f:
+                version, stored_key, predicates, actions = pickle.loads(zlib.decompress(f.read()))
+        except (OSError, zlib.error, pickle.UnpicklingError, EOFError, ValueError, TypeError, AttributeError):
+            return None
+        if version != TASK_FORMAT_VERSION or stored_key != key or len(actions) != len(task.action_schemas):
+            return None
+        
+        # Predicate ids depend on the order they were interned in, so the stored table replaces the encoding
+        task.encoder = StateEncoder()
+        task.encoder.predicates = list(predicates)
+        task.encoder.predicate_ids = {pred: pred_id for pred_id, pred in enumerate(predicates)}
+        task.static_mask = task.encoder.encode(task.static_facts)
+        
+        task.actions = []
+        for schema, schema_actions in zip(task.action_schemas, actions):
+            variables = task.schema_variables[schema.name]
+            num_parameters = len(schema.parameters)  # Parameters are the first variables
+            for values, preconditions, add_effects, delete_effects in schema_actions:
+                task.actions.append(GroundAction(len(task.actions), (schema.name,) + values[:num_parameters],
+                                                 dict(zip(variables, values)), preconditions, _mask(preconditions),
+                                                 _mask(add_effects), _mask(delete_effects)))
+        task._index_actions()
+        return task
+    
+    def clear(self):
+        """Forget the tasks held in memory (files on disk are kept)."""
+        self.tasks.clear()
+    
+    def __repr__(self):
+        """Stable description (used e.g. in plan cache keys)."""
+        return f"GroundedTaskCache({self.directory!r})"
@@ -0,0 +1,220 @@
+from grounding import GroundedTask
+from planner import apply_grounded_plan, forward_planner
+from task_cache import GroundedTaskCache
+from travel_costs import TravelCostModel
+
+class TaskQueue:
+    def __init__(self, environment, action_schemas, cost_model=None):
+        """
+        Queue of pending user goals that are scheduled and planned as one route.
+        
+        Each goal is reduced to a trip from a start room (where its item is)
+        to an end room (where it has to go). The trips are ordered by nearest
+        insertion followed by 2-opt over room distances, and fetch goals
+        other than the last become deliveries, so the robot drops each item
+        off on the way instead of making a round trip per command.
+        
+        Args:
+            environment: Instance of HomeEnvironment
+            action_schemas: List of ActionSchema instances
+            cost_model: Optional TravelCostModel providing the room distances
+        """
+        self.environment = environment
+        self.action_schemas = action_schemas
+        self.cost_model = cost_model or TravelCostModel(environment)
+        self.goals = []
+    
+    def add(self, goal_preds):
+        """
+        Add a goal (e.g. from parse_user_goal) to the queue.
+        
+        An item can only be taken to one place, so a goal for an item that
+        an earlier queued goal already moves replaces that goal (the newer
+        command wins) instead of making the merged goal contradictory.
+        
+        Args:
+            goal_preds: Set of goal predicate tuples
+            
+        Returns:
+            The queued goal that was replaced, or None
+        """
+        goal_preds = set(goal_preds)
+        items = self._goal_items(goal_preds)
+        for index, queued_goal in enumerate(self.goals):
+            if items & self._goal_items(queued_goal):
+                self.goals[index] = goal_preds
+                return queued_goal
+        self.goals.append(goal_preds)
+        return None
+    
+    def clear(self):
+        """Remove all pending goals."""
+        self.goals = []
+    
+    def __len__(self):
+        return len(self.goals)
+    
+    def _goal_items(self, goal_preds):
+        """Get the items a goal places or has the robot hold."""
+        return ({pred[1] for pred in goal_preds if pred[0] == 'At' and pred[1] != 'robot'} |
+                {pred[2] for pred in goal_preds if pred[0] == 'Holding' and pred[2] != 'nothing'})
+    
+    def _trip(self, goal_preds, current_state_preds):
+        """
+        Get the (start room, end room) trip of a goal.
+        
+        The start room is None when the goal needs no pickup (e.g. 'go to')
+        or its item is already held.
+        """
+        item_rooms = {pred[1]: pred[2] for pred in current_state_preds if pred[0] == 'At' and pred[1] != 'robot'}
+        start_room = None
+        end_room = None
+        for pred in goal_preds:
+            if pred[0] == 'At':
+                end_room = pred[2]
+                if pred[1] != 'robot':
+                    start_room = item_rooms.get(pred[1], start_room)
+            elif pred[0] == 'Holding' and pred[2] != 'nothing':
+                start_room = item_rooms.get(pred[2], start_room)
+        return start_room, end_room
+    
+    def route_cost(self, trips, robot_room):
+        """
+        Get the travel cost of doing trips in order.
+        
+        Args:
+            trips: List of (start room, end room) tuples
+            robot_room: Room the robot starts in
+            
+        Returns:
+            Total room-to-room distance of the route
+        """
+        cost = 0
+        position = robot_room
+        for start_room, end_room in trips:
+            for room in (start_room, end_room):
+                if room is not None and room != position:
+                    cost += self.cost_model.room_distance(position, room)
+                    position = room
+        return cost
+    
+    def schedule(self, current_state_preds):
+        """
+        Order the queued goals to keep the robot's route short.
+        
+        Args:
+            current_state_preds: Set of predicate tuples representing the current world state
+            
+        Returns:
+            List of goal predicate sets in execution order
+        """
+        robot_room = next((pred[2] for pred in current_state_preds if pred[:2] == ('At', 'robot')), None)
+        trips = [self._trip(goal_preds, current_state_preds) for goal_preds in self.goals]
+        
+        def cost(order):
+            return self.route_cost([trips[index] for index in order], robot_room)
+        
+        # Nearest insertion: take the trip starting closest to where the route
+        # can be, and insert it where it adds the least travel
+        order = []
+        remaining = list(range(len(trips)))
+        while remaining:
+            ends = [robot_room] + [trips[index][1] for index in order]
+            nearest = min(remaining, key=lambda index: min(
+                self.cost_model.room_distance(end, trips[index][0] or trips[index][1]) for end in ends))
+            remaining.remove(nearest)
+            order = min((order[:position] + [nearest] + order[position:] for position in range(len(order) + 1)),
+                        key=cost)
+        
+        # 2-opt: reverse segments of the order while that shortens the route
+        best_cost = cost(order)
+        improved = True
+        while improved:
+            improved = False
+            for i in range(len(order) - 1):
+                for k in range(i + 1, len(order)):
+                    candidate = order[:i] + order[i:k + 1][::-1] + order[k + 1:]
+                    candidate_cost = cost(candidate)
+                    if candidate_cost < best_cost:
+                        order, best_cost = candidate, candidate_cost
+                        improved = True
+        
+        return [self.goals[index] for index in order]
+    
+    def plan(self, current_state_preds, **planner_options):
+        """
+        Build one merged plan for all queued goals.
+        
+        Goals are planned one after another in scheduled order, each from
+        the state the previous segment ends in. Every fetch except the last
+        is turned into a delivery (the item is put down in the target room).
+        
+        Args:
+            current_state_preds: Set of predicate tuples representing the current world state
+            **planner_options: Extra keyword arguments for forward_planner (a task_cache
+                               given here is also used to apply each segment)
+            
+        Returns:
+            Tuple (plan, goals): the merged list of instantiated action tuples
+            and the goal sets in the order they are achieved, or (None, goals)
+            if some goal could not be planned
+        """
+        scheduled_goals = self.schedule(current_state_preds)
+        ordered_goals = [self._delivery_goal(goal_preds) for goal_preds in scheduled_goals[:-1]] + scheduled_goals[-1:]
+        
+        # Segments usually share one grounding, so the planner and _apply_plan
+        # get their tasks from the same cache instead of grounding per segment
+        planner_options = dict(planner_options)
+        if planner_options.get('task_cache') is None:
+            planner_options['task_cache'] = GroundedTaskCache()
+        task_cache = planner_options['task_cache']
+        
+        merged_plan = []
+        state_preds = set(current_state_preds)
+        for goal_preds in ordered_goals:
+            segment = forward_planner(state_preds, goal_preds, self.action_schemas, **planner_options)
+            if segment is None:
+                return None, ordered_goals
+            state_preds = self._apply_plan(state_preds, goal_preds, segment, task_cache)
+            merged_plan.extend(segment)
+        return merged_plan, ordered_goals
+    
+    def final_goal(self, ordered_goals):
+        """
+        Get the predicates that still hold once a merged plan has finished.
+        
+        These are the item placements of every goal plus the whole last
+        goal; robot positions and holding states of earlier goals are only
+        passed through.
+        
+        Args:
+            ordered_goals: Goal sets in execution order (as returned by plan)
+            
+        Returns:
+            Set of goal predicate tuples
+        """
+        if not ordered_goals:
+            return set()
+        final_preds = set(ordered_goals[-1])
+        held_items = {pred[2] for pred in final_preds if pred[0] == 'Holding'}
+        for goal_preds in ordered_goals[:-1]:
+            final_preds |= {pred for pred in goal_preds
+                            if pred[0] == 'At' and pred[1] != 'robot' and pred[1] not in held_items}
+        return final_preds
+    
+    def _delivery_goal(self, goal_preds):
+        """Turn a fetch goal (hold the item in a room) into delivering the item to that room."""
+        held_items = [pred[2] for pred in goal_preds if pred[0] == 'Holding' and pred[2] != 'nothing']
+        robot_rooms = [pred[2] for pred in goal_preds if pred[:2] == ('At', 'robot')]
+        if len(held_items) != 1 or len(robot_rooms) != 1:
+            return goal_preds
+        return {('At', held_items[0], robot_rooms[0])}
+    
+    def _apply_plan(self, state_preds, goal_preds, plan, task_cache=None):
+        """Get the state predicates after executing a plan segment (on a cached task if possible)."""
+        if task_cache is not None:
+            task = task_cache.get_task(self.action_schemas, state_preds, goal_preds)
+        else:
+            task = GroundedTask(self.action_schemas, state_preds, goal_preds)
+        state = apply_grounded_plan(task, task.encode(state_preds), plan)
+        return set(task.decode(state))
@@ -0,0 +1,75 @@
+from anytime_search import AnytimeAStar, anytime_astar_search
+from astar_search import astar_search
+from home_environment import HomeEnvironment
+from main import create_environment
+from test_astar_search import assert_valid_path
+
+def test_anytime_search():
+    # Use the sample home from main.py
+    env = create_environment()
+    start_pos = (1, 1)  # kitchen
+    goal_pos = (8, 7)   # bathroom
+    optimal_length = len(astar_search(env, start_pos, goal_pos))
+    
+    # Test 1: Unlimited budget gives an optimal path
+    print("Test 1: Unlimited budget")
+    path, bound = anytime_astar_search(env, start_pos, goal_pos)
+    print(f"Path: {path}, bound: {bound}")
+    
+    assert path is not None, "Should find a path"
+    assert len(path) == optimal_length, "Path should be optimal with an unlimited budget"
+    assert bound == 1.0, "Bound should be 1 once the path is proven optimal"
+    assert_valid_path(path, env)
+    print("✓ Unlimited budget test passed")
+    print()
+    
+    # Test 2: Small budgets give a bounded path that improves when resumed
+    print("Test 2: Incremental improvement")
+    search = AnytimeAStar(env, start_pos, goal_pos, initial_weight=5.0)
+    path, bound = None, float('inf')
+    while path is None:
+        path, bound = search.improve(max_expansions=5)
+    print(f"First path length: {len(path)}, bound: {bound}")
+    
+    assert path[0] == start_pos and path[-1] == goal_pos, "Path should connect start and goal"
+    assert len(path) - 1 <= bound * (optimal_length - 1), "Path cost should respect the bound"
+    assert_valid_path(path, env)
+    
+    previous_bound = bound
+    while not search.is_optimal:
+        path, bound = search.improve(max_expansions=5)
+        assert bound <= previous_bound, "Bound should never get worse"
+        assert len(path) - 1 <= bound * (optimal_length - 1), "Path cost should respect the bound"
+        previous_bound = bound
+    
+    assert len(path) == optimal_length, "Resumed search should reach the optimal path"
+    print("✓ Incremental improvement test passed")
+    print()
+    
+    # Test 3: Time budget returns promptly
+    print("Test 3: Time budget")
+    path, bound = anytime_astar_search(env, start_pos, goal_pos, time_budget=0.0)
+    
+    assert path is None and bound == float('inf'), "A zero time budget should not find a path"
+    print("✓ Time budget test passed")
+    print()
+    
+    # Test 4: Unreachable goal
+    print("Test 4: Unreachable goal")
+    grid_layout_unreachable = [
+        [1, 1, 1, 1, 1],
+        [1, 0, 1, 0, 1],
+        [1, 0, 1, 0, 1],
+        [1, 1, 1, 1, 1]
+    ]
+    env_unreachable = HomeEnvironment(grid_layout_unreachable, {})
+    path, bound = anytime_astar_search(env_unreachable, (1, 1), (3, 2))
+    
+    assert path is None, "Should not find a path to unreachable goal"
+    assert bound == float('inf'), "Bound should be infinite without a path"
+    print("✓ Unreachable goal test passed")
+    
+    print("\nAll anytime search tests completed successfully!")
+
+if __name__ == "__main__":
+    test_anytime_search()
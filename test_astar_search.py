@@ -1,4 +1,5 @@
 from astar_search import astar_search, manhattan_distance
+from search_stats import SearchStats
 from home_environment import HomeEnvironment
 import numpy as np
 
@@ -83,6 +84,108 @@ def test_astar_search():
     
     print("\nAll A* search tests completed successfully!")
 
+def test_jump_point_search():
+    # Grid with an open room and a walled corridor
+    grid_layout = [
+        [1, 1, 1, 1, 1, 1, 1, 1, 1, 1],
+        [1, 0, 0, 0, 0, 0, 0, 0, 0, 1],
+        [1, 0, 0, 0, 0, 0, 0, 0, 0, 1],
+        [1, 0, 0, 0, 1, 1, 1, 0, 0, 1],
+        [1, 0, 0, 0, 1, 0, 0, 0, 0, 1],
+        [1, 1, 1, 0, 1, 0, 1, 1, 1, 1],
+        [1, 0, 0, 0, 1, 0, 0, 0, 0, 1],
+        [1, 1, 1, 1, 1, 1, 1, 1, 1, 1]
+    ]
+    env = HomeEnvironment(grid_layout, {})
+    
+    # Test 1: JPS paths match A* path lengths for every pair of free cells
+    print("Test 1: JPS path lengths match A*")
+    free_cells = [(x, y) for y in range(env.height) for x in range(env.width) if not env.is_obstacle(x, y)]
+    for start_pos in free_cells:
+        for goal_pos in free_cells:
+            astar_path = astar_search(env, start_pos, goal_pos)
+            jps_path = astar_search(env, start_pos, goal_pos, mode="jps")
+            
+            assert jps_path is not None, f"JPS should find a path from {start_pos} to {goal_pos}"
+            assert len(jps_path) == len(astar_path), f"JPS path from {start_pos} to {goal_pos} should be optimal"
+            assert jps_path[0] == start_pos and jps_path[-1] == goal_pos, "JPS path should connect start and goal"
+            assert_valid_path(jps_path, env)
+    print("✓ JPS path length test passed")
+    print()
+    
+    # Test 2: Unreachable goal
+    print("Test 2: JPS unreachable goal")
+    grid_layout_unreachable = [
+        [1, 1, 1, 1, 1],
+        [1, 0, 1, 0, 1],
+        [1, 0, 1, 0, 1],
+        [1, 1, 1, 1, 1]
+    ]
+    env_unreachable = HomeEnvironment(grid_layout_unreachable, {})
+    path = astar_search(env_unreachable, (1, 1), (3, 2), mode="jps")
+    
+    assert path is None, "JPS should not find a path to unreachable goal"
+    print("✓ JPS unreachable goal test passed")
+    
+    print("\nAll JPS tests completed successfully!")
+
+def test_bidirectional_astar_search():
+    # Grid with an open room and a walled corridor
+    grid_layout = [
+        [1, 1, 1, 1, 1, 1, 1, 1, 1, 1],
+        [1, 0, 0, 0, 0, 0, 0, 0, 0, 1],
+        [1, 0, 0, 0, 0, 0, 0, 0, 0, 1],
+        [1, 0, 0, 0, 1, 1, 1, 0, 0, 1],
+        [1, 0, 0, 0, 1, 0, 0, 0, 0, 1],
+        [1, 1, 1, 0, 1, 0, 1, 1, 1, 1],
+        [1, 0, 0, 0, 1, 0, 0, 0, 0, 1],
+        [1, 1, 1, 1, 1, 1, 1, 1, 1, 1]
+    ]
+    env = HomeEnvironment(grid_layout, {})
+    
+    # Test 1: Bidirectional paths match A* path lengths for every pair of free cells
+    print("Test 1: Bidirectional path lengths match A*")
+    free_cells = [(x, y) for y in range(env.height) for x in range(env.width) if not env.is_obstacle(x, y)]
+    for start_pos in free_cells:
+        for goal_pos in free_cells:
+            astar_path = astar_search(env, start_pos, goal_pos)
+            bidirectional_path = astar_search(env, start_pos, goal_pos, mode="bidirectional")
+            
+            assert bidirectional_path is not None, f"Should find a path from {start_pos} to {goal_pos}"
+            assert len(bidirectional_path) == len(astar_path), f"Path from {start_pos} to {goal_pos} should be optimal"
+            assert bidirectional_path[0] == start_pos and bidirectional_path[-1] == goal_pos, "Path should connect start and goal"
+            assert_valid_path(bidirectional_path, env)
+    print("✓ Bidirectional path length test passed")
+    print()
+    
+    # Test 2: Node counts are reported per direction
+    print("Test 2: Per-direction node counts")
+    stats = SearchStats()
+    astar_search(env, (1, 6), (8, 6), mode="bidirectional", stats=stats)
+    print(f"Stats: {stats}")
+    
+    assert stats.extra['forward_expanded'] > 0, "Forward search should expand nodes"
+    assert stats.extra['backward_expanded'] > 0, "Backward search should expand nodes"
+    assert stats.extra['forward_expanded'] + stats.extra['backward_expanded'] == stats.nodes_expanded, "Directions should add up"
+    print("✓ Per-direction node count test passed")
+    print()
+    
+    # Test 3: Unreachable goal
+    print("Test 3: Bidirectional unreachable goal")
+    grid_layout_unreachable = [
+        [1, 1, 1, 1, 1],
+        [1, 0, 1, 0, 1],
+        [1, 0, 1, 0, 1],
+        [1, 1, 1, 1, 1]
+    ]
+    env_unreachable = HomeEnvironment(grid_layout_unreachable, {})
+    path = astar_search(env_unreachable, (1, 1), (3, 2), mode="bidirectional")
+    
+    assert path is None, "Should not find a path to unreachable goal"
+    print("✓ Bidirectional unreachable goal test passed")
+    
+    print("\nAll bidirectional A* tests completed successfully!")
+
 def assert_valid_path(path, env):
     """Helper function to check if a path is valid"""
     # Check that each step is a valid move (adjacent and not an obstacle)
@@ -99,4 +202,6 @@ def assert_valid_path(path, env):
         assert not env.is_obstacle(next_pos[0], next_pos[1]), f"Path includes obstacle at {next_pos}"
 
 if __name__ == "__main__":
-    test_astar_search() 
\ No newline at end of file
+    test_astar_search()
+    test_jump_point_search()
+    test_bidirectional_astar_search() 
\ No newline at end of file
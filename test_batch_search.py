@@ -0,0 +1,73 @@
+from batch_search import batch_paths, shortest_path_tree
+from astar_search import astar_search
+from home_environment import HomeEnvironment
+from main import create_environment
+from test_astar_search import assert_valid_path
+
+def test_batch_search():
+    # Use the sample home from main.py
+    env = create_environment()
+    free_cells = [(x, y) for y in range(env.height) for x in range(env.width) if not env.is_obstacle(x, y)]
+    
+    # Test 1: Shortest-path tree distances
+    print("Test 1: Shortest-path tree")
+    distances, parents = shortest_path_tree(env, (1, 1))
+    
+    assert len(distances) == len(free_cells), "Tree should reach every free cell"
+    assert distances[(1, 1)] == 0, "Root should be at distance 0"
+    assert distances[(8, 7)] == len(astar_search(env, (1, 1), (8, 7))) - 1, "Tree distance should be exact"
+    assert shortest_path_tree(env, (0, 0)) == ({}, {}), "Tree rooted at an obstacle should be empty"
+    print("✓ Shortest-path tree test passed")
+    print()
+    
+    # Test 2: Many queries sharing a start
+    print("Test 2: Queries sharing a start")
+    pairs = [((1, 1), goal) for goal in free_cells]
+    paths = batch_paths(env, pairs)
+    
+    assert len(paths) == len(pairs), "Should return one path per query"
+    for (start_pos, goal_pos), path in zip(pairs, paths):
+        assert path[0] == start_pos and path[-1] == goal_pos, "Path should connect start and goal"
+        assert len(path) == len(astar_search(env, start_pos, goal_pos)), "Batched path should be optimal"
+        assert_valid_path(path, env)
+    print("✓ Shared start test passed")
+    print()
+    
+    # Test 3: Many queries sharing a goal (answered from the goal's tree)
+    print("Test 3: Queries sharing a goal")
+    pairs = [(start, (6, 6)) for start in free_cells]
+    paths = batch_paths(env, pairs)
+    
+    for (start_pos, goal_pos), path in zip(pairs, paths):
+        assert path[0] == start_pos and path[-1] == goal_pos, "Path should run from start to goal"
+        assert len(path) == len(astar_search(env, start_pos, goal_pos)), "Batched path should be optimal"
+        assert_valid_path(path, env)
+    print("✓ Shared goal test passed")
+    print()
+    
+    # Test 4: Process-pool mode matches the in-process results
+    print("Test 4: Process-pool mode")
+    pairs = [(start, goal) for start in free_cells[:6] for goal in free_cells[-6:]]
+    assert batch_paths(env, pairs, processes=2) == batch_paths(env, pairs), "Pool results should match"
+    print("✓ Process-pool test passed")
+    print()
+    
+    # Test 5: Unreachable goals
+    print("Test 5: Unreachable goal")
+    grid_layout_unreachable = [
+        [1, 1, 1, 1, 1],
+        [1, 0, 1, 0, 1],
+        [1, 0, 1, 0, 1],
+        [1, 1, 1, 1, 1]
+    ]
+    env_unreachable = HomeEnvironment(grid_layout_unreachable, {})
+    paths = batch_paths(env_unreachable, [((1, 1), (3, 1)), ((1, 1), (1, 2))])
+    
+    assert paths[0] is None, "Should not find a path to unreachable goal"
+    assert paths[1] == [(1, 1), (1, 2)], "Reachable query in the same group should still be answered"
+    print("✓ Unreachable goal test passed")
+    
+    print("\nAll batch search tests completed successfully!")
+
+if __name__ == "__main__":
+    test_batch_search()
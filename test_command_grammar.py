@@ -0,0 +1,87 @@
+import re
+from command_grammar import CommandGrammar, get_command_grammar, trie_pattern
+from main import parse_user_goal
+
+def test_command_grammar():
+    available_items = ['cup', 'book', 'phone', 'toothbrush']
+    available_rooms = ['kitchen', 'living_room', 'bedroom', 'bathroom']
+    
+    # Test 1: The trie regex matches exactly the phrases, preferring the longest
+    print("Test 1: Trie pattern")
+    pattern = re.compile(r'\b(?:' + trie_pattern(['cup', 'cupboard', 'cell phone', 'car']) + r')\b')
+    print(f"Pattern: {pattern.pattern}")
+    
+    assert [match.group() for match in pattern.finditer("cup cupboard cell phone cars car")] == \
+           ['cup', 'cupboard', 'cell phone', 'car'], "Only whole phrases should match"
+    print("✓ Trie pattern test passed")
+    print()
+    
+    # Test 2: Commands give the same goals as before
+    print("Test 2: Goal predicates")
+    cases = {
+        "fetch cup": {('Holding', 'robot', 'cup'), ('At', 'robot', 'living_room')},
+        "Bring book to bedroom": {('Holding', 'robot', 'book'), ('At', 'robot', 'bedroom')},
+        "get phone to the kitchen": {('Holding', 'robot', 'phone'), ('At', 'robot', 'kitchen')},
+        "go to bathroom": {('At', 'robot', 'bathroom')},
+        "navigate to kitchen": {('At', 'robot', 'kitchen')},
+        "put down cup in the bedroom": {('At', 'cup', 'bedroom'), ('Holding', 'robot', 'nothing')},
+        "drop book": None,
+        "dance": None,
+    }
+    for command, expected in cases.items():
+        goal_preds = parse_user_goal(command, available_items, available_rooms)
+        print(f"'{command}' -> {goal_preds}")
+        assert goal_preds == expected, f"Unexpected goal for '{command}'"
+    
+    assert parse_user_goal("place toothbrush in bathroom", available_items, available_rooms, capacity=2) == \
+           {('At', 'toothbrush', 'bathroom')}, "With spare capacity the robot need not end up empty-handed"
+    assert parse_user_goal("fetch cupboard", available_items, available_rooms) is None, "Names should match whole words only"
+    print("✓ Goal predicates test passed")
+    print()
+    
+    # Test 3: Multi-word names, synonyms and filler words
+    print("Test 3: Synonyms and multi-word names")
+    synonyms = {'mug': 'cup', 'mobile phone': 'phone', 'lounge': 'living_room'}
+    
+    assert parse_user_goal("go to the living room", available_items, available_rooms) == \
+           {('At', 'robot', 'living_room')}, "Underscored names should match with spaces"
+    assert parse_user_goal("please bring me the mug to the kitchen", available_items, available_rooms, synonyms=synonyms) == \
+           {('Holding', 'robot', 'cup'), ('At', 'robot', 'kitchen')}, "Synonyms should map to item names"
+    assert parse_user_goal("fetch my mobile phone to the lounge", available_items, available_rooms, synonyms=synonyms) == \
+           {('Holding', 'robot', 'phone'), ('At', 'robot', 'living_room')}, "Multi-word synonyms should match"
+    
+    try:
+        CommandGrammar(available_items, available_rooms, {'spoon': 'fork'})
+        assert False, "Synonyms of unknown names should be rejected"
+    except ValueError:
+        pass
+    
+    grammar = get_command_grammar(available_items, available_rooms, synonyms)
+    assert get_command_grammar(list(available_items), available_rooms, dict(synonyms)) is grammar, \
+        "Grammars should be compiled once per vocabulary"
+    assert parse_user_goal("go to lounge", [], [], grammar=grammar) == {('At', 'robot', 'living_room')}, \
+        "Given grammars should be used as they are"
+    assert grammar.parse("go to lounge") == ('go', None, 'living_room'), "Parse should return command, item and room"
+    
+    # A vocabulary changed in place is compiled again
+    items = ['cup']
+    assert parse_user_goal("fetch book", items, available_rooms) is None, "Unknown items should not parse"
+    items.append('book')
+    assert parse_user_goal("fetch book", items, available_rooms) == \
+           {('Holding', 'robot', 'book'), ('At', 'robot', 'living_room')}, "Added items should be parsed"
+    print("✓ Synonyms and multi-word names test passed")
+    print()
+    
+    # Test 4: Large catalogues
+    print("Test 4: Large catalogue")
+    many_items = [f'box {i}' for i in range(1000)] + available_items
+    assert parse_user_goal("fetch box 999 to bedroom", many_items, available_rooms) == \
+           {('Holding', 'robot', 'box 999'), ('At', 'robot', 'bedroom')}, "Long names should not be cut short"
+    assert parse_user_goal("fetch box 99", many_items, available_rooms) == \
+           {('Holding', 'robot', 'box 99'), ('At', 'robot', 'living_room')}, "Prefix names should still match"
+    print("✓ Large catalogue test passed")
+    
+    print("\nAll command grammar tests completed successfully!")
+
+if __name__ == "__main__":
+    test_command_grammar()
@@ -0,0 +1,94 @@
+import asyncio
+import json
+import os
+import socket
+import tempfile
+from command_server import CommandServer, send_commands
+
+async def _request(host, port, requests):
+    """Send raw request lines over one connection and read a response per line."""
+    reader, writer = await asyncio.open_connection(host, port)
+    responses = []
+    for request in requests:
+        writer.write((request + '\n').encode('utf-8'))
+        await writer.drain()
+        responses.append(json.loads(await reader.readline()))
+    writer.close()
+    await writer.wait_closed()
+    return responses
+
+async def _run_server_tests():
+    server = CommandServer()
+    host, port = (await server.start(port=0))[:2]
+    try:
+        # Test 1: Commands are answered with the session's results
+        print("Test 1: Single client")
+        responses = await _request(host, port, [json.dumps({'command': "go to bedroom", 'id': 'a'}),
+                                                json.dumps({'command': "dance"})])
+        print(f"Responses: {responses}")
+        
+        assert responses[0]['id'] == 'a' and responses[0]['goal'] == [['At', 'robot', 'bedroom']], \
+            "Response should carry the request id and the result"
+        assert responses[0]['status'] in ("success", "repaired", "failed"), "Command should be executed"
+        assert 'wait' in responses[0]['timings_ms'], "Time waiting for the robot should be reported"
+        assert responses[1]['status'] == "unparsed" and 'id' not in responses[1], "Unparsed commands should be reported"
+        print("✓ Single client test passed")
+        print()
+        
+        # Test 2: Bad requests get an error but keep the connection usable
+        print("Test 2: Bad requests")
+        responses = await _request(host, port, ["not json", json.dumps({'cmd': "fetch cup"}),
+                                                json.dumps({'command': "go to kitchen"})])
+        print(f"Responses: {responses}")
+        
+        assert 'error' in responses[0] and 'error' in responses[1], "Bad requests should get an error"
+        assert responses[2]['goal'] == [['At', 'robot', 'kitchen']], "Connection should stay usable"
+        print("✓ Bad requests test passed")
+        print()
+        
+        # Test 3: Concurrent clients are served one command at a time on the shared robot
+        print("Test 3: Concurrent clients")
+        processed_before = server.commands_processed
+        client_commands = [["queue go to bathroom", "go to living_room"], ["fetch cup"], ["go to bedroom", "run queue"]]
+        results = await asyncio.gather(*(
+            _request(host, port, [json.dumps({'command': command}) for command in commands])
+            for commands in client_commands))
+        
+        assert [[response['command'] for response in responses] for responses in results] == client_commands, \
+            "Each client should get its own answers in order"
+        assert server.commands_processed - processed_before == 5, "Every command should be processed once"
+        print("✓ Concurrent clients test passed")
+        print()
+        
+        # Test 4: The blocking client helper
+        print("Test 4: Client helper")
+        loop = asyncio.get_running_loop()
+        responses = await loop.run_in_executor(None, send_commands, ["go to kitchen"], host, port)
+        assert responses[0]['id'] == 0 and responses[0]['goal'] == [['At', 'robot', 'kitchen']], \
+            "Helper should return the responses"
+        print("✓ Client helper test passed")
+        print()
+    finally:
+        await server.close()
+    
+    # Test 5: Unix sockets
+    if hasattr(socket, 'AF_UNIX'):
+        print("Test 5: Unix socket")
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "robot.sock")
+            server = CommandServer(session=server.session)
+            await server.start(path=path)
+            try:
+                loop = asyncio.get_running_loop()
+                responses = await loop.run_in_executor(None, lambda: send_commands(["go to bathroom"], path=path))
+                assert responses[0]['goal'] == [['At', 'robot', 'bathroom']], "Unix socket clients should be served"
+            finally:
+                await server.close()
+        print("✓ Unix socket test passed")
+
+def test_command_server():
+    asyncio.run(_run_server_tests())
+    print("\nAll command server tests completed successfully!")
+
+if __name__ == "__main__":
+    test_command_server()
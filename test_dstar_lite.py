@@ -0,0 +1,96 @@
+from dstar_lite import DStarLite
+from astar_search import astar_search
+from home_environment import HomeEnvironment
+from robot import Robot
+from test_astar_search import assert_valid_path
+import random
+
+def test_dstar_lite():
+    # Create a simple grid environment for testing
+    grid_layout = [
+        [1, 1, 1, 1, 1, 1, 1],
+        [1, 0, 0, 0, 0, 0, 1],
+        [1, 0, 1, 1, 1, 0, 1],
+        [1, 0, 1, 0, 0, 0, 1],
+        [1, 0, 1, 0, 1, 0, 1],
+        [1, 0, 0, 0, 1, 0, 1],
+        [1, 1, 1, 1, 1, 1, 1]
+    ]
+    env = HomeEnvironment(grid_layout, {})
+    
+    # Test 1: Initial path matches A*
+    print("Test 1: Initial path")
+    start_pos = (1, 1)
+    goal_pos = (5, 5)
+    search = DStarLite(env, start_pos, goal_pos)
+    path = search.get_path()
+    print(f"Path from {start_pos} to {goal_pos}: {path}")
+    
+    assert path is not None, "Should find a path"
+    assert path[0] == start_pos and path[-1] == goal_pos, "Path should connect start and goal"
+    assert len(path) == len(astar_search(env, start_pos, goal_pos)), "Path should be optimal"
+    assert_valid_path(path, env)
+    print("✓ Initial path test passed")
+    print()
+    
+    # Test 2: Robot drifts to a new position
+    print("Test 2: Start position update")
+    start_pos = (3, 3)
+    search.update_start(start_pos)
+    expansions_before = search.expansions
+    path = search.get_path()
+    print(f"Repaired path from {start_pos}: {path} ({search.expansions - expansions_before} expansions)")
+    
+    assert path[0] == start_pos and path[-1] == goal_pos, "Path should start at the new position"
+    assert len(path) == len(astar_search(env, start_pos, goal_pos)), "Repaired path should be optimal"
+    assert_valid_path(path, env)
+    print("✓ Start position update test passed")
+    print()
+    
+    # Test 3: An obstacle appears on the current path
+    print("Test 3: Map change")
+    env.grid[3, 4] = 1
+    search.update_cells([(3, 4)])
+    path = search.get_path()
+    print(f"Path after blocking (4, 3): {path}")
+    
+    assert path is not None, "Should find a detour"
+    assert (4, 3) not in path, "Path should avoid the new obstacle"
+    assert len(path) == len(astar_search(env, start_pos, goal_pos)), "Detour should be optimal"
+    assert_valid_path(path, env)
+    print("✓ Map change test passed")
+    print()
+    
+    # Test 4: Goal becomes unreachable, then reachable again
+    print("Test 4: Unreachable goal")
+    env.grid[4, 5] = 1
+    search.update_cells([(5, 4)])
+    assert search.get_path() is None, "Should not find a path to a walled-off goal"
+    assert search.next_step() is None, "Should not suggest a step to a walled-off goal"
+    
+    env.grid[4, 5] = 0
+    search.update_cells([(5, 4)])
+    assert search.get_path() is not None, "Should find a path once the goal is reachable again"
+    print("✓ Unreachable goal test passed")
+    print()
+    
+    # Test 5: Robot navigation with per-step replanning
+    print("Test 5: Robot navigation with replanning")
+    random.seed(42)
+    env = HomeEnvironment(grid_layout, {})
+    all_possible_locations = [(x, y) for y in range(env.height) for x in range(env.width) if not env.is_obstacle(x, y)]
+    room_observations = ['unknown_sensed', 'action_succeeded', 'action_failed']
+    initial_belief = {loc: (1.0 if loc == (1, 1) else 0.0) for loc in all_possible_locations}
+    robot = Robot(initial_belief, all_possible_locations, room_observations, env)
+    
+    reached = robot.navigate_with_replanning((5, 5), env)
+    print(f"Robot believes it is at {robot.get_most_likely_pos()}")
+    
+    assert reached, "Robot should reach the goal"
+    assert robot.get_most_likely_pos() == (5, 5), "Robot should believe it is at the goal"
+    print("✓ Robot navigation test passed")
+    
+    print("\nAll D* Lite tests completed successfully!")
+
+if __name__ == "__main__":
+    test_dstar_lite()
@@ -0,0 +1,57 @@
+from grounding import GroundedTask
+from main import create_action_schemas
+
+def test_grounding():
+    action_schemas = create_action_schemas()
+    state_preds = {
+        ('At', 'robot', 'kitchen'),
+        ('At', 'cup', 'living_room'),
+        ('Holding', 'robot', 'book'),
+        ('Connected', 'kitchen', 'living_room'),
+        ('Connected', 'living_room', 'kitchen'),
+        ('Connected', 'kitchen', 'bedroom'),
+        ('Connected', 'bedroom', 'kitchen')
+    }
+    
+    # Test 1: Schemas are grounded once, using static facts and constants
+    print("Test 1: Ground actions")
+    task = GroundedTask(action_schemas, state_preds)
+    names = {action.instantiated_action for action in task.actions}
+    print(f"Ground actions: {len(task.actions)}")
+    
+    goto_actions = [action for action in task.actions if action.instantiated_action[0] == "GoTo"]
+    assert len(goto_actions) == 4, "There should be one GoTo per connection"
+    assert ('PickUp', 'book', 'bedroom') in names, "Held items should be groundable for PickUp"
+    assert ('PutDown', 'cup', 'kitchen') in names, "Items should be groundable for PutDown"
+    assert not any('robot' in action[1:] or 'nothing' in action[1:] for action in names), "Constants should never be bound"
+    assert len({(action.instantiated_action, tuple(sorted(action.bindings.items()))) for action in task.actions}) == len(task.actions), "Ground actions should be unique"
+    assert ('Connected', 'kitchen', 'bedroom') in task.static_facts, "Connected should be static"
+    print("✓ Grounding test passed")
+    print()
+    
+    # Test 2: Successor generator returns exactly the applicable actions
+    print("Test 2: Successor generator")
+    state = task.encode(state_preds)
+    applicable = {action.instantiated_action for action in task.applicable_actions(state)}
+    expected = {action.instantiated_action for action in task.actions if action.is_applicable(state)}
+    print(f"Applicable: {sorted(applicable)}")
+    
+    assert applicable == expected, "Successor generator should match a full scan"
+    assert applicable == {('GoTo', 'living_room'), ('GoTo', 'bedroom'), ('PutDown', 'book', 'kitchen')}, "Unexpected applicable actions"
+    print("✓ Successor generator test passed")
+    print()
+    
+    # Test 3: Applying a ground action updates the bitset state
+    print("Test 3: Apply ground action")
+    putdown = next(action for action in task.actions if action.instantiated_action == ('PutDown', 'book', 'kitchen'))
+    new_preds = set(task.decode(putdown.apply(state)))
+    
+    assert ('At', 'book', 'kitchen') in new_preds, "Book should be in the kitchen"
+    assert ('Holding', 'robot', 'nothing') in new_preds, "Robot should hold nothing"
+    assert ('Holding', 'robot', 'book') not in new_preds, "Robot should no longer hold the book"
+    print("✓ Apply test passed")
+    
+    print("\nAll grounding tests completed successfully!")
+
+if __name__ == "__main__":
+    test_grounding()
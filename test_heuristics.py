@@ -0,0 +1,60 @@
+from heuristics import RelaxedHeuristic
+from grounding import GroundedTask
+from main import create_action_schemas
+
+def test_heuristics():
+    state_preds = {
+        ('At', 'robot', 'kitchen'),
+        ('At', 'cup', 'bedroom'),
+        ('Holding', 'robot', 'nothing'),
+        ('Connected', 'kitchen', 'living_room'),
+        ('Connected', 'living_room', 'kitchen'),
+        ('Connected', 'living_room', 'bedroom'),
+        ('Connected', 'bedroom', 'living_room')
+    }
+    goal_preds = {('At', 'cup', 'kitchen')}
+    task = GroundedTask(create_action_schemas(), state_preds, goal_preds)
+    state = task.encode(state_preds)
+    goal = task.encode(goal_preds)
+    
+    # Test 1: Heuristic values on a fetch task whose optimal plan has 6 actions
+    print("Test 1: Heuristic values")
+    values = {kind: RelaxedHeuristic(task, goal, kind).evaluate(state) for kind in ["max", "add", "ff"]}
+    print(f"Values: {values}")
+    
+    assert values["max"] <= 6, "h_max should not overestimate"
+    assert values["max"] <= values["ff"] <= values["add"], "h_max <= h_FF <= h_add on this task"
+    assert values["ff"] == 4, "The relaxed plan skips the return trip (the robot never leaves the kitchen)"
+    print("✓ Heuristic values test passed")
+    print()
+    
+    # Test 2: Goal states evaluate to zero
+    print("Test 2: Goal state")
+    goal_state = task.encode(state_preds - {('At', 'cup', 'bedroom')} | goal_preds)
+    
+    assert all(RelaxedHeuristic(task, goal, kind).evaluate(goal_state) == 0 for kind in ["max", "add", "ff"]), "Goal states should have h = 0"
+    print("✓ Goal state test passed")
+    print()
+    
+    # Test 3: Helpful actions lead towards the goal
+    print("Test 3: Helpful actions")
+    ff = RelaxedHeuristic(task, goal, "ff")
+    _, helpful = ff.evaluate_with_helpful_actions(state)
+    helpful_names = {task.actions[action_id].instantiated_action for action_id in helpful}
+    print(f"Helpful actions: {helpful_names}")
+    
+    assert helpful_names == {('GoTo', 'living_room')}, "Only moving towards the cup should be helpful"
+    print("✓ Helpful actions test passed")
+    print()
+    
+    # Test 4: Unreachable goals are dead ends
+    print("Test 4: Unreachable goal")
+    blocked = task.encode({('At', 'cup', 'garage')})
+    
+    assert RelaxedHeuristic(task, blocked, "ff").evaluate(state) == float('inf'), "Unreachable goal should be infinite"
+    print("✓ Unreachable goal test passed")
+    
+    print("\nAll heuristic tests completed successfully!")
+
+if __name__ == "__main__":
+    test_heuristics()
@@ -0,0 +1,70 @@
+from hierarchical_search import HierarchicalPathfinder
+from astar_search import astar_search
+from main import create_environment
+from home_environment import HomeEnvironment
+from test_astar_search import assert_valid_path
+
+def test_hierarchical_search():
+    # Use the sample home from main.py
+    env = create_environment()
+    pathfinder = HierarchicalPathfinder(env)
+    
+    # Test 1: Abstract graph covers the rooms and their entrances
+    print("Test 1: Abstract graph construction")
+    print(f"Clusters: {len(pathfinder.clusters)}, portals: {len(pathfinder.portal_partners)}")
+    
+    assert len(pathfinder.clusters) == 5, "Should have four rooms plus the hallway"
+    assert pathfinder.portal_partners, "Should place portals on room entrances"
+    for portal, partners in pathfinder.portal_partners.items():
+        for partner in partners:
+            assert pathfinder.cluster_of[portal] != pathfinder.cluster_of[partner], "Portals should link different clusters"
+    print("✓ Abstract graph test passed")
+    print()
+    
+    # Test 2: Cross-house route from the kitchen to the bathroom
+    print("Test 2: Cross-house route")
+    start_pos = (1, 1)  # kitchen
+    goal_pos = (8, 7)   # bathroom
+    path = pathfinder.find_path(start_pos, goal_pos)
+    optimal_path = astar_search(env, start_pos, goal_pos)
+    print(f"Path from {start_pos} to {goal_pos}: {path}")
+    
+    assert path is not None, "Should find a path"
+    assert path[0] == start_pos, "Path should start at start_pos"
+    assert path[-1] == goal_pos, "Path should end at goal_pos"
+    assert_valid_path(path, env)
+    assert len(path) <= 1.5 * len(optimal_path), "Hierarchical path should be near-optimal"
+    print("✓ Cross-house route test passed")
+    print()
+    
+    # Test 3: Every pair of free cells is connected by a valid path
+    print("Test 3: All-pairs routes")
+    free_cells = [(x, y) for y in range(env.height) for x in range(env.width) if not env.is_obstacle(x, y)]
+    for start_pos in free_cells:
+        for goal_pos in free_cells:
+            path = pathfinder.find_path(start_pos, goal_pos)
+            assert path is not None, f"Should find a path from {start_pos} to {goal_pos}"
+            assert path[0] == start_pos and path[-1] == goal_pos, "Path should connect start and goal"
+            assert_valid_path(path, env)
+    print("✓ All-pairs routes test passed")
+    print()
+    
+    # Test 4: Unreachable goal and obstacle cells
+    print("Test 4: Unreachable goal")
+    grid_layout_unreachable = [
+        [1, 1, 1, 1, 1, 1, 1],
+        [1, 'kitchen', 'kitchen', 1, 'bedroom', 'bedroom', 1],
+        [1, 'kitchen', 0, 1, 0, 'bedroom', 1],
+        [1, 1, 1, 1, 1, 1, 1]
+    ]
+    env_unreachable = HomeEnvironment(grid_layout_unreachable, {})
+    pathfinder_unreachable = HierarchicalPathfinder(env_unreachable)
+    
+    assert pathfinder_unreachable.find_path((1, 1), (5, 1)) is None, "Should not find a path to unreachable goal"
+    assert pathfinder_unreachable.find_path((1, 1), (0, 0)) is None, "Should not find a path into an obstacle"
+    print("✓ Unreachable goal test passed")
+    
+    print("\nAll hierarchical search tests completed successfully!")
+
+if __name__ == "__main__":
+    test_hierarchical_search()
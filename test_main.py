@@ -0,0 +1,45 @@
+import io
+import json
+from main import CommandSession, run_batch
+
+def test_main():
+    # Test 1: Commands are processed without interaction
+    print("Test 1: Command session")
+    session = CommandSession()
+    messages = []
+    result = session.process_command("go to bedroom", report=messages.append)
+    print(f"Result: {result}")
+    
+    assert result['status'] in ("success", "repaired", "failed"), "Command should be planned and executed"
+    assert result['goal'] == [('At', 'robot', 'bedroom')], "Goal should be reported"
+    assert result['plan'] and messages, "Plan and progress messages should be reported"
+    assert any(message.startswith("Executing action") for message in messages), "Robot messages should be reported too"
+    assert set(result['timings_ms']) == {'parse', 'plan', 'execute', 'total'}, "Timings should be reported"
+    
+    assert session.process_command("dance")['status'] == "unparsed", "Unknown commands should be reported"
+    assert session.process_command("run queue")['status'] == "empty_queue", "Empty queue should be reported"
+    queued = session.process_command("queue fetch book to bedroom")
+    assert queued['status'] == "queued" and queued['plan'] is None, "Queued commands should not be executed yet"
+    assert len(session.task_queue) == 1, "Goal should be queued"
+    print("✓ Command session test passed")
+    print()
+    
+    # Test 2: Batch mode writes exactly one JSON line per command
+    print("Test 2: Batch mode")
+    output = io.StringIO()
+    count = run_batch(io.StringIO("go to kitchen\n\nhello\nqueue go to bathroom\nrun queue\n"), output)
+    lines = output.getvalue().splitlines()
+    print(f"Output: {lines}")
+    
+    assert count == 4 and len(lines) == 4, "Blank lines should be skipped and nothing else printed"
+    results = [json.loads(line) for line in lines]
+    assert [result['command'] for result in results] == ["go to kitchen", "hello", "queue go to bathroom", "run queue"], \
+        "Results should follow the input order"
+    assert results[1]['status'] == "unparsed", "Unparsed commands should still get a line"
+    assert results[3]['goal'] == [['At', 'robot', 'bathroom']], "Queued goals should be run together"
+    print("✓ Batch mode test passed")
+    
+    print("\nAll main tests completed successfully!")
+
+if __name__ == "__main__":
+    test_main()
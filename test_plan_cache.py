@@ -0,0 +1,90 @@
+import os
+import tempfile
+from plan_cache import PlanCache, canonical_predicates
+from planner import validate_plan
+from task_cache import GroundedTaskCache
+from main import create_action_schemas
+
+def test_plan_cache():
+    action_schemas = create_action_schemas()
+    initial_state = {
+        ('At', 'robot', 'kitchen'),
+        ('At', 'cup', 'living_room'),
+        ('At', 'book', 'bedroom'),
+        ('Holding', 'robot', 'nothing'),
+        ('Connected', 'kitchen', 'living_room'),
+        ('Connected', 'living_room', 'kitchen'),
+        ('Connected', 'kitchen', 'bedroom'),
+        ('Connected', 'bedroom', 'kitchen')
+    }
+    goal_state = {('Holding', 'robot', 'cup'), ('At', 'robot', 'kitchen')}
+    
+    # Test 1: Repeated queries are answered from the cache
+    print("Test 1: Exact repeat")
+    cache = PlanCache()
+    plan = cache.get_plan(initial_state, goal_state, action_schemas)
+    repeat = cache.get_plan(set(initial_state), set(goal_state), action_schemas)
+    print(f"Plan: {plan}, hits: {cache.hits}, misses: {cache.misses}")
+    
+    assert repeat == plan, "Cached plan should match"
+    assert cache.hits == 1 and cache.misses == 1, "Second query should be a hit"
+    assert canonical_predicates(initial_state) == canonical_predicates(list(initial_state)[::-1]), "Canonical form should not depend on order"
+    print("✓ Exact repeat test passed")
+    print()
+    
+    # Test 2: A cached plan is reused for a similar state only if it is still valid
+    print("Test 2: Similar state")
+    moved_book = (initial_state - {('At', 'book', 'bedroom')}) | {('At', 'book', 'kitchen')}
+    moved_cup = (initial_state - {('At', 'cup', 'living_room')}) | {('At', 'cup', 'bedroom')}
+    
+    assert cache.get_plan(moved_book, goal_state, action_schemas) == plan, "Unrelated changes should reuse the plan"
+    assert cache.hits == 2, "Similar state should be a hit"
+    new_plan = cache.get_plan(moved_cup, goal_state, action_schemas)
+    assert cache.misses == 2, "Plan that no longer works should be a miss"
+    assert validate_plan(moved_cup, goal_state, action_schemas, new_plan), "New plan should be valid"
+    print("✓ Similar state test passed")
+    print()
+    
+    # Test 3: Least recently used entries are evicted
+    print("Test 3: LRU eviction")
+    cache = PlanCache(max_entries=2)
+    goals = [{('At', 'robot', room)} for room in ['living_room', 'bedroom', 'kitchen']]
+    cache.get_plan(initial_state, goals[0], action_schemas)
+    cache.get_plan(initial_state, goals[1], action_schemas)
+    cache.get_plan(initial_state, goals[0], action_schemas)
+    cache.get_plan(moved_cup, goals[2], action_schemas)
+    
+    assert len(cache.entries) == 2, "Cache should respect max_entries"
+    assert cache.lookup(initial_state, goals[1], action_schemas) is None, "Least recently used plan should be evicted"
+    assert cache.lookup(initial_state, goals[0], action_schemas) is not None, "Recently used plan should be kept"
+    print("✓ LRU eviction test passed")
+    print()
+    
+    # Test 4: Plans persist to disk
+    print("Test 4: Persistence")
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "plans.json")
+        PlanCache(path=path).get_plan(initial_state, goal_state, action_schemas)
+        reloaded = PlanCache(path=path)
+        
+        assert reloaded.lookup(initial_state, goal_state, action_schemas) == plan, "Plan should survive a reload"
+        assert reloaded.lookup(initial_state, goal_state, action_schemas, search="gbfs") is None, "Planner options should be part of the key"
+    print("✓ Persistence test passed")
+    print()
+    
+    # Test 5: A miss grounds the query once, however many plans it checks
+    print("Test 5: Grounding on a miss")
+    task_cache = GroundedTaskCache()
+    cache = PlanCache()
+    for room in ['kitchen', 'living_room', 'bedroom']:
+        state = (initial_state - {('At', 'robot', 'kitchen')}) | {('At', 'robot', room)}
+        cache.store(state, goal_state, action_schemas, [('GoTo', 'garden')], task_cache=task_cache)
+    
+    assert cache.lookup(moved_cup, goal_state, action_schemas, task_cache=task_cache) is None, "Invalid plans should miss"
+    assert task_cache.hits + task_cache.misses == 1, "The query should be grounded once"
+    print("✓ Grounding on a miss test passed")
+    
+    print("\nAll plan cache tests completed successfully!")
+
+if __name__ == "__main__":
+    test_plan_cache()
@@ -0,0 +1,87 @@
+from plan_repair import repair_plan
+from planner import forward_planner, validate_plan
+from main import create_action_schemas
+
+def test_plan_repair():
+    action_schemas = create_action_schemas()
+    connections = {
+        ('Connected', 'kitchen', 'living_room'),
+        ('Connected', 'living_room', 'kitchen'),
+        ('Connected', 'living_room', 'bathroom'),
+        ('Connected', 'bathroom', 'living_room'),
+        ('Connected', 'kitchen', 'bedroom'),
+        ('Connected', 'bedroom', 'kitchen')
+    }
+    initial_state = {
+        ('At', 'robot', 'kitchen'),
+        ('At', 'cup', 'bathroom'),
+        ('Holding', 'robot', 'nothing')
+    } | connections
+    goal_state = {('At', 'cup', 'kitchen')}
+    plan = forward_planner(initial_state, goal_state, action_schemas)
+    print(f"Original plan: {plan}")
+    
+    # Test 1: Retrying the failed step when the state did not change
+    print("Test 1: Retry failed step")
+    after_first_step = {('At', 'robot', 'living_room'), ('At', 'cup', 'bathroom'), ('Holding', 'robot', 'nothing')} | connections
+    repaired = repair_plan(plan, 1, after_first_step, goal_state, action_schemas)
+    print(f"Repaired plan: {repaired}")
+    
+    assert repaired == plan[1:], "The rest of the plan should be reused unchanged"
+    print("✓ Retry test passed")
+    print()
+    
+    # Test 2: Drifting into the wrong room gets a short detour
+    print("Test 2: Detour back onto the plan")
+    drifted = {('At', 'robot', 'bedroom'), ('At', 'cup', 'bathroom'), ('Holding', 'robot', 'nothing')} | connections
+    repaired = repair_plan(plan, 1, drifted, goal_state, action_schemas)
+    print(f"Repaired plan: {repaired}")
+    
+    assert repaired[0] == ('GoTo', 'kitchen'), "Repair should first return to the kitchen"
+    assert repaired[-len(plan):] == plan, "Repair should rejoin the original plan"
+    assert validate_plan(drifted, goal_state, action_schemas, repaired), "Repaired plan should be valid"
+    print("✓ Detour test passed")
+    print()
+    
+    # Test 3: Unplanned progress lets the repair skip steps
+    print("Test 3: Skip completed steps")
+    already_holding = {('At', 'robot', 'living_room'), ('Holding', 'robot', 'cup')} | connections
+    repaired = repair_plan(plan, 1, already_holding, goal_state, action_schemas)
+    print(f"Repaired plan: {repaired}")
+    
+    assert repaired == [('GoTo', 'kitchen'), ('PutDown', 'cup', 'kitchen')], "Repair should reuse the end of the plan"
+    print("✓ Skip test passed")
+    print()
+    
+    # Test 4: Falls back to full planning when no local repair exists
+    print("Test 4: Fallback to full planning")
+    moved_cup = {('At', 'robot', 'living_room'), ('At', 'cup', 'bedroom'), ('Holding', 'robot', 'nothing')} | connections
+    repaired = repair_plan(plan, 1, moved_cup, goal_state, action_schemas, max_repair_depth=1)
+    print(f"Repaired plan: {repaired}")
+    
+    assert repaired is not None and validate_plan(moved_cup, goal_state, action_schemas, repaired), "Fallback plan should be valid"
+    print("✓ Fallback test passed")
+    print()
+    
+    # Test 5: Repairs are ranked by action costs when the planner uses them
+    print("Test 5: Cheapest repair")
+    shortcut = drifted | {('Connected', 'bedroom', 'bathroom'), ('Connected', 'bathroom', 'bedroom')}
+    
+    def action_costs(action):
+        return 10 if action.instantiated_action == ('GoTo', 'bathroom') and action.bindings['current_room'] == 'bedroom' else 1
+    
+    shortest = repair_plan(plan, 1, shortcut, goal_state, action_schemas)
+    cheapest = repair_plan(plan, 1, shortcut, goal_state, action_schemas, action_costs=action_costs)
+    print(f"Shortest repair: {shortest}")
+    print(f"Cheapest repair: {cheapest}")
+    
+    assert shortest[0] == ('GoTo', 'bathroom'), "Without costs the shortcut gives the shortest repair"
+    assert cheapest[0] == ('GoTo', 'kitchen'), "With costs the expensive shortcut should be avoided"
+    assert len(cheapest) > len(shortest), "The cheapest repair can be longer"
+    assert validate_plan(shortcut, goal_state, action_schemas, cheapest), "Cheapest repair should be valid"
+    print("✓ Cheapest repair test passed")
+    
+    print("\nAll plan repair tests completed successfully!")
+
+if __name__ == "__main__":
+    test_plan_repair()
@@ -1,4 +1,4 @@
-from planner import forward_planner
+from planner import forward_planner, StateEncoder
 from action_schema import ActionSchema
 
 def test_planner():
@@ -158,5 +158,202 @@ def test_planner():
     
     print("\nAll planner tests completed successfully!")
 
+def test_state_encoder():
+    goto_action = ActionSchema(
+        name="GoTo",
+        parameters=('room',),
+        preconditions={('At', 'robot', 'current_room'), ('Connected', 'current_room', 'room')},
+        add_effects={('At', 'robot', 'room')},
+        delete_effects={('At', 'robot', 'current_room')}
+    )
+    state_preds = {
+        ('At', 'robot', 'kitchen'),
+        ('Holding', 'robot', 'nothing'),
+        ('Connected', 'kitchen', 'living_room')
+    }
+    
+    # Test 1: Encoding round-trips and reuses predicate ids
+    print("Test 1: Encode and decode")
+    encoder = StateEncoder()
+    state = encoder.encode(state_preds)
+    print(f"State bits: {bin(state)}")
+    
+    assert set(encoder.decode(state)) == state_preds, "Decoding should give back the predicates"
+    assert encoder.encode(state_preds) == state, "Encoding should be deterministic"
+    assert len(encoder.predicates) == 3, "Each predicate should be interned once"
+    print("✓ Encode/decode test passed")
+    print()
+    
+    # Test 2: Ground action masks apply as bitwise operations
+    print("Test 2: Action masks")
+    bindings = {'room': 'living_room', 'current_room': 'kitchen'}
+    pre_mask, add_mask, del_mask = encoder.action_masks(goto_action, bindings)
+    new_state = (state & ~del_mask) | add_mask
+    
+    assert state & pre_mask == pre_mask, "GoTo should be applicable"
+    assert ('At', 'robot', 'living_room') in encoder.decode(new_state), "Robot should move"
+    assert ('At', 'robot', 'kitchen') not in encoder.decode(new_state), "Old location should be deleted"
+    assert encoder.action_masks(goto_action, dict(bindings)) == (pre_mask, add_mask, del_mask), "Masks should be deterministic"
+    print("✓ Action mask test passed")
+    
+    print("\nAll state encoder tests completed successfully!")
+
+def test_heuristic_search():
+    from main import create_action_schemas
+    action_schemas = create_action_schemas()
+    rooms = ['kitchen', 'living_room', 'bedroom', 'bathroom']
+    items = ['cup', 'book', 'phone', 'keys', 'remote', 'plate', 'glasses', 'wallet', 'charger', 'mug']
+    
+    initial_state = {('At', 'robot', 'kitchen'), ('Holding', 'robot', 'nothing')}
+    for i, item in enumerate(items):
+        initial_state.add(('At', item, rooms[i % len(rooms)]))
+    for room_a, room_b in zip(rooms, rooms[1:]):
+        initial_state.add(('Connected', room_a, room_b))
+        initial_state.add(('Connected', room_b, room_a))
+    
+    # Test 1: A* with h_max finds plans as short as BFS
+    print("Test 1: A* with h_max is optimal")
+    goal_state = {('At', 'cup', 'bathroom'), ('At', 'book', 'kitchen')}
+    bfs_plan = forward_planner(initial_state, goal_state, action_schemas)
+    astar_plan = forward_planner(initial_state, goal_state, action_schemas, search="astar", heuristic="max")
+    print(f"BFS plan length: {len(bfs_plan)}, A* plan length: {len(astar_plan)}")
+    
+    assert len(astar_plan) == len(bfs_plan), "A* with h_max should find a shortest plan"
+    print("✓ A* optimality test passed")
+    print()
+    
+    # Test 2: GBFS with h_FF solves a 10-item delivery task beyond BFS depth
+    print("Test 2: GBFS with h_FF on 10 items")
+    goal_state = {('At', item, rooms[(i + 2) % len(rooms)]) for i, item in enumerate(items)}
+    plan = forward_planner(initial_state, goal_state, action_schemas, search="gbfs", heuristic="ff")
+    print(f"Plan length: {len(plan)}")
+    
+    state = set(initial_state)
+    for action in plan:
+        if action[0] == "GoTo":
+            robot_room = next(pred for pred in state if pred[:2] == ('At', 'robot'))
+            assert ('Connected', robot_room[2], action[1]) in state, f"Invalid move {action}"
+            state = (state - {robot_room}) | {('At', 'robot', action[1])}
+        elif action[0] == "PickUp":
+            assert {('At', 'robot', action[2]), ('At', action[1], action[2]), ('Holding', 'robot', 'nothing')} <= state, f"Invalid {action}"
+            state = (state - {('At', action[1], action[2]), ('Holding', 'robot', 'nothing')}) | {('Holding', 'robot', action[1])}
+        else:
+            assert {('At', 'robot', action[2]), ('Holding', 'robot', action[1])} <= state, f"Invalid {action}"
+            state = (state - {('Holding', 'robot', action[1])}) | {('At', action[1], action[2]), ('Holding', 'robot', 'nothing')}
+    
+    assert goal_state <= state, "Plan should reach the goal"
+    print("✓ GBFS test passed")
+    print()
+    
+    # Test 3: Unknown search modes are rejected
+    print("Test 3: Unknown search mode")
+    try:
+        forward_planner(initial_state, goal_state, action_schemas, search="dfs")
+        assert False, "Unknown search should raise ValueError"
+    except ValueError:
+        pass
+    print("✓ Unknown search test passed")
+    
+    print("\nAll heuristic search tests completed successfully!")
+
+def test_deep_breadth_first_search():
+    from main import create_action_schemas
+    action_schemas = create_action_schemas()
+    rooms = ['kitchen', 'living_room', 'bedroom', 'bathroom']
+    
+    # Three items at the far end of a corridor of rooms need a 22-step plan
+    print("Test 1: Deep breadth-first plan")
+    initial_state = {
+        ('At', 'robot', 'kitchen'),
+        ('Holding', 'robot', 'nothing'),
+        ('At', 'cup', 'bathroom'),
+        ('At', 'book', 'bathroom'),
+        ('At', 'phone', 'bedroom')
+    }
+    for room_a, room_b in zip(rooms, rooms[1:]):
+        initial_state.add(('Connected', room_a, room_b))
+        initial_state.add(('Connected', room_b, room_a))
+    goal_state = {('At', 'cup', 'kitchen'), ('At', 'book', 'kitchen'), ('At', 'phone', 'kitchen')}
+    
+    assert forward_planner(initial_state, goal_state, action_schemas) is None, "Default depth limit is too shallow"
+    plan = forward_planner(initial_state, goal_state, action_schemas, max_depth=30)
+    print(f"Plan length: {len(plan)}")
+    
+    assert len(plan) == 22, "BFS should find the shortest plan"
+    assert plan[-1][0] == "PutDown" and plan[-1][2] == "kitchen", "Plan should end with a delivery"
+    print("✓ Deep plan test passed")
+    
+    print("\nAll deep search tests completed successfully!")
+
+def test_carrying_capacity():
+    from main import create_action_schemas
+    from action_schema import capacity_predicates
+    from planner import validate_plan, is_applicable, apply_action
+    rooms = ['kitchen', 'living_room', 'bedroom', 'bathroom']
+    world = {
+        ('At', 'robot', 'kitchen'),
+        ('At', 'cup', 'kitchen'),
+        ('At', 'phone', 'bedroom'),
+        ('At', 'book', 'living_room')
+    }
+    for room_a, room_b in zip(rooms, rooms[1:]):
+        world.add(('Connected', room_a, room_b))
+        world.add(('Connected', room_b, room_a))
+    goal_state = {('At', 'cup', 'bathroom'), ('At', 'phone', 'bathroom'), ('At', 'book', 'bathroom')}
+    
+    # Test 1: Capacity predicates
+    print("Test 1: Capacity predicates")
+    assert capacity_predicates(1) == {('Holding', 'robot', 'nothing')}, "Capacity 1 should keep the old holding state"
+    preds = capacity_predicates(3, ['cup'])
+    print(f"Capacity 3 holding cup: {sorted(preds)}")
+    
+    assert ('Holding', 'robot', 'cup') in preds and ('FreeSlots', 'robot', '2') in preds, "Two slots should be free"
+    assert ('Holding', 'robot', 'nothing') not in preds, "Slot counts replace holding nothing"
+    print("✓ Capacity predicates test passed")
+    print()
+    
+    # Test 2: Larger capacities need fewer actions
+    print("Test 2: Fewer trips with more capacity")
+    plan_lengths = {}
+    for capacity in [1, 2, 3]:
+        action_schemas = create_action_schemas(capacity)
+        initial_state = world | capacity_predicates(capacity)
+        plan = forward_planner(initial_state, goal_state, action_schemas, search="astar", heuristic="max")
+        plan_lengths[capacity] = len(plan)
+        
+        assert validate_plan(initial_state, goal_state, action_schemas, plan), "Plan should be valid"
+        assert all(len(action) == (2 if action[0] == "GoTo" else 3) for action in plan), \
+            "Plan steps should keep their usual form"
+    print(f"Plan lengths by capacity: {plan_lengths}")
+    
+    assert plan_lengths[2] < plan_lengths[1], "Carrying two items should save actions"
+    assert plan_lengths[3] <= plan_lengths[2], "More capacity should never cost actions"
+    print("✓ Capacity planning test passed")
+    print()
+    
+    # Test 3: Set-based is_applicable/apply_action follow the slot counts
+    print("Test 3: Set-based action application")
+    action_schemas = {schema.name: schema for schema in create_action_schemas(2)}
+    state = world | capacity_predicates(2)
+    state = apply_action(action_schemas["PickUp"], state, {'item': 'cup', 'room': 'kitchen'})
+    
+    assert ('FreeSlots', 'robot', '1') in state, "PickUp should use a slot"
+    state = apply_action(action_schemas["GoTo"], state, {'room': 'living_room'})
+    assert is_applicable(action_schemas["PickUp"], state, {'item': 'book', 'room': 'living_room'}), \
+        "A second item should fit"
+    state = apply_action(action_schemas["PickUp"], state, {'item': 'book', 'room': 'living_room'})
+    state.add(('At', 'phone', 'living_room'))
+    assert not is_applicable(action_schemas["PickUp"], state, {'item': 'phone', 'room': 'living_room'}), \
+        "A third item should not fit"
+    state = apply_action(action_schemas["PutDown"], state, {'item': 'cup', 'room': 'living_room'})
+    assert ('FreeSlots', 'robot', '1') in state, "PutDown should free a slot"
+    print("✓ Set-based action test passed")
+    
+    print("\nAll carrying capacity tests completed successfully!")
+
 if __name__ == "__main__":
-    test_planner() 
\ No newline at end of file
+    test_planner()
+    test_state_encoder()
+    test_heuristic_search()
+    test_deep_breadth_first_search()
+    test_carrying_capacity()
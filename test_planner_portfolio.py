@@ -0,0 +1,87 @@
+from planner_portfolio import PlannerPortfolio, portfolio_plan
+from planner import forward_planner, validate_plan
+from main import create_action_schemas
+
+def test_planner_portfolio():
+    action_schemas = create_action_schemas()
+    rooms = ['kitchen', 'living_room', 'bedroom', 'bathroom']
+    initial_state = {
+        ('At', 'robot', 'kitchen'),
+        ('Holding', 'robot', 'nothing'),
+        ('At', 'cup', 'bathroom'),
+        ('At', 'book', 'bedroom'),
+        ('At', 'phone', 'living_room')
+    }
+    for room_a, room_b in zip(rooms, rooms[1:]):
+        initial_state.add(('Connected', room_a, room_b))
+        initial_state.add(('Connected', room_b, room_a))
+    goal_state = {('At', 'cup', 'kitchen'), ('At', 'book', 'living_room')}
+    
+    # Test 1: First plan found by any configuration
+    print("Test 1: First plan")
+    plan, configuration = portfolio_plan(initial_state, goal_state, action_schemas, processes=2)
+    print(f"Plan: {plan} from {configuration}")
+    
+    assert plan is not None, "Portfolio should find a plan"
+    assert configuration is not None, "Winning configuration should be reported"
+    assert validate_plan(initial_state, goal_state, action_schemas, plan), "Plan should be valid"
+    print("✓ First plan test passed")
+    print()
+    
+    # Test 2: Waiting for every configuration returns the shortest plan
+    print("Test 2: Best plan")
+    configurations = [{'search': 'gbfs', 'heuristic': 'ff'}, {'search': 'astar', 'heuristic': 'max'}]
+    plan, configuration = portfolio_plan(initial_state, goal_state, action_schemas,
+                                         configurations=configurations, wait_for_best=True, processes=2)
+    optimal = forward_planner(initial_state, goal_state, action_schemas, search="astar", heuristic="max")
+    print(f"Best plan length: {len(plan)} from {configuration}")
+    
+    assert len(plan) == len(optimal), "Best plan should be as short as the optimal one"
+    print("✓ Best plan test passed")
+    print()
+    
+    # Test 3: Goal already satisfied needs no workers
+    print("Test 3: Goal already satisfied")
+    plan, configuration = portfolio_plan(initial_state, {('At', 'cup', 'bathroom')}, action_schemas)
+    
+    assert plan == [] and configuration is None, "Empty plan expected"
+    print("✓ Satisfied goal test passed")
+    print()
+    
+    # Test 4: Unsolvable goals return nothing
+    print("Test 4: Unsolvable goal")
+    plan, configuration = portfolio_plan(initial_state, {('At', 'cup', 'garage')}, action_schemas,
+                                         deadline=5.0, processes=2)
+    
+    assert plan is None and configuration is None, "No plan should be found"
+    print("✓ Unsolvable goal test passed")
+    print()
+    
+    # Test 5: Slow searches are cancelled and the workers reused for the next call
+    print("Test 5: Pool reuse")
+    all_rooms = rooms + ['hall', 'office']
+    large_state = {('At', 'robot', 'kitchen'), ('Holding', 'robot', 'nothing')}
+    large_state |= {('Connected', room_a, room_b) for room_a in all_rooms for room_b in all_rooms if room_a != room_b}
+    large_state |= {('At', f'item{i}', all_rooms[i % len(all_rooms)]) for i in range(8)}
+    large_goal = {('At', f'item{i}', all_rooms[(i + 3) % len(all_rooms)]) for i in range(6)}
+    configurations = [{'search': 'gbfs', 'heuristic': 'ff'}, {'search': 'bfs', 'max_depth': 40}]
+    
+    with PlannerPortfolio(processes=2) as portfolio:
+        plan, configuration = portfolio.plan(large_state, large_goal, action_schemas, configurations)
+        pool = portfolio.pool
+        print(f"Plan length: {len(plan)} from {configuration}")
+        
+        assert configuration == configurations[0], "Greedy search should win"
+        assert validate_plan(large_state, large_goal, action_schemas, plan), "Plan should be valid"
+        assert pool is not None, "Cancelled breadth-first search should leave the pool running"
+        
+        plan, _ = portfolio.plan(initial_state, goal_state, action_schemas, configurations)
+        assert portfolio.pool is pool and portfolio.calls == 2, "Later calls should reuse the pool"
+        assert validate_plan(initial_state, goal_state, action_schemas, plan), "Reused workers should plan the new task"
+    assert portfolio.pool is None, "Closing should stop the workers"
+    print("✓ Pool reuse test passed")
+    
+    print("\nAll planner portfolio tests completed successfully!")
+
+if __name__ == "__main__":
+    test_planner_portfolio()
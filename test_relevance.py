@@ -0,0 +1,92 @@
+from relevance import reachable_actions, relevant_actions, prune_task
+from grounding import GroundedTask
+from planner import forward_planner
+from action_schema import ActionSchema
+from main import create_action_schemas
+
+def test_relevance():
+    action_schemas = create_action_schemas()
+    initial_preds = {
+        ('At', 'robot', 'kitchen'),
+        ('At', 'cup', 'living_room'),
+        ('At', 'phone', 'living_room'),
+        ('At', 'book', 'bedroom'),
+        ('Holding', 'robot', 'nothing'),
+        ('Connected', 'kitchen', 'living_room'),
+        ('Connected', 'living_room', 'kitchen'),
+        ('Connected', 'kitchen', 'bedroom'),
+        ('Connected', 'bedroom', 'kitchen')
+    }
+    
+    # Test 1: Fetching the cup ignores the other items
+    print("Test 1: Irrelevant items are pruned")
+    goal_preds = {('At', 'cup', 'kitchen')}
+    task = GroundedTask(action_schemas, initial_preds, goal_preds)
+    initial_state = task.encode(initial_preds)
+    goal = task.encode(goal_preds)
+    pruned, objects = prune_task(task, initial_state, goal)
+    print(f"Actions: {len(task.actions)} -> {len(pruned.actions)}, objects: {sorted(objects)}")
+    
+    assert 'phone' not in objects and 'book' not in objects, "Only the cup should stay relevant"
+    assert 'cup' in objects, "The goal item should stay relevant"
+    assert len(pruned.actions) < len(task.actions), "Pruning should remove actions"
+    print("✓ Item pruning test passed")
+    print()
+    
+    # Test 2: Goals that hold initially but get undone keep their achievers
+    print("Test 2: Protected goals")
+    goal_preds = {('Holding', 'robot', 'cup'), ('At', 'robot', 'kitchen')}
+    goal = task.encode(goal_preds)
+    actions, _ = relevant_actions(task, initial_state, goal)
+    names = {task.actions[action_id].instantiated_action for action_id in actions}
+    
+    assert ('GoTo', 'kitchen') in names, "Returning to the kitchen should stay relevant"
+    plan = forward_planner(initial_preds, goal_preds, action_schemas)
+    assert plan is not None and len(plan) == 3, "Pruned search should still find the shortest plan"
+    print("✓ Protected goal test passed")
+    print()
+    
+    # Test 3: Unreachable actions are never relevant
+    print("Test 3: Reachability")
+    isolated = initial_preds - {('Connected', 'kitchen', 'bedroom')}
+    task = GroundedTask(action_schemas, isolated)
+    reachable, _ = reachable_actions(task, task.encode(isolated))
+    names = {task.actions[action_id].instantiated_action for action_id in reachable}
+    
+    assert ('PickUp', 'book', 'bedroom') not in names, "The bedroom cannot be reached"
+    assert ('PickUp', 'cup', 'living_room') in names, "The living room can be reached"
+    print("✓ Reachability test passed")
+    print()
+    
+    # Test 4: The planner falls back to the full task when pruning cuts every plan
+    print("Test 4: Fallback to the full task")
+    buy = ActionSchema(
+        name="Buy",
+        parameters=('item',),
+        preconditions={('Has', 'me', 'coin'), ('ForSale', 'item')},
+        add_effects={('Bought', 'item')},
+        delete_effects={('Has', 'me', 'coin')}
+    )
+    earn = ActionSchema(
+        name="Earn",
+        parameters=(),
+        preconditions={('Works', 'me')},
+        add_effects={('Has', 'me', 'coin')},
+        delete_effects=set()
+    )
+    state_preds = {('Has', 'me', 'coin'), ('Works', 'me'), ('ForSale', 'apple'), ('ForSale', 'pear')}
+    goal_preds = {('Bought', 'apple'), ('Bought', 'pear')}
+    task = GroundedTask([buy, earn], state_preds, goal_preds)
+    pruned, _ = prune_task(task, task.encode(state_preds), task.encode(goal_preds))
+    
+    assert all(action.instantiated_action[0] == "Buy" for action in pruned.actions), "Earning looks irrelevant (coin held initially)"
+    plan = forward_planner(state_preds, goal_preds, [buy, earn])
+    print(f"Plan: {plan}")
+    
+    assert plan is not None and len(plan) == 3, "Planner should fall back to the full task"
+    print("✓ Fallback test passed")
+    
+    print("\nAll relevance tests completed successfully!")
+
+if __name__ == "__main__":
+    test_relevance()
@@ -142,6 +142,24 @@ def test_robot_hmm():
     # At least one location near living room should have significant probability
     assert any(p > 0.1 for p in living_room_probs), "At least one location near living room should have significant probability"
     print("✓ Belief Update test passed")
+    print()
+    
+    # Test 5: Compiled models
+    print("Test 5: Compiled models")
+    focused_hmm.compile_models()
+    transition_table = focused_hmm.transition_table((1, 0))
+    emission_table = focused_hmm.emission_table('kitchen_sensed')
+    for index, loc in enumerate(all_possible_locations):
+        row = dict(transition_table[index])
+        for prev_index, prev_loc in enumerate(all_possible_locations):
+            expected_prob = focused_hmm.get_transition_probability(prev_loc, (1, 0), loc)
+            assert row.get(prev_index, 0.0) == expected_prob, "Transition table should match the transition model"
+        assert emission_table[index] == focused_hmm.get_emission_probability(loc, 'kitchen_sensed'), \
+            "Emission table should match the emission model"
+    
+    assert set(focused_hmm.transition_tables) == {(0, 0), (1, 0), (-1, 0), (0, 1), (0, -1)}, "Every move should be compiled"
+    assert max(len(row) for row in transition_table) <= 5, "Transition rows should only hold reachable predecessors"
+    print("✓ Compiled models test passed")
     
     print("\nAll RobotHMM tests completed successfully!")
 
@@ -139,6 +139,26 @@ def test_robot_with_hmm():
     assert robot.item_held is None, "Robot should not hold any item after putdown"
     assert env.get_item_location('cup') == living_room_pos, "Cup should be at robot's location after putdown"
     print("✓ Move and putdown test passed")
+    print()
+    
+    # Test 6: Carrying several items
+    print("Test 6: Carrying capacity")
+    phone_loc = env.get_item_location('phone')
+    phone_belief = {loc: 1.0 if loc == phone_loc else 0.0 for loc in all_possible_locations}
+    robot = Robot(phone_belief, all_possible_locations, room_observations, env, capacity=2)
+    env.update_item_location('book', phone_loc)
+    env.update_item_location('toothbrush', phone_loc)
+    
+    assert robot.pickup_item('phone', env) and robot.pickup_item('book', env), "Two items should fit"
+    assert not robot.pickup_item('toothbrush', env), "A third item should not fit"
+    print(f"Items held: {robot.items_held}")
+    state = robot.current_world_state_for_planner(env)
+    
+    assert ('Holding', 'robot', 'phone') in state and ('Holding', 'robot', 'book') in state, "Both items should be held"
+    assert ('FreeSlots', 'robot', '0') in state, "No slot should be free"
+    assert robot.putdown_item(env, 'phone') and robot.items_held == ['book'], "The phone should be put down"
+    assert env.get_item_location('phone') == robot.get_most_likely_pos(), "Phone should be at the robot's location"
+    print("✓ Carrying capacity test passed")
     
     print("\nAll robot with HMM tests completed successfully!")
 
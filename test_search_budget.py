@@ -0,0 +1,92 @@
+from search_budget import SearchBudget, PlanResult
+from planner import plan_with_budget, forward_planner
+from grounding import GroundedTask
+from main import create_action_schemas
+
+def _goals_achieved(plan, initial_state, goal_state, action_schemas):
+    """Execute a plan on the grounded task and count the goal predicates it achieves."""
+    task = GroundedTask(action_schemas, initial_state, goal_state)
+    state = task.encode(initial_state)
+    for instantiated_action in plan:
+        action = task.find_action(instantiated_action, state)
+        assert action is not None, f"Partial plan step {instantiated_action} should be applicable"
+        state = action.apply(state)
+    return len(set(task.decode(state)) & goal_state)
+
+def test_search_budget():
+    action_schemas = create_action_schemas()
+    rooms = ['kitchen', 'living_room', 'bedroom', 'bathroom']
+    initial_state = {
+        ('At', 'robot', 'kitchen'),
+        ('Holding', 'robot', 'nothing'),
+        ('At', 'cup', 'bathroom'),
+        ('At', 'book', 'bathroom'),
+        ('At', 'phone', 'bedroom')
+    }
+    for room_a, room_b in zip(rooms, rooms[1:]):
+        initial_state.add(('Connected', room_a, room_b))
+        initial_state.add(('Connected', room_b, room_a))
+    goal_state = {('At', 'cup', 'kitchen'), ('At', 'book', 'kitchen'), ('At', 'phone', 'kitchen')}
+    
+    # Test 1: Unlimited budget solves the task and reports stats
+    print("Test 1: Solved result")
+    result = plan_with_budget(initial_state, goal_state, action_schemas, max_depth=30)
+    print(f"Result: {result.status}, {len(result.plan)} actions, {result.stats.nodes_expanded} expansions")
+    
+    assert result.solved and result.status == "solved", "Task should be solved"
+    assert result.plan == forward_planner(initial_state, goal_state, action_schemas, max_depth=30), \
+        "Budgeted planning should find the same plan"
+    assert result.stats.nodes_expanded > 0 and result.stats.nodes_generated > 0, "Stats should be recorded"
+    assert result.partial_plan is None, "Solved results have no partial plan"
+    print("✓ Solved result test passed")
+    print()
+    
+    # Test 2: Each limit stops the search with its own status
+    print("Test 2: Budget limits")
+    limits = [
+        ({'max_expansions': 40}, "expansion_limit"),
+        ({'max_states': 60}, "state_limit"),
+        ({'time_budget': 0.0}, "timeout")
+    ]
+    for limit, expected_status in limits:
+        result = plan_with_budget(initial_state, goal_state, action_schemas, max_depth=30, **limit)
+        print(f"{limit}: {result.status} after {result.stats.nodes_expanded} expansions")
+        
+        assert result.plan is None and result.status == expected_status, f"Expected status {expected_status}"
+    
+    result = plan_with_budget(initial_state, goal_state, action_schemas, max_depth=30, max_expansions=40)
+    assert result.stats.nodes_expanded <= 40, "Expansion limit should be respected"
+    assert plan_with_budget(initial_state, goal_state, action_schemas).status == "depth_limit", \
+        "Running out of depth should be reported"
+    print("✓ Budget limits test passed")
+    print()
+    
+    # Test 3: Partial plans make progress towards the goal
+    print("Test 3: Best partial plan")
+    result = plan_with_budget(initial_state, goal_state, action_schemas, search="gbfs", max_expansions=12)
+    print(f"Partial plan: {result.partial_plan} ({result.partial_goal_count} goals)")
+    
+    assert result.status == "expansion_limit", "Greedy search should run out of expansions"
+    assert result.partial_goal_count >= 1, "Partial plan should achieve some goal predicates"
+    assert _goals_achieved(result.partial_plan, initial_state, goal_state, action_schemas) == result.partial_goal_count, \
+        "Partial plan should achieve the reported number of goals"
+    print("✓ Partial plan test passed")
+    print()
+    
+    # Test 4: Budgets track the best node and report unsolvable tasks
+    print("Test 4: Unsolvable task")
+    unreachable_goal = {('At', 'cup', 'garage')}
+    result = plan_with_budget(initial_state, unreachable_goal, action_schemas, search="astar", heuristic="max")
+    print(f"Result: {result}")
+    
+    assert isinstance(result, PlanResult) and result.status == "no_plan", "Unsolvable task should report no_plan"
+    budget = SearchBudget(max_expansions=5)
+    assert forward_planner(initial_state, goal_state, action_schemas, max_depth=30, budget=budget) is None, \
+        "forward_planner should honour a budget"
+    assert budget.status == "expansion_limit", "Budget should record why the search stopped"
+    print("✓ Unsolvable task test passed")
+    
+    print("\nAll search budget tests completed successfully!")
+
+if __name__ == "__main__":
+    test_search_budget()
@@ -0,0 +1,68 @@
+from search_stats import SearchStats
+from astar_search import astar_search
+from planner import forward_planner
+from main import create_environment, create_action_schemas
+
+def test_search_stats():
+    env = create_environment()
+    
+    # Test 1: A* records expansions, open-list size, timing and path length
+    print("Test 1: A* instrumentation")
+    stats = SearchStats()
+    path = astar_search(env, (1, 1), (8, 7), stats=stats)
+    print(f"Stats: {stats}")
+    
+    assert stats.nodes_expanded > 0, "Should count expanded nodes"
+    assert stats.nodes_generated >= stats.nodes_expanded - 1, "Should count generated nodes"
+    assert stats.peak_open_size > 0, "Should track the open-list size"
+    assert stats.wall_time >= 0.0, "Should record wall time"
+    assert stats.result_length == len(path) - 1, "Result length should be the number of moves"
+    print("✓ A* instrumentation test passed")
+    print()
+    
+    # Test 2: Callback receives the stats of every search mode
+    print("Test 2: Stats callback")
+    received = []
+    for mode in ["astar", "jps", "bidirectional"]:
+        astar_search(env, (1, 1), (8, 7), mode=mode, stats_callback=received.append)
+    print(f"Expansions per mode: {[s.nodes_expanded for s in received]}")
+    
+    assert len(received) == 3, "Callback should be called once per search"
+    assert all(s.result_length == received[0].result_length for s in received), "All modes should find equal-length paths"
+    assert received[1].nodes_expanded < received[0].nodes_expanded, "JPS should expand fewer nodes than A*"
+    print("✓ Stats callback test passed")
+    print()
+    
+    # Test 3: Planner records its search effort and plan length
+    print("Test 3: Planner instrumentation")
+    initial_state = {
+        ('At', 'robot', 'kitchen'),
+        ('At', 'cup', 'living_room'),
+        ('Holding', 'robot', 'nothing'),
+        ('Connected', 'kitchen', 'living_room'),
+        ('Connected', 'living_room', 'kitchen')
+    }
+    goal_state = {('Holding', 'robot', 'cup'), ('At', 'robot', 'kitchen')}
+    stats = SearchStats()
+    plan = forward_planner(initial_state, goal_state, create_action_schemas(), stats=stats)
+    print(f"Plan: {plan}, stats: {stats}")
+    
+    assert plan is not None, "Plan should be found"
+    assert stats.nodes_expanded > 0 and stats.nodes_generated > 0, "Should count planner nodes"
+    assert stats.result_length == len(plan), "Result length should be the plan length"
+    print("✓ Planner instrumentation test passed")
+    print()
+    
+    # Test 4: Failed searches report no result
+    print("Test 4: Failed search")
+    stats = SearchStats()
+    plan = forward_planner(initial_state, {('Holding', 'robot', 'phone')}, create_action_schemas(), stats=stats)
+    
+    assert plan is None, "No plan should be found"
+    assert stats.result_length is None, "Result length should be None without a plan"
+    print("✓ Failed search test passed")
+    
+    print("\nAll search stats tests completed successfully!")
+
+if __name__ == "__main__":
+    test_search_stats()
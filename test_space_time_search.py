@@ -0,0 +1,95 @@
+from space_time_search import ReservationTable, space_time_astar_search, plan_prioritized_routes
+from batch_search import DistanceFieldCache
+from astar_search import astar_search
+from home_environment import HomeEnvironment
+from main import create_environment
+
+def test_space_time_search():
+    # Corridor with a single side pocket next to the left end
+    grid_layout = [
+        [1, 1, 1, 1, 1, 1, 1],
+        [1, 0, 0, 0, 0, 0, 1],
+        [1, 1, 0, 1, 1, 1, 1],
+        [1, 1, 1, 1, 1, 1, 1]
+    ]
+    env = HomeEnvironment(grid_layout, {})
+    
+    # Test 1: Single robot with an empty table takes a shortest path
+    print("Test 1: Single robot")
+    path = space_time_astar_search(env, (1, 1), (5, 1), ReservationTable())
+    print(f"Timed path: {path}")
+    
+    assert path == astar_search(env, (1, 1), (5, 1)), "Without reservations the path should be a shortest path"
+    print("✓ Single robot test passed")
+    print()
+    
+    # Test 2: Two robots swap ends of the corridor using the pocket
+    print("Test 2: Corridor swap")
+    routes = plan_prioritized_routes(env, [('b', (5, 1), (1, 1)), ('a', (1, 1), (5, 1))])
+    print(f"Routes: {routes}")
+    
+    assert routes['b'] is not None and routes['a'] is not None, "Both robots should be routed"
+    assert routes['b'][-1] == (1, 1) and routes['a'][-1] == (5, 1), "Both robots should reach their goals"
+    assert (2, 2) in routes['a'], "Lower-priority robot should dodge into the pocket"
+    assert_conflict_free(routes, env)
+    print("✓ Corridor swap test passed")
+    print()
+    
+    # Test 3: Several robots crossing the sample home share a distance cache
+    print("Test 3: Robots crossing the home")
+    home = create_environment()
+    cache = DistanceFieldCache(home)
+    requests = [
+        ('r1', (1, 1), (8, 7)),  # kitchen -> bathroom
+        ('r2', (8, 7), (1, 1)),  # bathroom -> kitchen
+        ('r3', (1, 7), (7, 1)),  # bedroom -> living room
+        ('r4', (7, 1), (1, 7))   # living room -> bedroom
+    ]
+    routes = plan_prioritized_routes(home, requests, distance_cache=cache)
+    print(f"Route lengths: {[len(routes[robot_id]) for robot_id, _, _ in requests]}")
+    
+    for robot_id, start_pos, goal_pos in requests:
+        assert routes[robot_id] is not None, f"Robot {robot_id} should be routed"
+        assert routes[robot_id][0] == start_pos and routes[robot_id][-1] == goal_pos, "Route should connect start and goal"
+    assert_conflict_free(routes, home)
+    assert len(cache.fields) == len(requests), "Distance fields should be cached per goal"
+    print("✓ Home crossing test passed")
+    print()
+    
+    # Test 4: Goal blocked by a parked robot
+    print("Test 4: Goal occupied forever")
+    reservations = ReservationTable()
+    reservations.reserve_path([(5, 1)], 'parked')
+    path = space_time_astar_search(env, (1, 1), (5, 1), reservations, robot_id='a', max_time=20)
+    
+    assert path is None, "Should not route onto a cell another robot is parked on"
+    print("✓ Occupied goal test passed")
+    
+    print("\nAll space-time search tests completed successfully!")
+
+def assert_conflict_free(routes, env):
+    """Helper function to check that timed routes never collide or swap"""
+    paths = [path for path in routes.values() if path is not None]
+    horizon = max(len(path) for path in paths)
+    
+    def position(path, t):
+        # Robots stay parked on their last cell
+        return path[min(t, len(path) - 1)]
+    
+    for path in paths:
+        for t in range(len(path) - 1):
+            dx = abs(path[t][0] - path[t + 1][0])
+            dy = abs(path[t][1] - path[t + 1][1])
+            assert dx + dy <= 1, f"Invalid move from {path[t]} to {path[t + 1]}"
+            assert not env.is_obstacle(path[t + 1][0], path[t + 1][1]), f"Path includes obstacle at {path[t + 1]}"
+    
+    for t in range(horizon):
+        for i, path_a in enumerate(paths):
+            for path_b in paths[i + 1:]:
+                assert position(path_a, t) != position(path_b, t), f"Robots collide at time {t}"
+                swapped = (position(path_a, t) == position(path_b, t + 1)
+                           and position(path_b, t) == position(path_a, t + 1))
+                assert not swapped, f"Robots swap places at time {t}"
+
+if __name__ == "__main__":
+    test_space_time_search()
@@ -0,0 +1,87 @@
+import os
+import tempfile
+from task_cache import GroundedTaskCache, task_key
+from grounding import GroundedTask
+from planner import forward_planner, validate_plan
+from main import create_action_schemas
+
+def test_task_cache():
+    action_schemas = create_action_schemas()
+    initial_state = {
+        ('At', 'robot', 'kitchen'),
+        ('At', 'cup', 'living_room'),
+        ('At', 'book', 'bedroom'),
+        ('Holding', 'robot', 'nothing'),
+        ('Connected', 'kitchen', 'living_room'),
+        ('Connected', 'living_room', 'kitchen'),
+        ('Connected', 'kitchen', 'bedroom'),
+        ('Connected', 'bedroom', 'kitchen')
+    }
+    goal_state = {('Holding', 'robot', 'cup'), ('At', 'robot', 'kitchen')}
+    
+    # Test 1: Keys ignore where known objects are, but not the domain or the static facts
+    print("Test 1: Task keys")
+    moved_book = (initial_state - {('At', 'book', 'bedroom')}) | {('At', 'book', 'kitchen')}
+    extra_door = initial_state | {('Connected', 'living_room', 'bedroom')}
+    key = task_key(action_schemas, initial_state, goal_state)
+    
+    assert task_key(action_schemas, moved_book, goal_state) == key, "Moving an item should keep the key"
+    assert task_key(action_schemas, extra_door, goal_state) != key, "Static facts should be part of the key"
+    assert task_key(create_action_schemas(2), initial_state, goal_state) != key, "The domain should be part of the key"
+    assert task_key(action_schemas, initial_state, {('At', 'robot', 'garden')}) != key, "Goal objects should be part of the key"
+    print("✓ Task keys test passed")
+    print()
+    
+    # Test 2: Repeated problems reuse the grounded task in memory
+    print("Test 2: Memory cache")
+    cache = GroundedTaskCache()
+    task = cache.get_task(action_schemas, initial_state, goal_state)
+    
+    assert cache.get_task(action_schemas, moved_book, goal_state) is task, "Same grounding should reuse the task"
+    assert cache.hits == 1 and cache.misses == 1, "Second lookup should be a hit"
+    plan = forward_planner(moved_book, goal_state, action_schemas, task_cache=cache)
+    assert cache.hits == 2, "Planner should get its task from the cache"
+    assert validate_plan(moved_book, goal_state, action_schemas, plan), "Plan from a cached task should be valid"
+    print("✓ Memory cache test passed")
+    print()
+    
+    # Test 3: Tasks are loaded from disk with their indexes instead of being regrounded
+    print("Test 3: Disk cache")
+    with tempfile.TemporaryDirectory() as directory:
+        GroundedTaskCache(directory).get_task(action_schemas, initial_state, goal_state)
+        assert os.path.exists(os.path.join(directory, f"{key}.task")), "Task should be written to disk"
+        
+        reloaded = GroundedTaskCache(directory)
+        loaded_task = reloaded.get_task(action_schemas, initial_state, goal_state)
+        fresh_task = GroundedTask(action_schemas, initial_state, goal_state)
+        print(f"Loaded {len(loaded_task.actions)} actions, loads: {reloaded.loads}, misses: {reloaded.misses}")
+        
+        assert reloaded.loads == 1 and reloaded.misses == 0, "Task should come from disk"
+        assert [action.instantiated_action for action in loaded_task.actions] == \
+               [action.instantiated_action for action in fresh_task.actions], "Loaded task should match a fresh grounding"
+        assert [(set(loaded_task.decode(action.pre_mask)), set(loaded_task.decode(action.del_mask)))
+                for action in loaded_task.actions] == \
+               [(set(fresh_task.decode(action.pre_mask)), set(fresh_task.decode(action.del_mask)))
+                for action in fresh_task.actions], "Masks should be rebuilt from the stored predicate ids"
+        assert loaded_task.precondition_of and loaded_task.actions_by_name, "Indexes should be rebuilt on load"
+        state = loaded_task.encode(initial_state)
+        assert len(loaded_task.applicable_actions(state)) == len(fresh_task.applicable_actions(fresh_task.encode(initial_state))), \
+            "Loaded successor generator should work"
+        
+        plan = forward_planner(initial_state, goal_state, action_schemas, task_cache=GroundedTaskCache(directory))
+        assert validate_plan(initial_state, goal_state, action_schemas, plan), "Plan from a loaded task should be valid"
+        
+        # A damaged file is ignored and replaced
+        with open(reloaded.path(key), 'wb') as f:
+            f.write(b"not a task")
+        damaged = GroundedTaskCache(directory)
+        assert damaged.get_task(action_schemas, initial_state, goal_state) is not None, "Damaged file should be regrounded"
+        assert damaged.misses == 1, "Damaged file should count as a miss"
+        ungrounded = GroundedTask(action_schemas, initial_state, goal_state, ground=False)
+        assert GroundedTaskCache(directory).load(key, ungrounded) is not None, "Damaged file should be rewritten"
+    print("✓ Disk cache test passed")
+    
+    print("\nAll task cache tests completed successfully!")
+
+if __name__ == "__main__":
+    test_task_cache()
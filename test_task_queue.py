@@ -0,0 +1,105 @@
+from task_queue import TaskQueue
+from planner import forward_planner, validate_plan
+from task_cache import GroundedTaskCache
+from main import create_environment, create_action_schemas
+
+def test_task_queue():
+    environment = create_environment()
+    action_schemas = create_action_schemas()
+    rooms = ['kitchen', 'living_room', 'bedroom', 'bathroom']
+    initial_state = {
+        ('At', 'robot', 'kitchen'),
+        ('Holding', 'robot', 'nothing'),
+        ('At', 'cup', 'kitchen'),
+        ('At', 'book', 'living_room'),
+        ('At', 'phone', 'bedroom'),
+        ('At', 'toothbrush', 'bathroom')
+    }
+    for first in rooms:
+        for second in rooms:
+            if first != second:
+                initial_state.add(('Connected', first, second))
+    
+    fetch_goals = [
+        {('Holding', 'robot', 'phone'), ('At', 'robot', 'kitchen')},
+        {('Holding', 'robot', 'book'), ('At', 'robot', 'bathroom')},
+        {('Holding', 'robot', 'cup'), ('At', 'robot', 'living_room')}
+    ]
+    task_queue = TaskQueue(environment, action_schemas)
+    for goal_preds in fetch_goals:
+        task_queue.add(goal_preds)
+    
+    # Test 1: Scheduling never makes the route longer than the queue order
+    print("Test 1: Schedule")
+    robot_room = 'kitchen'
+    ordered = task_queue.schedule(initial_state)
+    queue_cost = task_queue.route_cost([task_queue._trip(goal, initial_state) for goal in fetch_goals], robot_room)
+    scheduled_cost = task_queue.route_cost([task_queue._trip(goal, initial_state) for goal in ordered], robot_room)
+    print(f"Order: {ordered}")
+    print(f"Queue order cost: {queue_cost}, scheduled cost: {scheduled_cost}")
+    
+    assert sorted(map(sorted, ordered)) == sorted(map(sorted, fetch_goals)), "Every goal should be scheduled once"
+    assert scheduled_cost <= queue_cost, "Scheduled route should not be longer"
+    print("✓ Schedule test passed")
+    print()
+    
+    # Test 2: One merged plan achieves every command
+    print("Test 2: Merged plan")
+    plan, ordered_goals = task_queue.plan(initial_state)
+    final_goal = task_queue.final_goal(ordered_goals)
+    print(f"Plan: {plan}")
+    print(f"Final goal: {final_goal}")
+    
+    assert ordered_goals[-1] in fetch_goals, "The last fetch should keep holding its item"
+    assert len([pred for pred in final_goal if pred[0] == 'At' and pred[1] != 'robot']) == 2, \
+        "The other fetched items should be delivered"
+    assert validate_plan(initial_state, final_goal, action_schemas, plan), "Merged plan should be valid"
+    
+    task_cache = GroundedTaskCache()
+    assert task_queue.plan(initial_state, task_cache=task_cache)[0] == plan, "Task cache should not change the plan"
+    assert task_cache.misses == 1, "Segments should share one grounded task"
+    print("✓ Merged plan test passed")
+    print()
+    
+    # Test 3: The merged plan is shorter than planning each command alone
+    print("Test 3: Fewer actions than separate round trips")
+    separate_length = 0
+    state = set(initial_state)
+    for goal_preds in fetch_goals:
+        segment = forward_planner(state, goal_preds, action_schemas)
+        separate_length += len(segment)
+        state = task_queue._apply_plan(state, goal_preds, segment)
+    print(f"Separate: {separate_length} actions, merged: {len(plan)} actions")
+    
+    assert len(plan) <= separate_length, "Merged plan should not need more actions"
+    print("✓ Merged length test passed")
+    print()
+    
+    # Test 4: An empty queue gives an empty plan
+    print("Test 4: Empty queue")
+    task_queue.clear()
+    plan, ordered_goals = task_queue.plan(initial_state)
+    
+    assert plan == [] and ordered_goals == [], "Empty queue should give an empty plan"
+    print("✓ Empty queue test passed")
+    print()
+    
+    # Test 5: A later goal for an already queued item replaces the earlier one
+    print("Test 5: Conflicting goals")
+    assert task_queue.add({('At', 'cup', 'kitchen'), ('Holding', 'robot', 'nothing')}) is None, "First goal should be queued"
+    task_queue.add({('At', 'robot', 'bathroom')})
+    replaced = task_queue.add({('Holding', 'robot', 'cup'), ('At', 'robot', 'bedroom')})
+    plan, ordered_goals = task_queue.plan(initial_state)
+    final_goal = task_queue.final_goal(ordered_goals)
+    print(f"Final goal: {final_goal}")
+    
+    assert replaced == {('At', 'cup', 'kitchen'), ('Holding', 'robot', 'nothing')}, "Replaced goal should be returned"
+    assert len(task_queue) == 2, "Conflicting goal should not be queued twice"
+    assert ('At', 'cup', 'kitchen') not in final_goal, "Replaced goal should not be planned"
+    assert validate_plan(initial_state, final_goal, action_schemas, plan), "Plan should achieve the newer goal"
+    print("✓ Conflicting goals test passed")
+    
+    print("\nAll task queue tests completed successfully!")
+
+if __name__ == "__main__":
+    test_task_queue()
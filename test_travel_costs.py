@@ -0,0 +1,104 @@
+from travel_costs import TravelCostModel
+from planner import forward_planner
+from grounding import GroundedTask
+from main import create_environment, create_action_schemas
+
+def _plan_cost(plan, state_preds, goal_preds, action_schemas, cost_model):
+    """Sum the travel costs of a plan's actions."""
+    task = GroundedTask(action_schemas, state_preds, goal_preds)
+    state = task.encode(state_preds)
+    total = 0
+    for instantiated_action in plan:
+        action = task.find_action(instantiated_action, state)
+        total += cost_model(action)
+        state = action.apply(state)
+    return total
+
+def test_travel_costs():
+    environment = create_environment()
+    cost_model = TravelCostModel(environment)
+    action_schemas = create_action_schemas()
+    
+    # Test 1: Room anchors and distances
+    print("Test 1: Room distances")
+    print(f"Anchors: {cost_model.room_anchors}")
+    
+    assert set(cost_model.room_anchors) == {'kitchen', 'living_room', 'bedroom', 'bathroom', 'hallway'}, \
+        "Every room and the hallway should get an anchor"
+    for room, (x, y) in cost_model.room_anchors.items():
+        assert (environment.get_room_type(x, y) or 'hallway') == room, f"Anchor of {room} should lie in the room"
+    assert cost_model.room_distance('kitchen', 'kitchen') == 0, "A room should be 0 steps from itself"
+    assert cost_model.room_distance('kitchen', 'bathroom') == cost_model.room_distance('bathroom', 'kitchen'), \
+        "Room distances should be symmetric"
+    assert cost_model.room_distance('kitchen', 'garage') == float('inf'), "Unknown rooms should be unreachable"
+    print("✓ Room distance test passed")
+    print()
+    
+    # Test 2: Costs of ground actions
+    print("Test 2: Action costs")
+    state_preds = {
+        ('At', 'robot', 'kitchen'),
+        ('At', 'cup', 'kitchen'),
+        ('Holding', 'robot', 'nothing'),
+        ('Connected', 'kitchen', 'living_room'),
+        ('Connected', 'living_room', 'kitchen')
+    }
+    task = GroundedTask(action_schemas, state_preds, {('At', 'cup', 'living_room')})
+    state = task.encode(state_preds)
+    go_to = task.find_action(('GoTo', 'living_room'), state)
+    pick_up = task.find_action(('PickUp', 'cup', 'kitchen'), state)
+    print(f"GoTo: {cost_model(go_to)}, PickUp: {cost_model(pick_up)}")
+    
+    assert cost_model(go_to) == cost_model.room_distance('kitchen', 'living_room'), "GoTo should cost the anchor distance"
+    assert cost_model(pick_up) == 2 * cost_model.item_distance('kitchen', 'cup') + 1, \
+        "PickUp should cost the round trip to the item plus one"
+    print("✓ Action cost test passed")
+    print()
+    
+    # Test 3: Cost-optimal planning prefers the shorter route
+    print("Test 3: Cheapest route")
+    rooms = ['kitchen', 'living_room', 'bedroom', 'hallway']
+    state_preds = {('At', 'robot', 'kitchen'), ('Holding', 'robot', 'nothing')}
+    for first, second in [('kitchen', 'living_room'), ('living_room', 'bedroom'), ('kitchen', 'hallway'), ('hallway', 'bedroom')]:
+        state_preds.add(('Connected', first, second))
+        state_preds.add(('Connected', second, first))
+    goal_preds = {('At', 'robot', 'bedroom')}
+    plan = forward_planner(state_preds, goal_preds, action_schemas, search="astar", heuristic="max",
+                           action_costs=cost_model)
+    print(f"Plan: {plan}")
+    
+    expected_cost = cost_model.room_distance('kitchen', 'hallway') + cost_model.room_distance('hallway', 'bedroom')
+    assert plan == [('GoTo', 'hallway'), ('GoTo', 'bedroom')], "Plan should go through the hallway"
+    assert _plan_cost(plan, state_preds, goal_preds, action_schemas, cost_model) == expected_cost, \
+        "Plan cost should be the cheapest route"
+    print("✓ Cheapest route test passed")
+    print()
+    
+    # Test 4: A* with h_max is never beaten by the other configurations
+    print("Test 4: Optimal fetch cost")
+    state_preds = {
+        ('At', 'robot', 'kitchen'),
+        ('At', 'book', 'living_room'),
+        ('At', 'phone', 'bedroom'),
+        ('Holding', 'robot', 'nothing')
+    }
+    for first in rooms:
+        for second in rooms:
+            if first != second:
+                state_preds.add(('Connected', first, second))
+    goal_preds = {('At', 'book', 'bedroom'), ('At', 'phone', 'living_room')}
+    costs = {}
+    for search, heuristic in [("astar", "max"), ("gbfs", "ff"), ("astar", "add")]:
+        plan = forward_planner(state_preds, goal_preds, action_schemas, search=search, heuristic=heuristic,
+                               action_costs=cost_model)
+        costs[(search, heuristic)] = _plan_cost(plan, state_preds, goal_preds, action_schemas, cost_model)
+    print(f"Plan costs: {costs}")
+    
+    assert costs[("astar", "max")] == min(costs.values()), "A* with h_max should find the cheapest plan"
+    print("✓ Optimal fetch cost test passed")
+    print()
+    
+    print("All travel cost tests passed!")
+
+if __name__ == "__main__":
+    test_travel_costs()
@@ -0,0 +1,71 @@
+import random
+from zobrist import ZobristHasher, StateTable
+from grounding import GroundedTask
+from action_schema import ActionSchema
+from main import create_action_schemas
+
+def test_zobrist():
+    action_schemas = create_action_schemas()
+    rooms = ['kitchen', 'living_room', 'bedroom', 'bathroom']
+    state_preds = {
+        ('At', 'robot', 'kitchen'),
+        ('Holding', 'robot', 'nothing'),
+        ('At', 'cup', 'kitchen'),
+        ('At', 'book', 'bedroom'),
+        ('At', 'phone', 'bathroom')
+    }
+    for room_a in rooms:
+        for room_b in rooms:
+            if room_a != room_b:
+                state_preds.add(('Connected', room_a, room_b))
+    task = GroundedTask(action_schemas, state_preds)
+    hasher = ZobristHasher(task)
+    
+    # Test 1: Incremental hashes match hashing from scratch
+    print("Test 1: Incremental hashing")
+    random.seed(0)
+    state = task.encode(state_preds)
+    state_hash = hasher.hash_state(state)
+    for _ in range(200):
+        action = random.choice(task.applicable_actions(state))
+        new_state = action.apply(state)
+        state_hash = hasher.successor_hash(state_hash, state, new_state, action)
+        state = new_state
+        assert state_hash == hasher.hash_state(state), "Incremental hash should match the full hash"
+    
+    assert 0 <= state_hash < 2 ** 64, "Hashes should be 64-bit"
+    assert ZobristHasher(task).hash_state(state) == state_hash, "Hashes should be reproducible"
+    print("✓ Incremental hashing test passed")
+    print()
+    
+    # Test 2: Actions whose adds already hold fall back to the changed bits
+    print("Test 2: Irregular effects")
+    wave = ActionSchema("Wave", ('room',), {('At', 'robot', 'room')}, {('Waved', 'robot')}, set())
+    wave_task = GroundedTask(action_schemas + [wave], state_preds)
+    wave_hasher = ZobristHasher(wave_task)
+    state = wave_task.encode(state_preds)
+    for _ in range(2):
+        action = next(action for action in wave_task.applicable_actions(state) if action.instantiated_action[0] == "Wave")
+        new_state = action.apply(state)
+        new_hash = wave_hasher.successor_hash(wave_hasher.hash_state(state), state, new_state, action)
+        assert new_hash == wave_hasher.hash_state(new_state), "Repeated adds should not change the hash"
+        state = new_state
+    print("✓ Irregular effects test passed")
+    print()
+    
+    # Test 3: Colliding hashes are told apart by full comparison
+    print("Test 3: Hash collisions")
+    states = [0b01, 0b10, 0b11]
+    table = StateTable(states)
+    table.add(7, 0)
+    table.add(7, 1)
+    
+    assert table.get(7, 0b01) == 0 and table.get(7, 0b10) == 1, "Colliding states should keep their own nodes"
+    assert table.get(7, 0b11) is None, "A state with a colliding hash should not be reported as visited"
+    assert table.get(8, 0b01) is None, "Unknown hashes should miss"
+    print("✓ Hash collision test passed")
+    
+    print("\nAll Zobrist hashing tests completed successfully!")
+
+if __name__ == "__main__":
+    test_zobrist()
@@ -0,0 +1,86 @@
+from batch_search import DistanceFieldCache
+
+class TravelCostModel:
+    def __init__(self, environment, distance_cache=None):
+        """
+        Action costs in grid steps for the GoTo/PickUp/PutDown domain.
+        
+        Each room gets an anchor cell (the room cell closest to the room's
+        centre); unmarked free cells form the 'hallway'. GoTo costs the grid
+        distance between the two anchors, PickUp the round trip from the room
+        anchor to the item plus one, and PutDown one step. Used as the
+        action_costs of forward_planner, plans then minimise physical steps.
+        
+        Args:
+            environment: Instance of HomeEnvironment
+            distance_cache: Optional DistanceFieldCache to share distance fields
+        """
+        self.environment = environment
+        self.distance_cache = distance_cache or DistanceFieldCache(environment)
+        
+        room_cells = {}
+        for y in range(environment.height):
+            for x in range(environment.width):
+                if not environment.is_obstacle(x, y):
+                    room = environment.get_room_type(x, y) or 'hallway'
+                    room_cells.setdefault(room, []).append((x, y))
+        
+        self.room_anchors = {}
+        for room, cells in room_cells.items():
+            center_x = sum(x for x, _ in cells) / len(cells)
+            center_y = sum(y for _, y in cells) / len(cells)
+            self.room_anchors[room] = min(cells, key=lambda cell: (abs(cell[0] - center_x) + abs(cell[1] - center_y), cell))
+        
+        # Room-to-room distances are needed for every GoTo, so precompute them all
+        self.room_distances = {}
+        for to_room, anchor in self.room_anchors.items():
+            field = self.distance_cache.get(anchor)
+            for from_room, from_anchor in self.room_anchors.items():
+                if from_anchor in field:
+                    self.room_distances[(from_room, to_room)] = field[from_anchor]
+    
+    def room_distance(self, from_room, to_room):
+        """
+        Get the grid distance between two room anchors.
+        
+        Returns:
+            Number of steps, or float('inf') if either room is unknown or unreachable
+        """
+        return self.room_distances.get((from_room, to_room), float('inf'))
+    
+    def item_distance(self, room, item):
+        """
+        Get the grid distance from a room's anchor to an item.
+        
+        Returns:
+            Number of steps (0 if the item is held or the room is unknown)
+        """
+        item_pos = self.environment.get_item_location(item)
+        anchor = self.room_anchors.get(room)
+        if item_pos is None or anchor is None:
+            return 0
+        return self.distance_cache.get(anchor).get(item_pos, 0)
+    
+    def __call__(self, action):
+        """
+        Get the cost of a ground action.
+        
+        Args:
+            action: GroundAction from a GroundedTask
+            
+        Returns:
+            Cost in grid steps (actions outside this domain cost 1)
+        """
+        name = action.instantiated_action[0]
+        bindings = action.bindings
+        if name == "GoTo":
+            return self.room_distance(bindings['current_room'], bindings['room'])
+        if name == "PickUp":
+            return 2 * self.item_distance(bindings['room'], bindings['item']) + 1
+        return 1
+    
+    def __repr__(self):
+        """Stable description (used e.g. in plan cache keys)."""
+        anchors = ", ".join(f"{room}={cell}" for room, cell in sorted(self.room_anchors.items()))
+        items = ", ".join(f"{item}={pos}" for item, pos in sorted(self.environment.item_locations.items()))
+        return f"TravelCostModel({anchors}; {items})"
@@ -0,0 +1,125 @@
+import random
+from grounding import set_bits
+
+class ZobristHasher:
+    def __init__(self, task, seed=0):
+        """
+        Incremental 64-bit Zobrist hashing of bitset states.
+        
+        Every predicate gets a random 64-bit key and a state's hash is the
+        XOR of the keys of its true predicates. Applying an action only
+        XORs in and out the predicates that change, so hashing a successor
+        costs O(|effects|) instead of O(|state|).
+        
+        Args:
+            task: GroundedTask whose states are hashed
+            seed: Seed for the random keys (fixed so hashes are reproducible)
+        """
+        self.encoder = task.encoder
+        self.random = random.Random(seed)
+        self.keys = []
+        
+        # For each action, the bits it flips when its deletes hold and its adds do
+        # not (the usual case) and the matching XOR delta of the hash
+        self.flip_masks = []
+        self.deltas = []
+        for action in task.actions:
+            flip_mask = (action.del_mask & ~action.add_mask) | (action.add_mask & ~action.pre_mask)
+            self.flip_masks.append(flip_mask)
+            self.deltas.append(self._xor_keys(flip_mask))
+    
+    def _key(self, pred_id):
+        """Get the random key of a predicate id, drawing keys for new predicates as needed."""
+        while pred_id >= len(self.keys):
+            self.keys.append(self.random.getrandbits(64))
+        return self.keys[pred_id]
+    
+    def _xor_keys(self, mask):
+        """XOR together the keys of the predicates in a bitset."""
+        value = 0
+        for pred_id in set_bits(mask):
+            value ^= self._key(pred_id)
+        return value
+    
+    def hash_state(self, state):
+        """
+        Hash a state from scratch.
+        
+        Args:
+            state: Bitset state
+            
+        Returns:
+            64-bit integer hash
+        """
+        return self._xor_keys(state)
+    
+    def successor_hash(self, state_hash, state, new_state, action):
+        """
+        Hash the result of applying an action from its parent's hash.
+        
+        Args:
+            state_hash: Hash of the parent state
+            state: Bitset of the parent state
+            new_state: Bitset after applying the action
+            action: The applied GroundAction
+            
+        Returns:
+            64-bit integer hash of new_state
+        """
+        flipped = state ^ new_state
+        if flipped == self.flip_masks[action.action_id]:
+            return state_hash ^ self.deltas[action.action_id]
+        return state_hash ^ self._xor_keys(flipped)
+
+class StateTable:
+    def __init__(self, states):
+        """
+        Duplicate detection for search nodes keyed by Zobrist hashes.
+        
+        Node ids are found by hash; states are only compared in full when
+        hashes match, to rule out collisions.
+        
+        Args:
+            states: List of node states indexed by node id (shared with the search)
+        """
+        self.states = states
+        
+        # hash -> node id, or a list of node ids for colliding hashes
+        self.buckets = {}
+    
+    def get(self, state_hash, state):
+        """
+        Find the node of a state.
+        
+        Args:
+            state_hash: Zobrist hash of the state
+            state: Bitset state
+            
+        Returns:
+            Node id, or None if the state has no node yet
+        """
+        bucket = self.buckets.get(state_hash)
+        if bucket is None:
+            return None
+        if isinstance(bucket, list):
+            for node_id in bucket:
+                if self.states[node_id] == state:
+                    return node_id
+            return None
+        return bucket if self.states[bucket] == state else None
+    
+    def add(self, state_hash, node_id):
+        """
+        Register the node of a new state.
+        
+        Args:
+            state_hash: Zobrist hash of the node's state
+            node_id: Id of the node (its state must already be in states)
+        """
+        bucket = self.buckets.get(state_hash)
+        if bucket is None:
+            self.buckets[state_hash] = node_id
+        elif isinstance(bucket, list):
+            bucket.append(node_id)
+        else:
+            self.buckets[state_hash] = [bucket, node_id]